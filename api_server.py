@@ -0,0 +1,381 @@
+"""
+보도자료 검증/생성/렌더링 HTTP API (Streamlit 없이 실행하는 WSGI 앱)
+
+요청/응답 본문은 JSON이며, 요청 본문에 배열을 보내면 항목마다 처리해 배열로 응답합니다. (일괄 요청)
+- POST /v1/validate  폼 데이터 필수 항목 검증
+- POST /v1/generate  보도자료 생성 (mode=webhook: n8n 호출 후 실패 시 폴백 / offline: 기본 템플릿)
+- POST /v1/render    제목/본문 HTML 렌더링 (ETag, If-None-Match → 304, Accept-Encoding에 따라 gzip/br)
+- GET  /healthz, GET /metrics (지표는 워커 프로세스별)
+
+실행 예시)
+    python api_server.py --port 8000 --workers 4
+    gunicorn -w 4 --threads 8 api_server:app   # 다른 WSGI 서버로 실행하는 경우
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from generation import (
+    InvalidReleaseType,
+    generate_fallback_template,
+    generate_press_release,
+    normalize_release_type,
+    sanitize_form_data,
+    validate_record,
+)
+from html_output import ENCODING_IDENTITY, choose_encoding, compress, should_minify
+from jinja_utils import STYLE_MODE_CLASS, STYLE_MODE_INLINE, generate_press_release_html
+from metrics import REGISTRY, log_event, stage_timer
+from press_release import json_loads
+from render_cache import RenderCache, make_render_key
+
+API_HOST = os.environ.get("NEWS_AUTO_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("NEWS_AUTO_API_PORT", "8000"))
+API_WORKERS = int(os.environ.get("NEWS_AUTO_API_WORKERS", "1"))
+
+# 요청 크기 제한 (본문 바이트 / 일괄 요청 항목 수)
+API_MAX_BODY_BYTES = int(os.environ.get("NEWS_AUTO_API_MAX_BODY_BYTES", str(8 * 1024 * 1024)))
+API_MAX_BATCH = int(os.environ.get("NEWS_AUTO_API_MAX_BATCH", "100"))
+# 일괄 생성 요청에서 n8n으로 동시에 보내는 요청 수
+API_BATCH_CONCURRENCY = int(os.environ.get("NEWS_AUTO_API_BATCH_CONCURRENCY", "4"))
+# 이보다 작은 응답은 압축하지 않음
+API_COMPRESS_MIN_BYTES = int(os.environ.get("NEWS_AUTO_API_COMPRESS_MIN_BYTES", "1024"))
+
+# 렌더링 결과 캐시 (ETag + 압축 방식별 응답 본문)
+API_CACHE_MAX_ENTRIES = int(os.environ.get("NEWS_AUTO_API_CACHE_ENTRIES", "512"))
+API_CACHE_MAX_BYTES = int(os.environ.get("NEWS_AUTO_API_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+GENERATE_MODES = ("webhook", "offline")
+STYLE_MODES = (STYLE_MODE_INLINE, STYLE_MODE_CLASS)
+
+API_REQUESTS = REGISTRY.counter("news_auto_api_requests_total", "HTTP API 요청 수 (endpoint, status별)")
+API_ITEMS = REGISTRY.counter("news_auto_api_items_total", "HTTP API에서 처리한 항목 수 (일괄 요청 포함, endpoint별)")
+
+_response_cache = RenderCache(API_CACHE_MAX_ENTRIES, API_CACHE_MAX_BYTES)
+
+HTTP_STATUS = {
+    200: "200 OK",
+    304: "304 Not Modified",
+    400: "400 Bad Request",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+    413: "413 Payload Too Large",
+    422: "422 Unprocessable Entity",
+    500: "500 Internal Server Error",
+}
+
+class ApiError(Exception):
+    """클라이언트에 그대로 돌려줄 오류 (status, JSON 본문의 error/message)"""
+
+    def __init__(self, status: int, error: str, message: str = ""):
+        super().__init__(message or error)
+        self.status = status
+        self.error = error
+        self.message = message
+
+def _require_object(payload) -> dict:
+    if not isinstance(payload, dict):
+        raise ApiError(400, "invalid_item", "요청 항목은 JSON 객체여야 합니다.")
+    return payload
+
+def _form_data(payload: dict) -> dict:
+    form_data = payload.get("form_data", payload)
+    if not isinstance(form_data, dict):
+        raise ApiError(400, "invalid_item", "form_data는 JSON 객체여야 합니다.")
+    form_data = dict(form_data)
+    # 알 수 없는 유형을 행사 보도자료로 처리하지 않도록 검증/생성 전에 거절 (비어 있으면 제품 보도자료)
+    try:
+        normalize_release_type(form_data)
+    except InvalidReleaseType as e:
+        raise ApiError(400, "invalid_release_type", str(e))
+    return form_data
+
+def handle_validate(payload) -> tuple:
+    """return: (200, {"valid", "missing", "form_data"(빠진 키를 채운 폼)})"""
+    form_data = _form_data(_require_object(payload))
+    with stage_timer("validate"):
+        missing = validate_record(form_data)
+    return 200, {"valid": not missing, "missing": missing, "form_data": form_data}
+
+def handle_generate(payload) -> tuple:
+    """return: (200, {"data", "fallback", "error", "error_message", "cached", "coalesced"}) 또는 필수 항목 누락 시 422"""
+    payload = _require_object(payload)
+    mode = payload.get("mode", "webhook")
+    if mode not in GENERATE_MODES:
+        raise ApiError(400, "invalid_mode", f"mode는 {', '.join(GENERATE_MODES)} 중 하나여야 합니다.")
+    form_data = _form_data(payload)
+    missing = validate_record(form_data)
+    if missing:
+        return 422, {"error": "missing_fields", "message": f"다음 필수 항목을 입력해주세요: {', '.join(missing)}",
+                     "missing": missing}
+
+    if mode == "offline":
+        data = generate_fallback_template(sanitize_form_data(form_data))
+        return 200, {"data": data, "fallback": False, "error": None, "error_message": "", "cached": False,
+                     "coalesced": False}
+    outcome = generate_press_release(form_data, force_regenerate=bool(payload.get("force_regenerate")))
+    body = {key: outcome[key] for key in ("fallback", "error", "error_message", "cached", "coalesced")}
+    return 200, dict(body, data=dict(outcome["data"]))
+
+def _render_options(payload: dict) -> tuple:
+    title = payload.get("title")
+    news_data = payload.get("news_data")
+    if not isinstance(title, str) or not isinstance(news_data, str):
+        raise ApiError(400, "invalid_item", "title과 news_data는 문자열이어야 합니다.")
+    style_mode = payload.get("style_mode", STYLE_MODE_INLINE)
+    if style_mode not in STYLE_MODES:
+        raise ApiError(400, "invalid_style_mode", f"style_mode는 {', '.join(STYLE_MODES)} 중 하나여야 합니다.")
+    minify = payload.get("minify")
+    minify = should_minify("api") if minify is None else bool(minify)
+    return title, news_data, style_mode, minify
+
+def make_etag(title: str, news_data: str, style_mode: str, minify: bool) -> str:
+    """렌더링 입력(제목, 본문, 템플릿 버전, 옵션)으로 ETag 값을 만듭니다. (렌더링 전에 계산 가능)"""
+    key = f"{make_render_key(title, news_data)}:{style_mode}:{int(minify)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+def render_html(title: str, news_data: str, style_mode: str, minify: bool, etag: str) -> bytes:
+    """렌더링한 HTML(utf-8)을 ETag 기준으로 캐시해 반환합니다."""
+    cache_key = f"{etag}:{ENCODING_IDENTITY}"
+    data = _response_cache.get(cache_key)
+    if data is None:
+        data = generate_press_release_html(title, news_data, style_mode=style_mode, minify=minify,
+                                           incremental=True).encode("utf-8")
+        _response_cache.put(cache_key, data, len(data))
+    return data
+
+def handle_render_item(payload) -> tuple:
+    """
+    일괄 렌더링 항목 처리. 항목에 이전 응답의 etag를 넣으면 바뀌지 않은 경우 html을 생략합니다.
+    return: (200, {"etag", "html"} 또는 {"etag", "not_modified": True})
+    """
+    payload = _require_object(payload)
+    title, news_data, style_mode, minify = _render_options(payload)
+    etag = make_etag(title, news_data, style_mode, minify)
+    if payload.get("etag") == etag:
+        return 200, {"etag": etag, "not_modified": True}
+    html = render_html(title, news_data, style_mode, minify, etag)
+    return 200, {"etag": etag, "html": html.decode("utf-8")}
+
+HANDLERS = {
+    "/v1/validate": handle_validate,
+    "/v1/generate": handle_generate,
+    "/v1/render": handle_render_item,
+}
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 있는지 확인합니다. (약한 비교, 압축 방식 접미사 무시)"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"').split("-")[0] == etag:
+            return True
+    return False
+
+def _quoted_etag(etag: str, encoding: str) -> str:
+    # 압축 방식마다 본문이 다르므로 ETag도 구분
+    return f'"{etag}"' if encoding == ENCODING_IDENTITY else f'"{etag}-{encoding}"'
+
+def _read_json(environ: dict):
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        raise ApiError(400, "invalid_length", "Content-Length가 올바르지 않습니다.")
+    if length > API_MAX_BODY_BYTES:
+        raise ApiError(413, "body_too_large", f"요청 본문은 {API_MAX_BODY_BYTES}바이트 이하여야 합니다.")
+    body = environ["wsgi.input"].read(length) if length else b""
+    try:
+        return json_loads(body)
+    except ValueError as e:
+        raise ApiError(400, "invalid_json", f"JSON 형식이 올바르지 않습니다: {e}")
+
+def _call(handler, payload) -> tuple:
+    try:
+        return handler(payload)
+    except ApiError as e:
+        return e.status, {"error": e.error, "message": e.message}
+
+def _run_batch(path: str, handler, items: list) -> list:
+    if len(items) > API_MAX_BATCH:
+        raise ApiError(413, "batch_too_large", f"일괄 요청은 {API_MAX_BATCH}개 이하여야 합니다.")
+    if path == "/v1/generate" and len(items) > 1:
+        # n8n 호출은 I/O 대기가 대부분이므로 항목을 동시에 처리
+        with ThreadPoolExecutor(max_workers=max(1, API_BATCH_CONCURRENCY)) as executor:
+            results = list(executor.map(lambda item: _call(handler, item), items))
+    else:
+        results = [_call(handler, item) for item in items]
+    return [dict(body, status=status) for status, body in results]
+
+def _respond(environ: dict, start_response, status: int, body: bytes, content_type: str,
+             etag: str = None, encoded: bytes = None, encoding: str = None) -> list:
+    """Accept-Encoding에 따라 압축하고, ETag가 있으면 조건부 요청(304)을 처리합니다."""
+    if encoding is None:
+        encoding = choose_encoding(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if len(body) < API_COMPRESS_MIN_BYTES:
+            encoding = ENCODING_IDENTITY
+    headers = [("Content-Type", content_type), ("Vary", "Accept-Encoding")]
+    if etag is not None:
+        headers.append(("ETag", _quoted_etag(etag, encoding)))
+        headers.append(("Cache-Control", "no-cache"))
+        if status == 200 and _etag_matches(environ.get("HTTP_IF_NONE_MATCH", ""), etag):
+            start_response(HTTP_STATUS[304], headers)
+            return [b""]
+    if encoded is None:
+        encoded = compress(body, encoding)
+    if encoding != ENCODING_IDENTITY:
+        headers.append(("Content-Encoding", encoding))
+    headers.append(("Content-Length", str(len(encoded))))
+    start_response(HTTP_STATUS[status], headers)
+    return [encoded]
+
+def _respond_json(environ: dict, start_response, status: int, payload, etag: bool = False) -> list:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # 일괄 응답은 본문 해시를 ETag로 사용 (같은 결과면 304)
+    body_etag = hashlib.sha256(body).hexdigest()[:32] if etag and status == 200 else None
+    return _respond(environ, start_response, status, body, "application/json; charset=utf-8", etag=body_etag)
+
+def _render_single(environ: dict, start_response, payload) -> list:
+    """단건 렌더링: 압축 방식을 정한 뒤 ETag를 한 번만 만들고, 304 응답은 압축 없이 바로 반환"""
+    title, news_data, style_mode, minify = _render_options(_require_object(payload))
+    etag = make_etag(title, news_data, style_mode, minify)
+    # 작은 본문은 압축하지 않으므로 본문 크기를 알아야 ETag의 압축 방식 접미사가 정해짐 (렌더링 결과는 캐시)
+    html = render_html(title, news_data, style_mode, minify, etag)
+    encoding = choose_encoding(environ.get("HTTP_ACCEPT_ENCODING", ""))
+    if len(html) < API_COMPRESS_MIN_BYTES:
+        encoding = ENCODING_IDENTITY
+    if _etag_matches(environ.get("HTTP_IF_NONE_MATCH", ""), etag):
+        return _respond(environ, start_response, 200, html, "text/html; charset=utf-8", etag=etag, encoding=encoding)
+    cache_key = f"{etag}:{encoding}"
+    encoded = _response_cache.get(cache_key)
+    if encoded is None:
+        encoded = compress(html, encoding)
+        _response_cache.put(cache_key, encoded, len(encoded))
+    return _respond(environ, start_response, 200, html, "text/html; charset=utf-8", etag=etag,
+                    encoded=encoded, encoding=encoding)
+
+def app(environ: dict, start_response) -> list:
+    """WSGI 진입점"""
+    path = environ.get("PATH_INFO", "") or "/"
+    method = environ.get("REQUEST_METHOD", "GET")
+    endpoint = path if path in HANDLERS or path in ("/healthz", "/metrics") else "other"
+    status = 500
+    try:
+        with stage_timer("api", endpoint=endpoint):
+            if path == "/healthz":
+                status = 200
+                return _respond_json(environ, start_response, status, {"status": "ok", "pid": os.getpid()})
+            if path == "/metrics":
+                status = 200
+                return _respond(environ, start_response, status, REGISTRY.expose().encode("utf-8"),
+                                "text/plain; version=0.0.4; charset=utf-8")
+            handler = HANDLERS.get(path)
+            if handler is None:
+                raise ApiError(404, "not_found", f"알 수 없는 경로입니다: {path}")
+            if method != "POST":
+                raise ApiError(405, "method_not_allowed", "POST로 요청해주세요.")
+            payload = _read_json(environ)
+            if isinstance(payload, list):
+                results = _run_batch(path, handler, payload)
+                API_ITEMS.inc(len(results), endpoint=endpoint)
+                status = 200
+                return _respond_json(environ, start_response, status, results, etag=path == "/v1/render")
+            API_ITEMS.inc(endpoint=endpoint)
+            if path == "/v1/render":
+                status = 200
+                return _render_single(environ, start_response, payload)
+            status, body = handler(payload)
+            return _respond_json(environ, start_response, status, body)
+    except ApiError as e:
+        status = e.status
+        return _respond_json(environ, start_response, status, {"error": e.error, "message": e.message})
+    except Exception as e:
+        log_event("api_error", endpoint=endpoint, error=repr(e))
+        status = 500
+        # 내부 오류 내용(경로, 설정 값 등)은 로그에만 남기고 응답에는 넣지 않음
+        return _respond_json(environ, start_response, status, {"error": "internal"})
+    finally:
+        API_REQUESTS.inc(endpoint=endpoint, status=str(status))
+
+class ApiServer(ThreadingMixIn, WSGIServer):
+    """요청마다 스레드를 쓰는 WSGI 서버 (워커 프로세스들이 같은 리슨 소켓을 공유)"""
+    daemon_threads = True
+    request_queue_size = 128
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve(host: str = API_HOST, port: int = API_PORT, workers: int = API_WORKERS):
+    """
+    API 서버를 실행합니다.
+    workers > 1이면 소켓을 연 뒤 워커 프로세스를 fork 하고, 죽은 워커는 다시 띄웁니다. (fork 미지원 OS는 1개)
+    """
+    server = make_server(host, port, app, server_class=ApiServer, handler_class=_QuietHandler)
+    print(f"API 서버 시작: http://{host}:{server.server_port} (워커 {workers}개)", file=sys.stderr, flush=True)
+    if workers <= 1 or not hasattr(os, "fork"):
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # 워커: 종료는 부모가 SIGTERM으로 알림
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for _ in range(workers):
+        spawn()
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            log_event("api_worker_restart", pid=pid)
+            spawn()
+    server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보도자료 HTTP API 서버")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="워커 프로세스 수")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers)
+
+if __name__ == "__main__":
+    main()
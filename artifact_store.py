@@ -0,0 +1,276 @@
+"""
+세션 결과(생성 결과, 폼 입력) 공유 저장소 (내용 주소 방식)
+
+세션 상태에는 내용 해시(ref)만 두고 실제 내용은 프로세스에 한 벌만 보관합니다.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import REGISTRY, process_rss_bytes
+from press_release import PressRelease
+
+# 저장소 설정 (환경변수로 조정 가능)
+ARTIFACT_MAX_BYTES = int(os.environ.get("NEWS_AUTO_ARTIFACT_MAX_BYTES", str(128 * 1024 * 1024)))
+# 디스크 폴더 (지정 시 메모리에서 내린 항목을 디스크에서 다시 읽음)
+ARTIFACT_DIR = os.environ.get("NEWS_AUTO_ARTIFACT_DIR", "")
+# 디스크 파일 보관 시간(초) - 마지막으로 쓰거나 읽은 시각 기준
+ARTIFACT_DISK_TTL = float(os.environ.get("NEWS_AUTO_ARTIFACT_DISK_TTL", str(7 * 24 * 3600)))
+# 이 시간(초) 동안 rerun이 없는 세션은 idle로 봄
+SESSION_IDLE_TTL = float(os.environ.get("NEWS_AUTO_SESSION_IDLE_TTL", "1800"))
+# idle 세션/항목 정리 주기(초) - 세션 rerun 때 함께 확인
+SWEEP_INTERVAL = 60.0
+
+# 저장 항목 종류
+KIND_RESULT = "result"  # 생성 결과 (PressRelease)
+KIND_FORM = "form"      # 폼 입력 (dict)
+
+def make_artifact_ref(kind: str, value) -> str:
+    """종류 + 정규화된(JSON, 키 정렬) 내용의 해시"""
+    canonical = json.dumps(dict(value), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{kind}\0{canonical}".encode("utf-8")).hexdigest()
+
+def _estimate_size(value) -> int:
+    """메모리 사용량 추정 (문자열 객체 크기 합)"""
+    return sum(sys.getsizeof(key) + sys.getsizeof(item) for key, item in value.items())
+
+class ArtifactStore:
+    """프로세스 내 모든 세션이 공유하는 내용 주소 방식 저장소"""
+
+    def __init__(self, max_bytes: int = ARTIFACT_MAX_BYTES, artifact_dir: str = ARTIFACT_DIR,
+                 idle_ttl: float = SESSION_IDLE_TTL, disk_ttl: float = ARTIFACT_DISK_TTL):
+        self.max_bytes = max_bytes
+        self.artifact_dir = artifact_dir
+        self.idle_ttl = idle_ttl
+        self.disk_ttl = disk_ttl
+        if artifact_dir:
+            os.makedirs(artifact_dir, exist_ok=True)
+        self._items = OrderedDict()  # ref -> 값 (LRU 순서)
+        self._sizes = {}
+        self._last_used = {}
+        self._total_bytes = 0
+        self._sessions = {}          # session_id -> (마지막 rerun 시각, 참조 중인 ref 목록)
+        self._pins = {}              # ref -> 참조 중인 활성 세션 수
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.puts = 0
+        self.dedup_hits = 0
+        self.disk_reads = 0
+        self.evicted = 0
+        self.evicted_sessions = 0
+        self.missing = 0
+
+    def _disk_path(self, ref: str) -> str:
+        return os.path.join(self.artifact_dir, f"{ref}.json")
+
+    def _write_disk(self, ref: str, kind: str, value):
+        # 임시 파일에 쓴 뒤 교체 (다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)
+        path = self._disk_path(ref)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"kind": kind, "value": dict(value)}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _read_disk(self, ref: str):
+        path = self._disk_path(ref)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        value = entry.get("value") or {}
+        return PressRelease.from_mapping(value) if entry.get("kind") == KIND_RESULT else value
+
+    def put(self, value, kind: str) -> str:
+        """
+        내용을 저장하고 ref를 반환합니다. 같은 내용이 이미 있으면 그 항목을 그대로 사용합니다.
+        생성 결과는 PressRelease로 보관합니다. (저장한 값은 여러 세션이 공유하므로 고치지 않고 새로 저장)
+        """
+        ref = make_artifact_ref(kind, value)
+        if kind == KIND_RESULT:
+            value = PressRelease.from_mapping(value)
+        with self._lock:
+            self.puts += 1
+            if ref in self._items:
+                self.dedup_hits += 1
+                self._touch_item(ref)
+                return ref
+            self._add(ref, value)
+        if self.artifact_dir:
+            self._write_disk(ref, kind, value)
+        return ref
+
+    def get(self, ref: str):
+        """ref의 내용을 반환합니다. 메모리에 없으면 디스크에서 읽고, 어디에도 없으면 None"""
+        if not ref:
+            return None
+        with self._lock:
+            value = self._items.get(ref)
+            if value is not None:
+                self._touch_item(ref)
+                return value
+        value = self._read_disk(ref) if self.artifact_dir else None
+        with self._lock:
+            if value is None:
+                self.missing += 1
+                return None
+            self.disk_reads += 1
+            if ref in self._items:
+                return self._items[ref]
+            # 상한 때문에 바로 다시 내려가더라도 이번 요청에는 읽은 값을 사용
+            self._add(ref, value)
+            return value
+
+    def _touch_item(self, ref: str):
+        self._items.move_to_end(ref)
+        self._last_used[ref] = time.monotonic()
+
+    def _add(self, ref: str, value):
+        size = _estimate_size(value)
+        self._items[ref] = value
+        self._sizes[ref] = size
+        self._last_used[ref] = time.monotonic()
+        self._total_bytes += size
+        self._shrink()
+
+    def _evict(self, ref: str):
+        del self._items[ref]
+        del self._last_used[ref]
+        self._total_bytes -= self._sizes.pop(ref)
+        self.evicted += 1
+
+    def _shrink(self):
+        # 상한을 넘으면 활성 세션이 보지 않는 항목부터, 그래도 넘으면 보고 있는 항목도 오래된 순서로 내림
+        for include_pinned in (False, True):
+            for ref in list(self._items):
+                if self._total_bytes <= self.max_bytes:
+                    return
+                if include_pinned or not self._pins.get(ref):
+                    self._evict(ref)
+
+    def touch_session(self, session_id: str, refs) -> list:
+        """
+        세션의 rerun을 기록하고 세션이 참조하는 ref 목록을 갱신합니다. (idle 정리도 주기적으로 함께 수행)
+        return: 참조 중인 ref 중 메모리/디스크 어디에도 없는 ref 목록 (세션에서 복구하거나 비움)
+        """
+        refs = tuple(sorted({ref for ref in refs if ref}))
+        now = time.monotonic()
+        with self._lock:
+            previous = self._sessions.get(session_id)
+            if previous is None or previous[1] != refs:
+                if previous is not None:
+                    self._unpin(previous[1])
+                for ref in refs:
+                    self._pins[ref] = self._pins.get(ref, 0) + 1
+            self._sessions[session_id] = (now, refs)
+            sweep = now - self._last_sweep >= SWEEP_INTERVAL
+            if sweep:
+                self._last_sweep = now
+        if sweep:
+            self.evict_idle()
+        return [ref for ref in refs if self.get(ref) is None]
+
+    def _unpin(self, refs):
+        for ref in refs:
+            count = self._pins.get(ref, 0) - 1
+            if count > 0:
+                self._pins[ref] = count
+            else:
+                self._pins.pop(ref, None)
+
+    def evict_idle(self, now: float = None) -> int:
+        """
+        idle 세션의 참조를 해제하고, 활성 세션이 보지 않으면서 idle 시간 동안 쓰이지 않은 항목을 메모리에서 내립니다.
+        디스크 폴더를 쓰는 경우 보관 시간이 지난 파일도 지웁니다.
+        return: 정리한 세션 수
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            idle = [session_id for session_id, (last_seen, _) in self._sessions.items()
+                    if now - last_seen > self.idle_ttl]
+            for session_id in idle:
+                self._unpin(self._sessions.pop(session_id)[1])
+            self.evicted_sessions += len(idle)
+            for ref in [ref for ref, last_used in self._last_used.items()
+                        if not self._pins.get(ref) and now - last_used > self.idle_ttl]:
+                self._evict(ref)
+        if self.artifact_dir:
+            self._purge_disk()
+        return len(idle)
+
+    def _purge_disk(self):
+        cutoff = time.time() - self.disk_ttl
+        try:
+            names = os.listdir(self.artifact_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.artifact_dir, name)
+            try:
+                if name.endswith(".json") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            pinned_bytes = sum(self._sizes[ref] for ref in self._pins if ref in self._sizes)
+            # 세션마다 내용을 따로 들고 있었다면 썼을 메모리 (같은 내용을 보는 세션 수만큼)
+            referenced_bytes = sum(self._sizes[ref] * count for ref, count in self._pins.items() if ref in self._sizes)
+            return {
+                "entries": len(self._items),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "pinned_bytes": pinned_bytes,
+                "referenced_bytes": referenced_bytes,
+                "sessions": len(self._sessions),
+                "puts": self.puts,
+                "dedup_hits": self.dedup_hits,
+                "disk_reads": self.disk_reads,
+                "evicted": self.evicted,
+                "evicted_sessions": self.evicted_sessions,
+                "missing": self.missing
+            }
+
+_artifact_store = ArtifactStore()
+
+def get_artifact_store() -> ArtifactStore:
+    """프로세스 공유 저장소를 반환합니다."""
+    return _artifact_store
+
+def memory_report() -> dict:
+    """
+    레플리카 메모리 사용 현황 (프로세스 RSS + 세션 저장소 + 프로세스 공유 캐시)
+    캐시 크기는 각 캐시의 추정치라 RSS와 합이 맞지는 않습니다.
+    """
+    import generation_jobs
+    from render_cache import _download_cache, get_render_cache
+    from response_cache import get_response_cache
+
+    return {
+        "rss_bytes": process_rss_bytes(),
+        "artifact_store": _artifact_store.stats(),
+        "render_cache": get_render_cache().stats(),
+        "download_cache": _download_cache.stats(),
+        "response_cache": get_response_cache().stats(),
+        "jobs": generation_jobs._job_manager.stats() if generation_jobs._job_manager is not None else {},
+    }
+
+def _collect_metrics():
+    gauge = REGISTRY.gauge("news_auto_artifact_store",
+                           "세션 결과 저장소 통계 (entries/bytes/pinned_bytes/referenced_bytes/sessions/evicted 등)")
+    for name, value in _artifact_store.stats().items():
+        gauge.set(value, stat=name)
+
+REGISTRY.add_collector(_collect_metrics)
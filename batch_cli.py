@@ -0,0 +1,284 @@
+"""
+보도자료 일괄 생성 CLI
+
+CSV/JSONL 파일의 폼 데이터(웹 화면과 같은 키)를 읽어 보도자료 HTML/TXT 파일을 만듭니다.
+
+실행 예시)
+    python batch_cli.py records.csv -o out/ --mode offline --workers 8
+    python batch_cli.py records.jsonl --zip releases.zip --mode webhook --concurrency 4
+    python batch_cli.py records.jsonl -o out/ --resume   # 중단된 작업 이어서 실행
+    python batch_cli.py records.csv -o out/ --minify --compress gzip br   # 정적 호스팅용 .html.gz/.html.br 함께 저장
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+
+from generation import (
+    InvalidReleaseType,
+    generate_fallback_template,
+    generate_press_release,
+    sanitize_form_data,
+    validate_record,
+)
+from html_output import ENCODING_BROTLI, ENCODING_GZIP, available_encodings, compress
+from jinja_utils import generate_press_release_html
+
+# 입력 레코드의 id 컬럼 (없으면 행 번호 사용)
+ID_FIELD = "id"
+# 압축본 파일 확장자
+COMPRESSED_EXTENSIONS = {ENCODING_GZIP: "gz", ENCODING_BROTLI: "br"}
+
+def read_records(path: str):
+    """
+    CSV 또는 JSONL 파일에서 (record_id, form_data, error)를 순서대로 읽습니다.
+    읽을 수 없는 줄/행은 form_data 대신 error(줄 번호가 포함된 메시지)를 담아 넘기고 다음 줄을 계속 읽습니다.
+    """
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield str(line_no), None, f"{line_no}번째 줄: JSON 형식이 아닙니다 ({e})"
+                    continue
+                if not isinstance(record, dict):
+                    yield str(line_no), None, f"{line_no}번째 줄: JSON 객체가 아닙니다 ({type(record).__name__})"
+                    continue
+                yield str(record.pop(ID_FIELD, line_no)), record, None
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            for row_no, row in enumerate(reader, 1):
+                record_id = str(row.pop(ID_FIELD, None) or row_no)
+                # 헤더보다 열이 많으면 남는 값이 None 키로 들어옴
+                if None in row:
+                    yield record_id, None, f"{reader.line_num}번째 줄: 열 개수가 헤더보다 많습니다"
+                    continue
+                yield record_id, row, None
+
+def render_record(record_id: str, generated_data: dict, minify: bool = False, encodings: tuple = ()) -> tuple:
+    """보도자료 HTML/TXT(와 HTML 압축본)를 만듭니다. (프로세스 풀 워커에서 실행)"""
+    html = generate_press_release_html(title=generated_data["title"], body_text=generated_data["news_data"],
+                                       minify=minify)
+    text = f"{generated_data['title']}\n\n{generated_data['news_data']}"
+    html_bytes = html.encode("utf-8")
+    compressed = {encoding: compress(html_bytes, encoding) for encoding in encodings}
+    return record_id, html, text, compressed
+
+def render_offline_record(record_id: str, form_data: dict, minify: bool = False, encodings: tuple = ()) -> tuple:
+    """폴백 템플릿으로 본문을 만든 뒤 렌더링합니다. (프로세스 풀 워커에서 실행)"""
+    return render_record(record_id, generate_fallback_template(sanitize_form_data(form_data)), minify, encodings)
+
+def safe_filename(record_id: str) -> str:
+    return re.sub(r"[^0-9A-Za-z가-힣._-]+", "_", record_id).strip("._") or "record"
+
+class OutputWriter:
+    """결과 파일을 폴더 또는 zip으로 저장하고, 완료된 id를 기록합니다. (이어서 실행용)"""
+
+    def __init__(self, output_dir: str = None, zip_path: str = None):
+        self.zip_file = None
+        if zip_path:
+            self.manifest_path = zip_path + ".done"
+            self.zip_file = self._open_zip(zip_path)
+            self.zip_names = set(self.zip_file.namelist())
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+            self.output_dir = output_dir
+            self.manifest_path = os.path.join(output_dir, "_done.txt")
+        self.done = set()
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        if self.zip_file is not None:
+            # zip 목록은 닫을 때 기록되므로, 중간에 종료된 실행의 완료 기록은 zip에 실제로 있는 것만 믿음
+            self.done = {record_id for record_id in self.done if self._in_zip(safe_filename(record_id))}
+        self.manifest = open(self.manifest_path, "w", encoding="utf-8")
+        self.manifest.writelines(record_id + "\n" for record_id in sorted(self.done))
+        self.manifest.flush()
+
+    @staticmethod
+    def _open_zip(zip_path: str) -> zipfile.ZipFile:
+        if os.path.exists(zip_path) and not zipfile.is_zipfile(zip_path):
+            # 목록이 기록되기 전에 중단된 zip은 읽을 수 없으므로 옆으로 옮기고 새로 만듦
+            os.replace(zip_path, zip_path + ".broken")
+            print(f"  읽을 수 없는 zip을 {zip_path}.broken(으)로 옮기고 새로 만듭니다.", file=sys.stderr)
+        return zipfile.ZipFile(zip_path, "a", compression=zipfile.ZIP_DEFLATED)
+
+    def _in_zip(self, name: str) -> bool:
+        return f"{name}.html" in self.zip_names and f"{name}.txt" in self.zip_names
+
+    def write(self, record_id: str, html: str, text: str, compressed: dict = None):
+        name = safe_filename(record_id)
+        if self.zip_file is not None:
+            # 완료 기록 전에 중단되어 이미 zip에 들어 있는 레코드는 같은 이름으로 다시 넣지 않음
+            if not self._in_zip(name):
+                self.zip_file.writestr(f"{name}.html", html)
+                self.zip_file.writestr(f"{name}.txt", text)
+                self.zip_names.update((f"{name}.html", f"{name}.txt"))
+        else:
+            for ext, content in (("html", html), ("txt", text)):
+                with open(os.path.join(self.output_dir, f"{name}.{ext}"), "w", encoding="utf-8") as f:
+                    f.write(content)
+            for encoding, data in (compressed or {}).items():
+                with open(os.path.join(self.output_dir, f"{name}.html.{COMPRESSED_EXTENSIONS[encoding]}"), "wb") as f:
+                    f.write(data)
+        # 파일을 다 쓴 뒤에 완료 기록 (중단되면 해당 레코드는 다음 실행 때 다시 만듦)
+        self.manifest.write(record_id + "\n")
+        self.manifest.flush()
+        self.done.add(record_id)
+
+    def close(self):
+        self.manifest.close()
+        if self.zip_file is not None:
+            self.zip_file.close()
+
+class Progress:
+    """처리량(records/sec) 보고"""
+
+    def __init__(self, interval: float = 2.0):
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.interval = interval
+        self.ok = 0
+        self.fallback = 0
+        self.invalid = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.start
+        return self.ok / elapsed if elapsed > 0 else 0.0
+
+    def maybe_report(self):
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            print(f"  진행: {self.ok}건 완료, {self.rate():.1f} records/sec", file=sys.stderr)
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        return (f"완료 {self.ok}건 (폴백 {self.fallback}건), 건너뜀 {self.skipped}건, 검증 실패 {self.invalid}건, "
+                f"오류 {self.failed}건 / {elapsed:.2f}s, {self.rate():.1f} records/sec")
+
+def run_batch(args) -> Progress:
+    writer = OutputWriter(output_dir=args.output, zip_path=args.zip)
+    progress = Progress()
+    error_log = open(args.errors, "a", encoding="utf-8") if args.errors else None
+    lock = threading.Lock()
+    # 한 번에 처리 중인 레코드 수 제한 (입력이 커도 메모리가 일정하게 유지되도록)
+    max_in_flight = args.workers * 4
+
+    def log_error(record_id: str, message: str):
+        print(f"  [{record_id}] {message}", file=sys.stderr)
+        if error_log:
+            with lock:
+                error_log.write(json.dumps({"id": record_id, "error": message}, ensure_ascii=False) + "\n")
+
+    render_options = {"minify": args.minify, "encodings": tuple(args.compress or ())}
+    render_pool = ProcessPoolExecutor(max_workers=args.workers)
+    generate_pool = ThreadPoolExecutor(max_workers=args.concurrency) if args.mode == "webhook" else None
+    pending = set()
+
+    def drain(block: bool):
+        nonlocal pending
+        if not pending:
+            return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED, timeout=None if block else 0)
+        for future in done:
+            kind, record_id = future.tag
+            try:
+                result = future.result()
+            except Exception as e:
+                progress.failed += 1
+                log_error(record_id, f"{type(e).__name__}: {e}")
+                continue
+            if kind == "generate":
+                # 생성이 끝난 레코드는 렌더링 프로세스 풀로 넘김
+                if result["fallback"]:
+                    progress.fallback += 1
+                    log_error(record_id, f"폴백 템플릿 사용: {result['error']} {result['error_message']}")
+                render_future = render_pool.submit(partial(render_record, **render_options), record_id, result["data"])
+                render_future.tag = ("render", record_id)
+                pending.add(render_future)
+            else:
+                writer.write(*result)
+                progress.ok += 1
+        progress.maybe_report()
+
+    try:
+        for record_id, form_data, error in read_records(args.input):
+            if error:
+                progress.invalid += 1
+                log_error(record_id, error)
+                continue
+            if args.resume and record_id in writer.done:
+                progress.skipped += 1
+                continue
+            try:
+                missing = validate_record(form_data)
+            except InvalidReleaseType as e:
+                progress.invalid += 1
+                log_error(record_id, str(e))
+                continue
+            if missing:
+                progress.invalid += 1
+                log_error(record_id, f"필수 항목 누락: {', '.join(missing)}")
+                continue
+            if args.mode == "webhook":
+                future = generate_pool.submit(generate_press_release, form_data)
+                future.tag = ("generate", record_id)
+            else:
+                future = render_pool.submit(partial(render_offline_record, **render_options), record_id, form_data)
+                future.tag = ("render", record_id)
+            pending.add(future)
+            while len(pending) >= max_in_flight:
+                drain(block=True)
+        while pending:
+            drain(block=True)
+    finally:
+        if generate_pool:
+            generate_pool.shutdown(wait=True, cancel_futures=True)
+        render_pool.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+        if error_log:
+            error_log.close()
+    return progress
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="보도자료 일괄 생성")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .jsonl)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("-o", "--output", help="결과 폴더 (레코드별 .html/.txt)")
+    output.add_argument("--zip", help="결과 zip 파일")
+    parser.add_argument("--mode", choices=["webhook", "offline"], default="offline",
+                        help="webhook: n8n으로 생성 / offline: 기본 템플릿으로 생성")
+    parser.add_argument("--concurrency", type=int, default=4, help="webhook 동시 호출 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="렌더링 프로세스 수")
+    parser.add_argument("--resume", action="store_true", help="이전 실행에서 완료된 레코드는 건너뜀")
+    parser.add_argument("--errors", help="검증 실패/오류 레코드를 기록할 JSONL 파일")
+    parser.add_argument("--minify", action="store_true", help="HTML 들여쓰기/주석 제거 (표시 결과는 동일)")
+    parser.add_argument("--compress", nargs="+", choices=sorted(COMPRESSED_EXTENSIONS),
+                        help="HTML 압축본(.html.gz/.html.br)도 함께 저장 (폴더 출력만, br은 brotli 패키지 필요)")
+    args = parser.parse_args(argv)
+    if args.compress and args.zip:
+        parser.error("--compress는 폴더 출력(-o)에서만 사용할 수 있습니다. (zip은 이미 압축됨)")
+    missing = [encoding for encoding in args.compress or () if encoding not in available_encodings()]
+    if missing:
+        parser.error(f"사용할 수 없는 압축 방식입니다: {', '.join(missing)} (brotli 패키지를 설치하세요)")
+
+    progress = run_batch(args)
+    print(progress.summary())
+    return 1 if progress.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
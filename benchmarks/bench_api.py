@@ -0,0 +1,175 @@
+"""
+HTTP API(api_server.py) 처리량 측정 + Streamlit 경로와 비교
+
+- API: 워커 수별로 api_server를 새 프로세스로 띄우고, 클라이언트 프로세스 여러 개에서 동시에 요청
+  - render: 매번 다른 본문 렌더링 (캐시 적중 없음)
+  - render-304: 같은 본문을 If-None-Match와 함께 요청 (ETag 적중)
+  - generate+render: 기본 템플릿(offline)으로 생성 후 렌더링 (요청 2개)
+  - batch-render: 한 요청에 렌더링 항목 N개
+- Streamlit: AppTest로 결과 화면(미리보기 + 다운로드 버튼) 스크립트 실행 한 번을 같은 렌더링 한 건으로 계산
+  (브라우저와 주고받는 웹소켓 전송은 포함하지 않으므로 실제보다 유리한 값)
+
+실행 예시)
+    python -m benchmarks.bench_api --workers 1 4 --clients 4 --concurrency 8 --duration 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from benchmarks.bench_hedging import percentile
+from benchmarks.bench_render import PRODUCT_FORM
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ("render", "render-304", "generate+render", "batch-render")
+
+def _unique_body(base: str, tag: str) -> str:
+    return f"{base}\n\n요청 {tag}"
+
+def _client(base_url: str, scenario: str, duration: float, concurrency: int, batch: int, seed: int) -> tuple:
+    """클라이언트 프로세스 하나: concurrency개 스레드가 duration초 동안 요청. return: (지연시간 목록, 처리 항목 수)"""
+    import requests
+
+    from generation import generate_fallback_template
+
+    data = generate_fallback_template(dict(PRODUCT_FORM))
+
+    def worker(thread_no: int) -> tuple:
+        session = requests.Session()
+        latencies = []
+        items = 0
+        etag = None
+        deadline = time.perf_counter() + duration
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+            tag = f"{seed}-{thread_no}-{n}"
+            start = time.perf_counter()
+            if scenario == "render":
+                response = session.post(f"{base_url}/v1/render",
+                                        json={"title": data["title"], "news_data": _unique_body(data["news_data"], tag)})
+                items += 1
+            elif scenario == "render-304":
+                headers = {"If-None-Match": etag} if etag else {}
+                response = session.post(f"{base_url}/v1/render", headers=headers,
+                                        json={"title": data["title"], "news_data": data["news_data"]})
+                etag = response.headers.get("ETag", etag)
+                items += 1
+            elif scenario == "generate+render":
+                form = dict(PRODUCT_FORM, 맺음말=f"맺음말 {tag}")
+                generated = session.post(f"{base_url}/v1/generate", json={"form_data": form, "mode": "offline"}).json()
+                response = session.post(f"{base_url}/v1/render", json={"title": generated["data"]["title"],
+                                                                       "news_data": generated["data"]["news_data"]})
+                items += 1
+            else:
+                response = session.post(f"{base_url}/v1/render", json=[
+                    {"title": data["title"], "news_data": _unique_body(data["news_data"], f"{tag}-{i}")}
+                    for i in range(batch)
+                ])
+                items += batch
+            if response.status_code not in (200, 304):
+                raise RuntimeError(f"{scenario}: HTTP {response.status_code} {response.text[:200]}")
+            latencies.append(time.perf_counter() - start)
+        return latencies, items
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(worker, range(concurrency)))
+    return [latency for latencies, _ in results for latency in latencies], sum(items for _, items in results)
+
+def _start_api(port: int, workers: int) -> subprocess.Popen:
+    import requests
+
+    process = subprocess.Popen([sys.executable, "api_server.py", "--port", str(port), "--workers", str(workers)],
+                               cwd=ROOT_DIR, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/healthz", timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("API 서버가 시작되지 않았습니다.")
+
+def run_api(args, workers: int) -> list:
+    port = args.port
+    process = _start_api(port, workers)
+    rows = []
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        for scenario in SCENARIOS:
+            with ProcessPoolExecutor(max_workers=args.clients) as executor:
+                futures = [executor.submit(_client, base_url, scenario, args.duration, args.concurrency, args.batch, i)
+                           for i in range(args.clients)]
+                results = [future.result() for future in futures]
+            latencies = [latency for latencies, _ in results for latency in latencies]
+            items = sum(count for _, count in results)
+            rows.append((f"API 워커 {workers}", scenario, len(latencies) / args.duration, items / args.duration,
+                         percentile(latencies, 50), percentile(latencies, 95)))
+    finally:
+        process.terminate()
+        process.wait()
+    return rows
+
+def run_streamlit(args) -> tuple:
+    """AppTest로 결과 화면을 매번 다른 본문으로 다시 그리는 시간 (세션 하나, 순차 실행)"""
+    os.environ["NEWS_AUTO_HISTORY_DB"] = ""
+    os.environ["NEWS_AUTO_PREWARM"] = "0"
+    from streamlit.testing.v1 import AppTest
+
+    from artifact_store import KIND_RESULT, get_artifact_store
+    from generation import generate_fallback_template
+
+    data = generate_fallback_template(dict(PRODUCT_FORM))
+    at = AppTest.from_file(os.path.join(ROOT_DIR, "streamlit_app.py"), default_timeout=60)
+    at.run()
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+        at.session_state["result_ref"] = get_artifact_store().put(
+            dict(data, news_data=_unique_body(data["news_data"], str(n))), KIND_RESULT)
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"Streamlit 실행 중 예외: {at.exception[0].value}")
+    throughput = len(latencies) / args.duration
+    return ("Streamlit (세션 1)", "render", throughput, throughput, percentile(latencies, 50),
+            percentile(latencies, 95))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="API 워커 프로세스 수")
+    parser.add_argument("--clients", type=int, default=4, help="부하 생성 클라이언트 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="클라이언트 프로세스당 동시 요청 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="시나리오별 측정 시간(초)")
+    parser.add_argument("--batch", type=int, default=10, help="batch-render 요청당 항목 수")
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--skip-streamlit", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for workers in args.workers:
+        rows.extend(run_api(args, workers))
+    # AppTest는 __main__ 모듈을 바꾸므로 클라이언트 프로세스를 다 쓴 뒤 마지막에 실행
+    if not args.skip_streamlit:
+        rows.insert(0, run_streamlit(args))
+
+    print(f"CPU {os.cpu_count()}개, 클라이언트 {args.clients}개 x 동시 {args.concurrency}, {args.duration:.0f}초씩\n")
+    print(f"{'대상':<16} {'시나리오':<16} {'요청/s':>9} {'건/s':>9} {'p50(ms)':>9} {'p95(ms)':>9}")
+    for target, scenario, requests_per_second, items_per_second, p50, p95 in rows:
+        print(f"{target:<16} {scenario:<16} {requests_per_second:>9.1f} {items_per_second:>9.1f} "
+              f"{p50 * 1000:>9.2f} {p95 * 1000:>9.2f}")
+    if not args.skip_streamlit:
+        base = rows[0][3]
+        best = max((row for row in rows[1:] if row[1] == "render"), key=lambda row: row[3])
+        print(f"\n렌더링 처리량: {best[0]}이(가) Streamlit 경로의 {best[3] / base:.1f}배 "
+              f"({best[3]:.0f} vs {base:.0f} 건/s)")
+
+if __name__ == "__main__":
+    main()
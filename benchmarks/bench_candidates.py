@@ -0,0 +1,53 @@
+"""
+여러 후보 동시 생성 시 소요 시간 측정 (단일 호출 대비)
+
+실행 예시)
+    python -m benchmarks.bench_candidates --latency 1.0 --candidates 1 2 4
+"""
+import argparse
+import time
+
+import generation
+from benchmarks.stub_webhook import start_stub_server
+from generation_jobs import JOB_MAX_WORKERS, JOB_PER_SESSION_RUNNING, JobManager
+
+SAMPLE_FORM = {"보도자료_유형": "제품 출시/리뷰 보도자료", "제목": "후보 생성 테스트"}
+
+def run(job_manager: JobManager, count: int) -> float:
+    start = time.perf_counter()
+    # 앱과 같이 후보들은 함께 실행하고, 첫 후보만 응답 캐시에 저장
+    running_limit = count if count > 1 else None
+    job_ids = [
+        job_manager.submit("bench-session", generation.generate_press_release, dict(SAMPLE_FORM), True,
+                           running_limit=running_limit, cache_result=no == 0)
+        for no in range(count)
+    ]
+    while not all(job_manager.get(job_id).finished for job_id in job_ids):
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    assert not any(job_manager.get(job_id).result["fallback"] for job_id in job_ids)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="후보 동시 생성 벤치마크")
+    parser.add_argument("--latency", type=float, default=1.0, help="stub 응답 지연(초)")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--max-workers", type=int, default=JOB_MAX_WORKERS, help="전역 동시 실행 상한")
+    parser.add_argument("--per-session", type=int, default=JOB_PER_SESSION_RUNNING, help="세션별 동시 실행 상한")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(latency=args.latency)
+    generation.WEBHOOK_URLS = [url]
+    job_manager = JobManager(max_workers=args.max_workers, per_session_running=args.per_session)
+    try:
+        single = None
+        for count in args.candidates:
+            elapsed = run(job_manager, count)
+            single = single or elapsed
+            print(f"후보 {count}개: {elapsed:.3f} s  (단일 호출 대비 {elapsed / single:.2f}배)")
+    finally:
+        job_manager.shutdown()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+같은 입력 동시 생성 요청 합치기(single-flight) 확인
+
+여러 세션이 같은 폼을 거의 동시에 제출하는 상황을 스레드로 재현하고,
+로컬 stub 서버가 받은 요청 수, 소요 시간, 결과가 모두 같은지 확인합니다.
+기대한 동작과 다르면 종료 코드 1을 반환합니다.
+
+실행 예시)
+    python -m benchmarks.bench_coalescing --sessions 20 --latency 0.5
+"""
+import argparse
+import sys
+import threading
+import time
+
+import circuit_breaker
+import generation
+from benchmarks.bench_resilience import SAMPLE_FORM
+from benchmarks.stub_webhook import start_stub_server
+from response_cache import get_response_cache
+from single_flight import get_generation_flight
+
+def submit_all(sessions: int, force_regenerate: bool = False, with_progress: bool = False) -> tuple:
+    """sessions개 스레드가 같은 폼을 동시에 제출합니다. return: (결과 목록, 세션별 진행 상황 전달 횟수, 소요 시간)"""
+    get_response_cache()._items.clear()
+    barrier = threading.Barrier(sessions)
+    outcomes = [None] * sessions
+    progress_counts = [0] * sessions
+
+    def session(i: int):
+        def on_progress(text):
+            progress_counts[i] += 1
+
+        barrier.wait()
+        outcomes[i] = generation.generate_press_release(dict(SAMPLE_FORM), force_regenerate,
+                                                        on_progress=on_progress if with_progress else None)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes, progress_counts, time.perf_counter() - start
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="동시 요청 합치기 확인")
+    parser.add_argument("--sessions", type=int, default=20, help="동시에 제출하는 세션 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="stub 응답 지연(초)")
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(name: str, ok: bool, detail: str):
+        print(f"[{'OK' if ok else 'FAIL'}] {name}: {detail}")
+        if not ok:
+            failures.append(name)
+
+    server, url = start_stub_server(latency=args.latency)
+    generation.WEBHOOK_URLS = [url]
+    flight = get_generation_flight()
+    n = args.sessions
+    try:
+        def run(expected_requests: int, **kwargs):
+            before = server.config.request_count
+            outcomes, progress_counts, elapsed = submit_all(n, **kwargs)
+            requests_sent = server.config.request_count - before
+            titles = {outcome["data"]["title"] for outcome in outcomes}
+            coalesced = sum(bool(outcome.get("coalesced")) for outcome in outcomes)
+            ok = requests_sent == expected_requests and len(titles) == 1
+            detail = f"webhook 요청 {requests_sent}회, 합쳐진 요청 {coalesced}개, {elapsed:.3f}s"
+            return outcomes, progress_counts, ok, detail
+
+        # 1. 합치기 끔 → 세션마다 webhook 호출
+        flight.enabled = False
+        _, _, ok, detail = run(n)
+        check(f"합치기 끔 (세션 {n}개)", ok, detail)
+        flight.enabled = True
+
+        # 2. 합치기 켬 → webhook 한 번, 나머지는 같은 결과 공유
+        outcomes, _, ok, detail = run(1)
+        ok = ok and sum(outcome["coalesced"] for outcome in outcomes) == n - 1 and flight.in_flight() == 0
+        check(f"합치기 켬 (세션 {n}개)", ok, detail)
+
+        # 3. '새로 생성'은 서로 다른 결과를 원하므로 합치지 않음
+        _, _, ok, detail = run(n, force_regenerate=True)
+        check("새로 생성은 합치지 않음", ok, detail)
+
+        # 4. 스트리밍 응답 → follower도 진행 상황을 받음
+        server.config.mode = "ndjson"
+        server.config.chunk_delay = args.latency / server.config.chunk_count
+        _, progress_counts, ok, detail = run(1, with_progress=True)
+        check("follower에게 스트리밍 진행 상황 전달", ok and all(progress_counts),
+              f"{detail}, 진행 상황 받은 세션 {sum(1 for count in progress_counts if count)}/{n}")
+        server.config.mode = "json"
+
+        # 5. webhook 실패 → 한 요청의 폴백 결과를 모두 받음 (재시도 포함 요청 수는 세션 수와 무관)
+        circuit_breaker.get_breaker(url).record_success()
+        server.config.error_rate = 1.0
+        before = server.config.request_count
+        outcomes, _, elapsed = submit_all(n)
+        requests_sent = server.config.request_count - before
+        check("실패 시 폴백 공유", all(outcome["fallback"] for outcome in outcomes)
+              and requests_sent <= generation.WEBHOOK_MAX_RETRIES + 1,
+              f"webhook 요청 {requests_sent}회 (재시도 포함), 폴백 {sum(o['fallback'] for o in outcomes)}/{n}, "
+              f"{elapsed:.3f}s")
+        server.config.error_rate = 0.0
+        circuit_breaker.get_breaker(url).record_success()
+
+        # 6. leader가 늦으면 follower는 제한 시간 뒤 폴백
+        flight.wait_timeout = args.latency / 5
+        outcomes, _, elapsed = submit_all(n)
+        timeouts = sum(outcome["error"] == generation.ERROR_COALESCE_TIMEOUT for outcome in outcomes)
+        check("follower 대기 제한 시간", timeouts == n - 1 and elapsed < args.latency * 2,
+              f"제한 시간 초과 {timeouts}/{n - 1}, {elapsed:.3f}s")
+    finally:
+        server.shutdown()
+
+    if failures:
+        print(f"\n실패: {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+헤지 요청 효과 측정: 가끔 느려지는 1순위 엔드포인트 + 정상 2순위 엔드포인트
+
+실행 예시)
+    python -m benchmarks.bench_hedging --requests 100 --slow-rate 0.03 --slow-latency 3
+"""
+import argparse
+import random
+import time
+
+import generation
+from benchmarks.bench_resilience import SAMPLE_FORM
+from benchmarks.stub_webhook import start_stub_server
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def run(urls: list, count: int) -> tuple:
+    latencies = []
+    fallbacks = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        outcome = generation.request_generation_hedged(dict(SAMPLE_FORM), webhook_urls=urls)
+        latencies.append(time.perf_counter() - start)
+        fallbacks += outcome["fallback"]
+    return latencies, fallbacks
+
+def main():
+    parser = argparse.ArgumentParser(description="헤지 요청 벤치마크")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2, help="정상 응답 시간(초)")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="1순위가 느려지는 비율")
+    parser.add_argument("--slow-latency", type=float, default=3.0, help="느려질 때 추가 지연(초)")
+    args = parser.parse_args()
+
+    random.seed(7)
+    primary, primary_url = start_stub_server(latency=args.latency)
+    primary.config.slow_rate = args.slow_rate
+    primary.config.slow_latency = args.slow_latency
+    secondary, secondary_url = start_stub_server(latency=args.latency)
+    try:
+        # 1순위 엔드포인트 응답 시간 표본 확보 (헤지 기준 백분위수 계산용)
+        run([primary_url], 20)
+        for name, urls in (("단일 엔드포인트", [primary_url]), ("헤지 (2개)", [primary_url, secondary_url])):
+            latencies, fallbacks = run(urls, args.requests)
+            print(f"{name:<12} p50 {percentile(latencies, 50):.3f}s  p95 {percentile(latencies, 95):.3f}s  "
+                  f"p99 {percentile(latencies, 99):.3f}s  max {max(latencies):.3f}s  폴백 {fallbacks}")
+        print(f"2순위 요청 수: {secondary.config.request_count}")
+    finally:
+        primary.shutdown()
+        secondary.shutdown()
+
+if __name__ == "__main__":
+    main()
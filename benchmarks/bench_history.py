@@ -0,0 +1,87 @@
+"""
+보도자료 기록 저장소(SQLite + FTS5) 규모별 성능 측정
+
+임시 DB에 기록을 N건 넣은 뒤 저장, 최신 목록, 깊은 페이지(keyset vs OFFSET), 검색, 다시 열기 시간을 잽니다.
+
+실행 예시)
+    python -m benchmarks.bench_history --records 20000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import generation
+from benchmarks.bench_render import EVENT_FORM, PRODUCT_FORM
+from history_store import HistoryStore
+
+WORDS = ["모니터", "그래픽카드", "메인보드", "노트북", "키보드", "마우스", "게이밍", "출시", "이벤트", "할인",
+         "사은품", "프로모션", "신제품", "고성능", "저전력", "무선", "기가바이트", "리뷰", "행사", "체험단"]
+
+def make_record(i: int, rng: random.Random) -> tuple:
+    form = dict(PRODUCT_FORM if i % 3 else EVENT_FORM)
+    form["제목"] = f"{' '.join(rng.sample(WORDS, 3))} 보도자료 #{i}"
+    data = generation.generate_fallback_template(form)
+    data["news_data"] = data["news_data"] + "\n\n" + " ".join(rng.choices(WORDS, k=40))
+    return form, data
+
+def timed(func, repeat: int = 20) -> tuple:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return result, statistics.median(samples) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"))
+        html_bytes = b"<html>" + b"x" * 15000 + b"</html>"
+        start = time.perf_counter()
+        for i in range(args.records):
+            form, data = make_record(i, rng)
+            store.save(form, data, html_bytes=html_bytes)
+        elapsed = time.perf_counter() - start
+        print(f"저장: {args.records:,}건 {elapsed:.1f}s ({args.records / elapsed:,.0f}건/s), "
+              f"DB {os.path.getsize(store.path) / 1e6:.1f} MB (WAL 제외)")
+
+        page, first_ms = timed(lambda: store.list_page(limit=args.page_size))
+        print(f"최신 목록 첫 페이지:            {first_ms:7.2f} ms")
+
+        # 목록 끝 쪽 페이지: keyset(id < 커서) vs OFFSET
+        deep_page = args.records // args.page_size - 1
+        cursor_id = args.records - deep_page * args.page_size + 1
+        _, keyset_ms = timed(lambda: store.list_page(before_id=cursor_id, limit=args.page_size))
+        offset_sql = "SELECT id, title FROM releases ORDER BY id DESC LIMIT ? OFFSET ?"
+        _, offset_ms = timed(lambda: store._conn.execute(offset_sql, (args.page_size, deep_page * args.page_size))
+                             .fetchall())
+        print(f"{deep_page + 1:,} 페이지 (keyset):           {keyset_ms:7.2f} ms")
+        print(f"{deep_page + 1:,} 페이지 (OFFSET, 비교용):   {offset_ms:7.2f} ms")
+
+        for query in ("모니터", "게이밍 무선 할인", "체험단 #1999", "없는검색어"):
+            result, search_ms = timed(lambda: store.list_page(query, limit=args.page_size))
+            print(f"검색 '{query}' 첫 페이지:".ljust(32) + f"{search_ms:7.2f} ms ({len(result['items'])}건)")
+        result = store.list_page("모니터", limit=args.page_size)
+        for _ in range(50):
+            if result["next_before_id"] is None:
+                break
+            result = store.list_page("모니터", before_id=result["next_before_id"], limit=args.page_size)
+        _, deep_search_ms = timed(lambda: store.list_page("모니터", before_id=result["items"][-1]["id"],
+                                                          limit=args.page_size))
+        print(f"검색 '모니터' 51 페이지:".ljust(32) + f"{deep_search_ms:7.2f} ms")
+
+        release_id = page["items"][-1]["id"]
+        _, get_ms = timed(lambda: store.get(release_id))
+        print(f"다시 열기(기록 1건 읽기):       {get_ms:7.2f} ms")
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+공유 커넥션 풀(keep-alive) vs 요청마다 새 연결 비교 벤치마크
+
+실행 예시)
+    python -m benchmarks.bench_http_client --requests 300
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import requests
+
+from benchmarks.stub_webhook import start_stub_server
+from http_client import async_post_json, close_async_client, create_http_session
+
+SAMPLE_FORM = {"보도자료_유형": "제품 출시/리뷰 보도자료", "제목": "벤치마크"}
+
+def _measure(call, count: int) -> list:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = call()
+        response.content
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def _report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<28} mean {statistics.mean(latencies) * 1e3:7.3f} ms   "
+          f"p50 {statistics.median(latencies) * 1e3:7.3f} ms   p95 {p95 * 1e3:7.3f} ms")
+    return statistics.mean(latencies)
+
+async def _measure_async(url: str, count: int) -> list:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await async_post_json(url, SAMPLE_FORM, timeout=30)
+        response.content
+        latencies.append(time.perf_counter() - start)
+    await close_async_client()
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 커넥션 풀 벤치마크")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--response-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(response_size=args.response_size)
+    session = create_http_session()
+    try:
+        # 워밍업
+        session.post(url, json=SAMPLE_FORM, timeout=30).content
+
+        fresh = _measure(lambda: requests.post(url, json=SAMPLE_FORM, timeout=30), args.requests)
+        pooled = _measure(lambda: session.post(url, json=SAMPLE_FORM, timeout=30), args.requests)
+        async_latencies = asyncio.run(_measure_async(url, args.requests))
+
+        print(f"requests: {args.requests}, stub: {url}")
+        fresh_mean = _report("requests.post (새 연결)", fresh)
+        pooled_mean = _report("공유 세션 (keep-alive)", pooled)
+        _report("async_post_json", async_latencies)
+        print(f"요청당 연결 설정 비용 절감: {(fresh_mean - pooled_mean) * 1e3:.3f} ms")
+    finally:
+        session.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
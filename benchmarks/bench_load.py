@@ -0,0 +1,300 @@
+"""
+동시 사용자 부하 테스트: 레플리카 하나가 감당할 수 있는 동시 사용자 수 추정
+
+가상 사용자마다 AppTest 세션을 하나씩 만들고, 실제 사용자와 같은 경로로 폼을 채워 제출합니다.
+(필수 입력 검증 → 생성 작업 제출/진행 상태 확인 → show_result 결과 화면)
+webhook은 로컬 stub 서버(지연, 오류 비율, 응답 크기 조정)를 사용하고,
+사용자 수 단계별로 처리량, 제출~결과 표시까지의 p50/p95/p99, 폴백 비율, 프로세스 RSS 변화를 출력합니다.
+
+- 진행 상태 확인은 브라우저의 fragment 자동 갱신 대신 JOB_POLL_INTERVAL마다 스크립트 전체를 다시 실행
+  (실제보다 CPU를 더 씀), 브라우저와 주고받는 웹소켓 전송은 포함하지 않음
+- AppTest 제약으로 세션들의 스크립트 실행은 한 번에 하나씩 (Streamlit 서버도 GIL 때문에 사실상 같음)
+- stub 서버도 같은 프로세스에서 실행되므로 CPU를 나눠 씀. 따로 띄운 stub/n8n은 --webhook-url로 지정
+
+실행 예시)
+    python -m benchmarks.bench_load --users 1 10 50 --duration 30 --latency 2
+    python -m benchmarks.bench_load --users 20 --error-rate 0.1 --response-size 20000
+    python -m benchmarks.bench_load --users 50 --max-p95 5 --max-rss-mb 800   # 넘으면 종료 코드 1
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+import generation
+from artifact_store import memory_report
+from metrics import process_rss_bytes
+from benchmarks.bench_hedging import percentile
+from benchmarks.bench_render import EVENT_FORM, PRODUCT_FORM
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# AppTest는 실행할 때마다 전역 Runtime을 바꿔 끼우므로 스크립트 실행은 한 번에 하나씩
+# (스크립트 실행은 어차피 GIL을 나눠 쓰고, webhook 호출/응답 처리는 작업 스레드에서 동시에 진행됨)
+_SCRIPT_LOCK = threading.Lock()
+
+# 결과 화면의 안내 메시지 중 webhook 결과를 그대로 받은 경우 (나머지 경고/오류는 폴백)
+OK_MESSAGES = ("성공적으로 생성", "불러왔습니다", "함께 받았습니다")
+
+class RssSampler(threading.Thread):
+    """interval초마다 RSS와 진행 상황을 기록합니다."""
+
+    def __init__(self, interval: float, stats: dict):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stats = stats
+        self.samples = []  # (경과 시간, RSS, 동시 사용자 수, 완료 수)
+        self._stop_event = threading.Event()
+        self._start = time.perf_counter()
+
+    def sample(self):
+        self.samples.append((time.perf_counter() - self._start, process_rss_bytes(), self.stats["active"],
+                             self.stats["completed"]))
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+class VirtualUser:
+    """AppTest 세션 하나로 폼 제출을 반복하는 가상 사용자"""
+
+    def __init__(self, name: str, args, poll_interval: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.name = name
+        self.args = args
+        self.poll_interval = poll_interval
+        self.at = AppTest.from_file(os.path.join(ROOT_DIR, "streamlit_app.py"), default_timeout=60)
+        self.submissions = 0
+        self._run()
+
+    def _run(self):
+        with _SCRIPT_LOCK:
+            self.at.run()
+
+    def fill_form(self, form_data: dict, rerun: bool = False):
+        """
+        폼 항목을 표시 순서(라벨 번호)대로 채웁니다.
+        rerun: 채운 뒤 스크립트를 다시 실행 (st.form 밖 입력처럼 입력할 때마다 rerun되는 경우)
+        """
+        at = self.at
+        if at.selectbox[0].value != form_data["보도자료_유형"]:
+            at.selectbox[0].set_value(form_data["보도자료_유형"])
+            self._run()
+        widgets = [w for w in list(at.text_input) + list(at.text_area) if w.label[:1].isdigit()]
+        for n, value in enumerate(list(form_data.values())[1:], 1):
+            next(w for w in widgets if w.label.startswith(f"{n}. ")).set_value(value)
+        if rerun:
+            self._run()
+
+    def _next_form(self) -> tuple:
+        """다음 제출 내용 (매번 다른 제목으로 캐시 적중을 피하고, repeat-rate 비율은 모든 사용자가 같은 입력)"""
+        self.submissions += 1
+        base = PRODUCT_FORM if self.submissions % 2 else EVENT_FORM
+        if random.random() < self.args.invalid_rate:
+            return dict(base, 제목=""), False
+        if random.random() < self.args.repeat_rate:
+            return dict(base), True
+        return dict(base, 제목=f"{base['제목']} #{self.name}-{self.submissions}"), True
+
+    def submit(self) -> tuple:
+        """
+        폼을 한 번 제출하고 결과가 표시될 때까지 진행 상태를 확인합니다.
+        return: (결과 종류, 제출~결과 표시 시간) - 결과 종류: ok | fallback | invalid | error
+        """
+        form_data, valid = self._next_form()
+        self.fill_form(form_data)
+        return self.click_submit(valid)
+
+    def click_submit(self, valid: bool = True) -> tuple:
+        """채워 둔 폼을 제출하고 결과가 표시될 때까지 진행 상태를 확인합니다. (return은 submit과 같음)"""
+        at = self.at
+        start = time.perf_counter()
+        # 추측 생성을 켜면 제출 버튼이 st.form 밖의 일반 버튼
+        buttons = list(at.get("form_submit_button")) + list(at.button)
+        next(b for b in buttons if b.label == "AI 보도자료 생성").click()
+        self._run()
+        if not valid:
+            return ("invalid" if any("필수 항목" in e.value for e in at.error) else "error"), \
+                time.perf_counter() - start
+        while at.session_state["job_ids"] and not at.exception:
+            time.sleep(self.poll_interval)
+            self._run()
+        elapsed = time.perf_counter() - start
+        if at.exception or "result_ref" not in at.session_state:
+            return "error", elapsed
+        if any(message in e.value for e in at.success for message in OK_MESSAGES):
+            return "ok", elapsed
+        return "fallback", elapsed
+
+def run_level(users: int, args, stats: dict) -> dict:
+    """users명이 duration초 동안 제출을 반복합니다."""
+    from streamlit_app import JOB_POLL_INTERVAL
+
+    results = []
+    lock = threading.Lock()
+    start_rss = process_rss_bytes()
+    window = {}
+
+    def start_window():
+        # 세션(AppTest) 준비가 모두 끝난 뒤부터 측정
+        window["began"] = time.perf_counter()
+        window["deadline"] = window["began"] + args.duration
+
+    ready = threading.Barrier(users + 1, action=start_window)
+
+    def user(no: int):
+        vu = VirtualUser(f"{users}-{no}", args, args.poll_interval or JOB_POLL_INTERVAL)
+        ready.wait()
+        # 제출 시점이 한꺼번에 몰리지 않도록 ramp초 안에서 나눠 시작
+        time.sleep(args.ramp * no / users)
+        with lock:
+            stats["active"] += 1
+        try:
+            while time.perf_counter() < window["deadline"]:
+                result = vu.submit()
+                with lock:
+                    results.append(result)
+                    stats["completed"] += 1
+                if args.think_time:
+                    time.sleep(random.uniform(0, args.think_time))
+        finally:
+            with lock:
+                stats["active"] -= 1
+
+    threads = [threading.Thread(target=user, args=(no,), daemon=True) for no in range(users)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - window["began"]
+
+    generated = [latency for kind, latency in results if kind in ("ok", "fallback")]
+    counts = {kind: sum(1 for k, _ in results if k == kind) for kind in ("ok", "fallback", "invalid", "error")}
+    return {
+        "users": users,
+        "elapsed": elapsed,
+        "submissions": len(results),
+        "counts": counts,
+        "throughput": len(generated) / elapsed,
+        "p50": percentile(generated, 50) if generated else None,
+        "p95": percentile(generated, 95) if generated else None,
+        "p99": percentile(generated, 99) if generated else None,
+        "fallback_rate": counts["fallback"] / len(generated) if generated else None,
+        "rss_start": start_rss,
+        "rss_end": process_rss_bytes(),
+    }
+
+def _mb(value: int) -> float:
+    return value / 1024 / 1024
+
+def _ms(value) -> str:
+    return f"{value * 1000:>8.0f}" if value is not None else f"{'-':>8}"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 25], help="동시 사용자 수 (단계별로 실행)")
+    parser.add_argument("--duration", type=float, default=20.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="사용자들이 나눠서 시작하는 시간(초)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="제출 사이 대기 시간 상한(초, 0~값 사이 무작위)")
+    parser.add_argument("--poll-interval", type=float, default=None, help="진행 상태 확인 주기(초, 기본 JOB_POLL_INTERVAL)")
+    parser.add_argument("--repeat-rate", type=float, default=0.0, help="모든 사용자가 같은 입력을 제출하는 비율 (캐시/합치기 적중)")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="필수 항목을 비우고 제출하는 비율")
+    parser.add_argument("--latency", type=float, default=1.0, help="stub 응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub 500 응답 비율 (0~1)")
+    parser.add_argument("--response-size", type=int, default=2000, help="stub news_data 글자 수")
+    parser.add_argument("--mode", default="json", choices=["json", "text", "chunked", "ndjson", "sse"])
+    parser.add_argument("--webhook-url", default=None, help="따로 띄운 stub/n8n webhook 주소 (지정하면 내장 stub 미사용)")
+    parser.add_argument("--sample-interval", type=float, default=2.0, help="RSS 기록 주기(초)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="결과를 JSON 파일로 저장 (레플리카 크기 산정/회귀 비교용)")
+    parser.add_argument("--max-p95", type=float, default=None, help="p95(초) 상한 - 넘으면 종료 코드 1")
+    parser.add_argument("--max-fallback-rate", type=float, default=None, help="폴백 비율 상한 - 넘으면 종료 코드 1")
+    parser.add_argument("--max-rss-mb", type=float, default=None, help="최대 RSS(MB) 상한 - 넘으면 종료 코드 1")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    server = None
+    if args.webhook_url:
+        url = args.webhook_url
+    else:
+        from benchmarks.stub_webhook import start_stub_server
+
+        server, url = start_stub_server(latency=args.latency, error_rate=args.error_rate,
+                                        response_size=args.response_size, mode=args.mode)
+    generation.WEBHOOK_URLS = [url]
+    generation.WEBHOOK_URL = url
+    # 앱 모듈을 불러오기 전에 설정 (기록 저장소는 디스크 I/O를 빼기 위해 끔)
+    os.environ["NEWS_AUTO_HISTORY_DB"] = ""
+    os.environ["NEWS_AUTO_PREWARM"] = "0"
+    # 실행마다 반복되는 deprecation/bare mode 경고 로그 숨김 (AppTest가 설정을 다시 읽어 로그 수준은 초기화됨)
+    for name in ("streamlit.deprecation_util", "streamlit.runtime.scriptrunner_utils.script_run_context"):
+        logging.getLogger(name).disabled = True
+
+    stats = {"active": 0, "completed": 0}
+    sampler = RssSampler(args.sample_interval, stats)
+    sampler.start()
+    levels = []
+    try:
+        for users in args.users:
+            levels.append(run_level(users, args, stats))
+    finally:
+        sampler.stop()
+        if server is not None:
+            server.shutdown()
+
+    print(f"CPU {os.cpu_count()}개, 단계별 {args.duration:.0f}초, stub 지연 {args.latency}s / 오류 {args.error_rate:.0%} / "
+          f"응답 {args.response_size:,}자 ({args.mode})\n")
+    print(f"{'사용자':>6} {'제출':>6} {'생성/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'폴백':>7} "
+          f"{'오류':>5} {'RSS 시작→끝(MB)':>18}")
+    for level in levels:
+        fallback = f"{level['fallback_rate']:>7.1%}" if level["fallback_rate"] is not None else f"{'-':>7}"
+        print(f"{level['users']:>6} {level['submissions']:>6} {level['throughput']:>8.2f} {_ms(level['p50'])} "
+              f"{_ms(level['p95'])} {_ms(level['p99'])} {fallback} {level['counts']['error']:>5} "
+              f"{_mb(level['rss_start']):>8.0f} → {_mb(level['rss_end']):<7.0f}")
+
+    print("\nRSS 변화")
+    print(f"{'경과(s)':>8} {'RSS(MB)':>8} {'사용자':>6} {'완료':>6}")
+    for elapsed, rss, active, completed in sampler.samples:
+        print(f"{elapsed:>8.1f} {_mb(rss):>8.0f} {active:>6} {completed:>6}")
+    peak_rss = max(rss for _, rss, _, _ in sampler.samples)
+    print(f"최대 RSS: {_mb(peak_rss):.0f} MB")
+    report = memory_report()
+    store = report["artifact_store"]
+    print(f"세션 결과 저장소: {store['entries']}개 {_mb(store['bytes']):.1f} MB (세션 {store['sessions']}개), "
+          f"렌더링 캐시 {_mb(report['render_cache']['bytes']):.1f} MB, "
+          f"다운로드 캐시 {_mb(report['download_cache']['bytes']):.1f} MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "levels": levels, "peak_rss": peak_rss,
+                       "rss_samples": sampler.samples, "memory": report}, f, ensure_ascii=False, indent=2)
+
+    failures = []
+    for level in levels:
+        if args.max_p95 is not None and level["p95"] is not None and level["p95"] > args.max_p95:
+            failures.append(f"사용자 {level['users']}명 p95 {level['p95']:.2f}s > {args.max_p95:.2f}s")
+        if args.max_fallback_rate is not None and (level["fallback_rate"] or 0) > args.max_fallback_rate:
+            failures.append(f"사용자 {level['users']}명 폴백 비율 {level['fallback_rate']:.1%} > "
+                            f"{args.max_fallback_rate:.1%}")
+        if level["counts"]["error"]:
+            failures.append(f"사용자 {level['users']}명 오류 {level['counts']['error']}건")
+    if args.max_rss_mb is not None and _mb(peak_rss) > args.max_rss_mb:
+        failures.append(f"최대 RSS {_mb(peak_rss):.0f} MB > {args.max_rss_mb:.0f} MB")
+    if failures:
+        print("\n실패: " + ", ".join(failures))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+세션 결과 메모리 사용량: 세션마다 결과를 따로 보관 vs 공유 저장소(artifact_store) + idle 세션 정리
+
+세션 수만큼 webhook 응답을 파싱한 결과(세션별로 다른 문자열 객체)를 만들고, tracemalloc으로 보관 비용을 비교합니다.
+- 세션별 보관: 이전 방식처럼 세션 상태에 generated_data/form_data를 그대로 보관
+- 공유 저장소: 세션에는 ref만 두고 같은 내용은 한 벌만 보관
+- idle 정리: 세션 일부가 idle 상태가 된 뒤 evict_idle로 정리
+- 메모리 상한: 저장소 상한을 줄였을 때 활성 세션 결과가 남는지와 디스크 폴더 사용 시 다시 읽히는지
+
+실행 예시)
+    python -m benchmarks.bench_memory --sessions 500 --distinct 200 --response-size 20000
+"""
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+
+from artifact_store import KIND_FORM, KIND_RESULT, ArtifactStore
+from benchmarks.bench_render import PRODUCT_FORM
+from benchmarks.stub_webhook import build_result
+from generation import parse_webhook_response
+
+def make_sessions(sessions: int, distinct: int, response_size: int) -> list:
+    """세션별 (폼 입력, webhook 응답 본문) - distinct 종류의 입력을 돌려가며 사용"""
+    rows = []
+    for i in range(sessions):
+        form_data = dict(PRODUCT_FORM, 제목=f"{PRODUCT_FORM['제목']} #{i % distinct}")
+        body = json.dumps([build_result(form_data, response_size)], ensure_ascii=False).encode("utf-8")
+        rows.append((form_data, body))
+    return rows
+
+def _parse(form_data: dict, body: bytes) -> tuple:
+    # 세션마다 응답을 따로 받아 파싱한 것처럼 새 객체를 만듦
+    return parse_webhook_response("application/json", body), json.loads(json.dumps(form_data))
+
+def measure(build) -> tuple:
+    """build()가 만든 객체가 차지하는 메모리(바이트)와 결과"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+def _mb(value: int) -> str:
+    return f"{value / 1024 / 1024:8.2f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500, help="세션 수")
+    parser.add_argument("--distinct", type=int, default=200, help="서로 다른 결과 수 (같은 결과를 여러 세션이 엶)")
+    parser.add_argument("--response-size", type=int, default=20000, help="news_data 글자 수")
+    parser.add_argument("--idle-ratio", type=float, default=0.8, help="idle 상태가 되는 세션 비율")
+    args = parser.parse_args()
+
+    rows = make_sessions(args.sessions, args.distinct, args.response_size)
+
+    def per_session():
+        return [_parse(form_data, body) for form_data, body in rows]
+
+    store = ArtifactStore(max_bytes=1 << 40, artifact_dir="", idle_ttl=0.5)
+
+    def shared():
+        session_refs = {}
+        for i, (form_data, body) in enumerate(rows):
+            generated_data, form_copy = _parse(form_data, body)
+            refs = (store.put(generated_data, KIND_RESULT), store.put(form_copy, KIND_FORM))
+            store.touch_session(f"session-{i}", refs)
+            session_refs[f"session-{i}"] = refs
+        return session_refs
+
+    per_session_bytes, _ = measure(per_session)
+    shared_bytes, session_refs = measure(shared)
+    stats = store.stats()
+    full_bytes = stats["bytes"]
+    print(f"세션 {args.sessions}개, 서로 다른 결과 {args.distinct}개, 본문 {args.response_size:,}자\n")
+    print(f"세션별 보관        {_mb(per_session_bytes)}")
+    print(f"공유 저장소        {_mb(shared_bytes)}  (저장소 추정 {_mb(stats['bytes'])}, "
+          f"세션별로 보관했다면 {_mb(stats['referenced_bytes'])}, 중복 제거 {stats['dedup_hits']}회)")
+
+    # 일부 세션만 계속 사용(rerun)하고 나머지는 idle
+    active = list(session_refs.items())[:int(args.sessions * (1 - args.idle_ratio))]
+    time.sleep(store.idle_ttl * 1.5)
+    for session_id, refs in active:
+        store.touch_session(session_id, refs)
+    evicted_sessions = store.evict_idle()
+    stats = store.stats()
+    kept = all(store.get(ref) is not None for _, refs in active for ref in refs)
+    print(f"idle 정리 후       {_mb(stats['bytes'])}  (세션 {evicted_sessions}개 정리, 남은 항목 {stats['entries']}개, "
+          f"활성 세션 결과 유지: {'예' if kept else '아니오'})")
+
+    # 메모리 상한(전체의 절반): 활성 세션(1/4)이 보는 항목은 마지막에 내림, 디스크 폴더가 있으면 다시 읽음
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        capped = ArtifactStore(max_bytes=max(1, full_bytes // 2), artifact_dir=artifact_dir, idle_ttl=60)
+        refs = []
+        for i, (form_data, body) in enumerate(rows[:args.distinct]):
+            ref = capped.put(_parse(form_data, body)[0], KIND_RESULT)
+            if i < args.distinct // 4:
+                capped.touch_session(f"active-{i}", [ref])
+            refs.append(ref)
+        capped_stats = capped.stats()
+        pinned_kept = all(ref in capped._items for ref in refs[:args.distinct // 4])
+        reread = all(capped.get(ref) is not None for ref in refs)
+        print(f"메모리 상한 {_mb(capped.max_bytes)}: 사용 {_mb(capped_stats['bytes'])}, "
+              f"내린 항목 {capped_stats['evicted']}개, 활성 세션 결과 유지: {'예' if pinned_kept else '아니오'}, "
+              f"디스크에서 다시 읽기: {'예' if reread else '아니오'} ({capped.stats()['disk_reads']}회)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+HTML 출력 방식별 크기/시간 비교 (채널별 minify·압축 방식 선택용)
+
+본문 길이(배수)와 스타일 모드(inline/class)마다 원본, minify, gzip(수준별), brotli(설치된 경우)의
+결과 크기와 처리 시간(반복 중 최솟값)을 표로 보여줍니다.
+minify 결과는 HTML 파서로 원본과 태그/텍스트가 같은지 확인합니다.
+
+실행 예시)
+    python -m benchmarks.bench_output
+    python -m benchmarks.bench_output --scales 1 20 --repeat 20
+"""
+import argparse
+import re
+import time
+from html.parser import HTMLParser
+
+import generation
+import html_output
+from benchmarks.bench_render import PRODUCT_FORM
+from html_output import compress, minify_html
+from jinja_utils import STYLE_MODE_CLASS, STYLE_MODE_INLINE, generate_press_release_html
+
+class _Events(HTMLParser):
+    """표시에 영향을 주는 요소(태그, 속성, 공백을 합친 텍스트)만 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+        self._text = []
+
+    def _flush(self):
+        text = " ".join("".join(self._text).split())
+        if self.events and self.events[-1][:2] == ("start", "style"):
+            text = "".join(text.split())
+        if text:
+            self.events.append(("text", text))
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        self.events.append(("start", tag, tuple((k, re.sub(r"([:;])\s+", r"\1", v or "").strip()) for k, v in attrs)))
+
+    def handle_endtag(self, tag):
+        self._flush()
+        self.events.append(("end", tag))
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+def html_events(html: str) -> list:
+    parser = _Events()
+    parser.feed(html)
+    parser.close()
+    parser._flush()
+    return parser.events
+
+def measure(func, repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50], help="본문 반복 배수")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    data = generation.generate_fallback_template(dict(PRODUCT_FORM))
+    encodings = [("gzip-1", 1), ("gzip-6", 6), ("gzip-9", 9)]
+    has_brotli = html_output.ENCODING_BROTLI in html_output.available_encodings()
+    if not has_brotli:
+        print("brotli 패키지가 없어 br 항목은 건너뜁니다. (pip install brotli)\n")
+
+    default_level = html_output.GZIP_LEVEL
+    print(f"{'본문':>5} {'모드':<7} {'방식':<16} {'크기(B)':>9} {'원본 대비':>8} {'시간(ms)':>9}")
+    for scale in args.scales:
+        body = "\n\n".join([data["news_data"]] * scale)
+        for mode in (STYLE_MODE_INLINE, STYLE_MODE_CLASS):
+            raw, render_time = measure(lambda: generate_press_release_html(data["title"], body, style_mode=mode),
+                                       args.repeat)
+            minified, minify_time = measure(lambda: minify_html(raw), args.repeat)
+            assert html_events(raw) == html_events(minified), "minify 결과가 원본과 다릅니다"
+            raw_bytes = raw.encode("utf-8")
+            rows = [("원본", len(raw_bytes), render_time), ("minify", len(minified.encode("utf-8")), minify_time)]
+            for source_name, source in (("", raw_bytes), ("minify+", minified.encode("utf-8"))):
+                for name, level in encodings:
+                    html_output.GZIP_LEVEL = level
+                    packed, elapsed = measure(lambda: compress(source, html_output.ENCODING_GZIP), args.repeat)
+                    rows.append((source_name + name, len(packed), elapsed))
+                if has_brotli:
+                    packed, elapsed = measure(lambda: compress(source, html_output.ENCODING_BROTLI), args.repeat)
+                    rows.append((source_name + "br", len(packed), elapsed))
+            for name, size, elapsed in rows:
+                print(f"{'x' + str(scale):>5} {mode:<7} {name:<16} {size:>9,} {size / len(raw_bytes):>8.1%} "
+                      f"{elapsed * 1000:>9.3f}")
+        print()
+    html_output.GZIP_LEVEL = default_level
+    print("시간: 원본=렌더링, minify=minify만, 압축 항목=압축만 (minify+는 minify 결과를 압축)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+렌더링/폴백/응답 파싱 마이크로벤치마크
+
+각 항목의 실행 시간(반복 중 최솟값), 최대 메모리(tracemalloc), 출력 크기를 측정하고
+저장된 기준값(benchmarks/baseline.json)과 비교합니다. 허용 범위를 넘게 느려지면 종료 코드 1을 반환합니다.
+
+실행 예시)
+    python -m benchmarks.bench_render                    # 기준값과 비교
+    python -m benchmarks.bench_render --update-baseline  # 기준값 갱신
+    python -m benchmarks.bench_render --filter convert   # 이름에 convert가 들어간 항목만
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Mapping
+
+import generation
+from benchmarks.stub_webhook import start_stub_server
+from jinja_utils import STYLE_MODE_CLASS, convert_text_to_html, convert_text_to_html_incremental, generate_press_release_html
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+PARAGRAPH = "기가바이트 M27QA ICE 게이밍 모니터는 QHD(2560*1440) 해상도와 180Hz 주사율, 1ms(MPRT) 응답속도를 지원한다."
+SPEC_LINES = [
+    "- 27인치 SS IPS 패널 & DCI-P3 95% 색재현율",
+    "    - 10비트 컬러, VESA HDR 400 <인증>",
+    "        · KVM 스위치 내장 / USB Type-C 18W",
+    "  Game Assist, 로우 블루라이트, 플리커 프리",
+]
+
+PRODUCT_FORM = {
+    "보도자료_유형": "제품 출시/리뷰 보도자료",
+    "제목": "제이씨현시스템㈜, GIGABYTE M27QA ICE 게이밍 모니터 출시!",
+    "도입부": "제이씨현시스템㈜",
+    "제품명": "기가바이트 M27QA ICE 게이밍 모니터",
+    "출시일": "2025년 1월",
+    "제품 카테고리": "게이밍 모니터",
+    "주요 타깃": "화이트 색상의 모니터를 원하는 게이머",
+    "주요 특징(세일즈 포인트)": "\n".join(SPEC_LINES * 3),
+    "주요 특징(디자인)": "ICE로 대표되는 기가바이트의 화이트 디자인",
+    "세부 스펙 및 성능": "\n".join(SPEC_LINES),
+    "가격 및 판매 정보": "자세한 정보는 홈페이지를 통해 확인 가능합니다",
+    "맺음말": "앞으로도 더 좋은 제품으로 보답하겠습니다."
+}
+
+EVENT_FORM = {
+    "보도자료_유형": "이벤트/행사 보도자료",
+    "제목": "제이씨현시스템㈜, PNY GeForce RTX 4070 이상 제품 대상 게임 증정 프로모션 진행!",
+    "도입부": "제이씨현시스템㈜",
+    "행사명": "Indiana Jones and the Great Circle 게임 코드 증정",
+    "행사기간": "2024년 11월 12일부터 12월 29일까지",
+    "행사내용": PARAGRAPH,
+    "대상 제품": "RTX 4090, RTX 4080 SUPER, RTX 4070",
+    "유의사항": "- 재고 소진 시 조기 종료될 수 있음\n- 사은품은 추후 배송될 수 있음",
+    "맺음말": "PNY는 글로벌 기술 리더다."
+}
+
+def make_body(target_bytes: int) -> str:
+    """들여쓰기와 한글이 많은 본문을 대략 target_bytes 크기로 만듭니다."""
+    block = "\n".join([PARAGRAPH] + SPEC_LINES) + "\n\n"
+    repeat = max(1, target_bytes // len(block.encode("utf-8")))
+    return block * repeat
+
+def make_unique_body(target_bytes: int) -> str:
+    """문단마다 내용이 다른 긴 본문 (스펙 목록이 많은 제품 보도자료)"""
+    paragraphs = []
+    size = 0
+    while size < target_bytes:
+        paragraph = "\n".join([f"{PARAGRAPH} ({len(paragraphs) + 1})"] + SPEC_LINES)
+        paragraphs.append(paragraph)
+        size += len(paragraph.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs)
+
+def make_edit_case(convert, body: str):
+    """호출할 때마다 문단 하나를 고친 본문을 변환하는 함수 (편집-미리보기 반복)"""
+    paragraphs = body.split("\n\n")
+    state = {"edits": 0}
+
+    def run():
+        state["edits"] += 1
+        edited = list(paragraphs)
+        index = state["edits"] % len(edited)
+        edited[index] += f" (수정 {state['edits']})"
+        return convert("\n\n".join(edited), "제목")
+    return run
+
+EDIT_BODIES = {
+    "200lines": make_unique_body(20 * 1024),
+    "1MB": make_unique_body(1024 * 1024),
+}
+
+BODIES = {
+    "1para": PARAGRAPH,
+    "200lines": make_body(20 * 1024),
+    "1MB": make_body(1024 * 1024),
+    "4MB": make_body(4 * 1024 * 1024),
+}
+
+def build_cases(webhook_urls: dict) -> dict:
+    """측정 항목 이름 -> (함수, 반복 횟수)"""
+    cases = {}
+    for name, body in BODIES.items():
+        repeat = 5 if len(body) > 500000 else 50
+        cases[f"convert_text_to_html/{name}"] = (lambda b=body: convert_text_to_html(b, "제목"), repeat)
+        cases[f"generate_press_release_html/{name}"] = (
+            lambda b=body: generate_press_release_html("제목", b), repeat)
+        cases[f"generate_press_release_html[class]/{name}"] = (
+            lambda b=body: generate_press_release_html("제목", b, style_mode=STYLE_MODE_CLASS), repeat)
+    for name, body in EDIT_BODIES.items():
+        repeat = 5 if len(body) > 500000 else 50
+        cases[f"edit_one_paragraph[full]/{name}"] = (make_edit_case(convert_text_to_html, body), repeat)
+        cases[f"edit_one_paragraph[incremental]/{name}"] = (
+            make_edit_case(convert_text_to_html_incremental, body), repeat)
+    cases["generate_fallback_template/product"] = (
+        lambda: generation.generate_fallback_template(dict(PRODUCT_FORM)), 2000)
+    cases["generate_fallback_template/event"] = (
+        lambda: generation.generate_fallback_template(dict(EVENT_FORM)), 2000)
+    for name in ("200lines", "1MB"):
+        payload = json.dumps([{"title": "제목", "news_data": BODIES[name], "insta_data": "포스팅 1\n\n\n포스팅 2"}],
+                             ensure_ascii=False)
+        repeat = 20 if len(payload) > 500000 else 200
+        cases[f"parse_webhook_response[json]/{name}"] = (
+            lambda p=payload: generation.parse_webhook_response("application/json", p), repeat)
+        cases[f"parse_webhook_response[json-bytes]/{name}"] = (
+            lambda p=payload.encode("utf-8"): generation.parse_webhook_response("application/json", p), repeat)
+    for mode, url in webhook_urls.items():
+        cases[f"request_generation[{mode}]/stub"] = (
+            lambda u=url: generation.request_generation(dict(PRODUCT_FORM), webhook_url=u), 50)
+    return cases
+
+def output_size(result) -> int:
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    if isinstance(result, Mapping):
+        data = result.get("data", result)
+        return sum(len(v.encode("utf-8")) for v in data.values() if isinstance(v, str))
+    return 0
+
+def measure(func, repeat: int) -> dict:
+    result = func()  # 워밍업
+    times = []
+    # GC 시점에 따른 편차를 줄이기 위해 측정 중에는 GC를 끄고, 최솟값을 사용
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "time_ms": min(times) * 1e3,
+        "peak_kb": peak / 1024,
+        "output_bytes": output_size(result)
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """기준값보다 (1 + tolerance)배 넘게 느려지거나 메모리를 더 쓰는 항목을 반환합니다."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ("time_ms", "peak_kb"):
+            # 아주 작은 값은 측정 오차가 커서 비교하지 않음
+            floor = 0.05 if key == "time_ms" else 64
+            if base[key] >= floor and result[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {base[key]:.3f} -> {result[key]:.3f}")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="렌더링 마이크로벤치마크")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용 저하율 (0.5 = 50%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과를 기준값으로 저장")
+    args = parser.parse_args(argv)
+
+    servers = {}
+    urls = {}
+    for mode in ("json", "text"):
+        servers[mode], urls[mode] = start_stub_server(mode=mode, response_size=4000)
+    try:
+        results = {}
+        for name, (func, repeat) in build_cases(urls).items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(func, repeat)
+            r = results[name]
+            print(f"{name:<52} {r['time_ms']:>10.3f} ms {r['peak_kb']:>12.1f} KB {r['output_bytes']:>12} B")
+    finally:
+        for server in servers.values():
+            server.shutdown()
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({name: {k: round(v, 4) for k, v in r.items()} for name, r in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("기준값 파일이 없습니다. --update-baseline 으로 먼저 생성하세요.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n성능 저하 감지 ({len(regressions)}건, 허용 {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n기준값 대비 성능 저하 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
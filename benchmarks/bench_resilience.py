@@ -0,0 +1,102 @@
+"""
+webhook 장애 시나리오별 재시도/서킷 브레이커 동작 확인
+
+로컬 stub으로 일시적 503, 계속되는 500, 응답 지연(읽기 타임아웃), 연결 거부를 흉내 내고
+각 요청의 결과(정상/폴백)와 소요 시간을 보여줍니다. 기대한 동작과 다르면 종료 코드 1을 반환합니다.
+
+실행 예시)
+    python -m benchmarks.bench_resilience
+"""
+import socket
+import sys
+import time
+
+import circuit_breaker
+import generation
+from benchmarks.stub_webhook import start_stub_server
+
+SAMPLE_FORM = {
+    "보도자료_유형": "이벤트/행사 보도자료", "제목": "장애 테스트", "도입부": "제이씨현시스템㈜", "행사명": "행사",
+    "행사기간": "1월", "행사내용": "내용", "대상 제품": "제품", "유의사항": "", "맺음말": ""
+}
+
+def call(url: str, timeout=(0.5, 0.5)) -> tuple:
+    start = time.perf_counter()
+    outcome = generation.request_generation(dict(SAMPLE_FORM), webhook_url=url, timeout=timeout)
+    return outcome, time.perf_counter() - start
+
+def unused_port_url() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}/webhook/closed"
+
+def reset():
+    # 브레이커가 1초 뒤 half-open이 되도록 설정하고 상태 초기화
+    circuit_breaker.BREAKER_FAILURE_THRESHOLD = 3
+    circuit_breaker.BREAKER_RESET_TIMEOUT = 1.0
+    circuit_breaker.reset_breakers()
+
+def main() -> int:
+    failures = []
+
+    def check(name: str, ok: bool, detail: str):
+        print(f"[{'OK' if ok else 'FAIL'}] {name}: {detail}")
+        if not ok:
+            failures.append(name)
+
+    server, url = start_stub_server()
+    try:
+        # 1. 일시적 503 한 번 → 재시도로 성공
+        reset()
+        server.config.fail_first = 1
+        outcome, elapsed = call(url)
+        check("일시적 503 재시도", not outcome["fallback"] and server.config.request_count == 2,
+              f"요청 {server.config.request_count}회, {elapsed:.3f}s")
+
+        # 2. 계속되는 500 → 3회 실패 후 브레이커 open, 이후 요청은 바로 폴백
+        reset()
+        server.config.error_rate = 1.0
+        for _ in range(3):
+            call(url)
+        before = server.config.request_count
+        outcome, elapsed = call(url)
+        check("500 반복 후 브레이커 open", outcome["error"] == generation.ERROR_CIRCUIT_OPEN
+              and server.config.request_count == before and elapsed < 0.05,
+              f"오류={outcome['error']}, {elapsed * 1e3:.2f} ms, 서버 요청 없음={server.config.request_count == before}")
+
+        # 3. reset_timeout 후 half-open 시험 요청 성공 → closed로 복구
+        server.config.error_rate = 0.0
+        time.sleep(1.1)
+        outcome, elapsed = call(url)
+        breaker = circuit_breaker.get_breaker(url)
+        check("half-open 시험 요청으로 복구", not outcome["fallback"] and breaker.state == circuit_breaker.STATE_CLOSED,
+              f"상태={breaker.state}, {elapsed:.3f}s")
+
+        # 4. 응답 지연 → 읽기 타임아웃(0.5s)에서 끊고 재시도 없이 폴백
+        reset()
+        server.config.latency = 2.0
+        outcome, elapsed = call(url)
+        check("읽기 타임아웃", outcome["fallback"] and 0.4 < elapsed < 1.0,
+              f"오류={outcome['error']}, {elapsed:.3f}s (전체 30s 대신 읽기 타임아웃만 대기)")
+        server.config.latency = 0.0
+    finally:
+        server.shutdown()
+
+    # 5. 연결 거부 → 재시도 후 폴백, 반복되면 브레이커 open
+    reset()
+    closed_url = unused_port_url()
+    outcome, elapsed = call(closed_url)
+    check("연결 거부", outcome["fallback"] and outcome["error"] == generation.ERROR_REQUEST,
+          f"{elapsed:.3f}s (재시도 포함)")
+    call(closed_url)
+    call(closed_url)
+    outcome, elapsed = call(closed_url)
+    check("연결 거부 반복 후 바로 폴백", outcome["error"] == generation.ERROR_CIRCUIT_OPEN and elapsed < 0.05,
+          f"{elapsed * 1e3:.2f} ms")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
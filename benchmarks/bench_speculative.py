@@ -0,0 +1,128 @@
+"""
+추측 생성(speculative) 효과: 제출~결과 표시 시간과 추가로 쓰는 webhook 호출 수
+
+가상 사용자(AppTest 세션)가 폼을 채우고, 검토 시간만큼 기다린 뒤 제출합니다.
+- edit-rate 비율: 검토 중에 제목을 고침 (추측 생성이 이미 시작됐다면 낭비, debounce 뒤 다시 시작)
+- late-edit-rate 비율: 제출 직전에 제목을 고침 (추측 생성을 쓰지 못하고 낭비)
+추측 생성을 끈 경우와 켠 경우를 차례로 실행하고 p50/p95, 적중률, 낭비율, webhook 호출 수를 비교합니다.
+
+실행 예시)
+    python -m benchmarks.bench_speculative --users 5 --rounds 4 --latency 3 --review 5 --debounce 1
+    python -m benchmarks.bench_speculative --edit-rate 0.5 --late-edit-rate 0.2
+"""
+import argparse
+import logging
+import os
+import random
+import threading
+import time
+
+import generation
+from benchmarks.bench_hedging import percentile
+from benchmarks.bench_load import VirtualUser
+from benchmarks.bench_render import PRODUCT_FORM
+from speculative import get_speculator
+
+def run_mode(enabled: bool, args, server) -> dict:
+    """users명이 rounds번씩 채우기 → 검토 → (수정) → 제출을 반복합니다."""
+    from streamlit_app import JOB_POLL_INTERVAL
+
+    speculator = get_speculator()
+    speculator.enabled = enabled
+    speculator.debounce = args.debounce
+    before = speculator.stats()
+    server.config.request_count = 0
+    mode = "on" if enabled else "off"
+    results = []
+    lock = threading.Lock()
+
+    def user(no: int):
+        vu = VirtualUser(f"{mode}-{no}", args, args.poll_interval or JOB_POLL_INTERVAL)
+        rng = random.Random(args.seed + no)
+        for round_no in range(args.rounds):
+            title = f"{PRODUCT_FORM['제목']} #{mode}-{no}-{round_no}"
+            # 추측 생성을 끄면 입력이 st.form 안에 있으므로 제출할 때까지 rerun되지 않음
+            vu.fill_form(dict(PRODUCT_FORM, 제목=title), rerun=enabled)
+            review = rng.uniform(args.review * 0.5, args.review * 1.5)
+            if rng.random() < args.edit_rate:
+                time.sleep(review / 2)
+                vu.fill_form(dict(PRODUCT_FORM, 제목=f"{title} (수정)"), rerun=enabled)
+                time.sleep(review / 2)
+            else:
+                time.sleep(review)
+            if rng.random() < args.late_edit_rate:
+                vu.fill_form(dict(PRODUCT_FORM, 제목=f"{title} (최종)"), rerun=enabled)
+            result = vu.click_submit()
+            with lock:
+                results.append(result)
+
+    threads = [threading.Thread(target=user, args=(no,), daemon=True) for no in range(args.users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    after = speculator.stats()
+    latencies = [latency for kind, latency in results if kind in ("ok", "fallback")]
+    hits = after["hits"] - before["hits"]
+    started = after["started"] - before["started"]
+    wasted = after["wasted"] - before["wasted"]
+    return {
+        "mode": mode,
+        "submissions": len(results),
+        "errors": sum(1 for kind, _ in results if kind == "error"),
+        "p50": percentile(latencies, 50) if latencies else None,
+        "p95": percentile(latencies, 95) if latencies else None,
+        "started": started,
+        "hit_rate": hits / len(results) if results else 0.0,
+        "waste_rate": wasted / started if started else 0.0,
+        "requests": server.config.request_count,
+    }
+
+def _ms(value) -> str:
+    return f"{value * 1000:>8.0f}" if value is not None else f"{'-':>8}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5, help="동시 사용자 수")
+    parser.add_argument("--rounds", type=int, default=3, help="사용자별 제출 횟수")
+    parser.add_argument("--review", type=float, default=4.0, help="입력 후 제출까지 검토 시간(초, 0.5~1.5배 무작위)")
+    parser.add_argument("--edit-rate", type=float, default=0.3, help="검토 중에 제목을 고치는 비율")
+    parser.add_argument("--late-edit-rate", type=float, default=0.1, help="제출 직전에 제목을 고치는 비율")
+    parser.add_argument("--debounce", type=float, default=1.0, help="추측 생성 debounce(초)")
+    parser.add_argument("--latency", type=float, default=3.0, help="stub 응답 지연(초)")
+    parser.add_argument("--poll-interval", type=float, default=None, help="진행 상태 확인 주기(초, 기본 JOB_POLL_INTERVAL)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    # VirtualUser가 참조하는 제출 설정 (이 벤치마크는 직접 폼을 채움)
+    args.invalid_rate = args.repeat_rate = 0.0
+
+    from benchmarks.stub_webhook import start_stub_server
+
+    server, url = start_stub_server(latency=args.latency)
+    generation.WEBHOOK_URLS = [url]
+    generation.WEBHOOK_URL = url
+    os.environ["NEWS_AUTO_HISTORY_DB"] = ""
+    os.environ["NEWS_AUTO_PREWARM"] = "0"
+    for name in ("streamlit.deprecation_util", "streamlit.runtime.scriptrunner_utils.script_run_context"):
+        logging.getLogger(name).disabled = True
+
+    try:
+        modes = [run_mode(False, args, server), run_mode(True, args, server)]
+    finally:
+        server.shutdown()
+
+    print(f"사용자 {args.users}명 x {args.rounds}회, stub 지연 {args.latency}s, 검토 {args.review}s, "
+          f"debounce {args.debounce}s, 수정 {args.edit_rate:.0%} / 제출 직전 수정 {args.late_edit_rate:.0%}\n")
+    print(f"{'추측 생성':>8} {'제출':>5} {'p50(ms)':>8} {'p95(ms)':>8} {'시작':>5} {'적중률':>7} {'낭비율':>7} "
+          f"{'webhook 호출':>12} {'오류':>5}")
+    for row in modes:
+        print(f"{row['mode']:>8} {row['submissions']:>5} {_ms(row['p50'])} {_ms(row['p95'])} {row['started']:>5} "
+              f"{row['hit_rate']:>7.1%} {row['waste_rate']:>7.1%} {row['requests']:>12} {row['errors']:>5}")
+    off, on = modes
+    if off["submissions"]:
+        print(f"\n제출당 webhook 호출: {off['requests'] / off['submissions']:.2f} → "
+              f"{on['requests'] / on['submissions']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+콜드 스타트 측정: 앱 모듈 import 시간 분석 + 첫 화면 표시까지 걸리는 시간
+
+매 측정마다 새 파이썬 프로세스를 띄워 새 레플리카가 처음 요청을 받는 상황을 재현합니다.
+- import 분석: `python -X importtime`으로 streamlit 이후 앱이 추가로 불러오는 모듈과 누적 시간
+- 첫 화면: AppTest로 streamlit_app.py를 처음 실행해 렌더링이 끝날 때까지의 시간
+
+실행 예시)
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --max-first-render 1.0   # 넘으면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 화면 표시에는 필요 없어 지연 로딩하는 모듈
+LAZY_MODULES = ("requests", "urllib3", "jinja2", "httpx")
+
+FIRST_RENDER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file("streamlit_app.py", default_timeout=60).run()
+done = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_render": done - imported,
+    "exceptions": len(at.exception),
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+def _run_python(args: list, env: dict = None) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable] + args, cwd=ROOT_DIR, env=env,
+                          capture_output=True, text=True, check=True)
+
+def import_profile(top: int) -> tuple:
+    """streamlit 이후 streamlit_app이 추가로 불러오는 모듈의 누적 import 시간(초)을 반환합니다."""
+    result = _run_python(["-X", "importtime", "-c", "import streamlit; import streamlit_app"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((name[1:].rstrip(), int(cumulative) / 1e6))  # 구분자 뒤 공백 한 칸 제거
+    # importtime은 자식 모듈을 부모보다 먼저 출력하므로 streamlit 줄 다음부터가 앱의 import
+    start = next(i for i, (name, _) in enumerate(rows) if name.strip() == "streamlit" and name == name.lstrip())
+    app_rows = rows[start + 1:]
+    total = next(seconds for name, seconds in app_rows if name.strip() == "streamlit_app")
+    # 앱이 직접 import 하는 모듈 (들여쓰기 한 단계)
+    direct = [(name.strip(), seconds) for name, seconds in app_rows if name.startswith("  ") and not name.startswith("    ")]
+    loaded = sorted({name.strip().split(".")[0] for name, _ in app_rows} & set(LAZY_MODULES))
+    return total, sorted(direct, key=lambda row: row[1], reverse=True)[:top], loaded
+
+def first_render(runs: int) -> list:
+    env = dict(os.environ, NEWS_AUTO_PREWARM="0")
+    return [json.loads(_run_python(["-c", FIRST_RENDER_SCRIPT], env=env).stdout.strip().splitlines()[-1])
+            for _ in range(runs)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="첫 화면 측정 반복 횟수 (매번 새 프로세스)")
+    parser.add_argument("--top", type=int, default=10, help="import 분석에서 보여줄 모듈 수")
+    parser.add_argument("--max-first-render", type=float, default=None,
+                        help="첫 화면 시간(중앙값, 초) 상한 - 넘으면 종료 코드 1")
+    args = parser.parse_args()
+
+    total, direct, loaded = import_profile(args.top)
+    print(f"앱 모듈 import (streamlit 제외): {total * 1000:.1f} ms")
+    for name, seconds in direct:
+        print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+    print(f"  지연 로딩 대상 중 import 시 불러온 모듈: {', '.join(loaded) or '없음'}")
+
+    samples = first_render(args.runs)
+    import_median = statistics.median(s["import"] for s in samples)
+    render_median = statistics.median(s["first_render"] for s in samples)
+    print(f"\nstreamlit import: 중앙값 {import_median:.3f}s")
+    print(f"첫 화면 표시:     중앙값 {render_median:.3f}s  (최소 {min(s['first_render'] for s in samples):.3f}s, "
+          f"최대 {max(s['first_render'] for s in samples):.3f}s, {args.runs}회)")
+    print(f"  첫 화면 후 불러온 지연 로딩 모듈: {', '.join(samples[-1]['loaded']) or '없음'}")
+
+    failed = any(s["exceptions"] for s in samples)
+    if failed:
+        print("첫 화면 실행 중 예외가 발생했습니다.")
+    if args.max_first_render is not None and render_median > args.max_first_render:
+        print(f"첫 화면 시간이 상한({args.max_first_render:.3f}s)을 넘었습니다.")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
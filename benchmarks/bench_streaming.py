@@ -0,0 +1,57 @@
+"""
+스트리밍 응답 모드별 첫 내용 표시 시간(time-to-first-content) 비교
+
+실행 예시)
+    python -m benchmarks.bench_streaming --chunk-delay 0.2 --chunk-count 10
+"""
+import argparse
+import time
+
+from benchmarks.stub_webhook import start_stub_server
+from generation import request_generation
+
+SAMPLE_FORM = {"보도자료_유형": "제품 출시/리뷰 보도자료", "제목": "스트리밍 테스트"}
+
+def measure(url: str) -> dict:
+    start = time.perf_counter()
+    first = []
+    updates = []
+
+    def on_progress(text):
+        if text and not first:
+            first.append(time.perf_counter() - start)
+        updates.append(len(text))
+
+    outcome = request_generation(SAMPLE_FORM, webhook_url=url, on_progress=on_progress)
+    total = time.perf_counter() - start
+    return {
+        "first": first[0] if first else total,
+        "total": total,
+        "updates": len(updates),
+        "fallback": outcome["fallback"],
+        "news_bytes": len(outcome["data"]["news_data"].encode("utf-8"))
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 응답 벤치마크")
+    parser.add_argument("--latency", type=float, default=0.1, help="첫 바이트 전 지연(초)")
+    parser.add_argument("--chunk-delay", type=float, default=0.2)
+    parser.add_argument("--chunk-count", type=int, default=10)
+    parser.add_argument("--response-size", type=int, default=3000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'첫 내용(s)':>10} {'완료(s)':>9} {'갱신 수':>7} {'본문 bytes':>10}  폴백")
+    for mode in ("json", "chunked", "ndjson", "sse"):
+        server, url = start_stub_server(
+            latency=args.latency, mode=mode, chunk_delay=args.chunk_delay,
+            chunk_count=args.chunk_count, response_size=args.response_size
+        )
+        try:
+            result = measure(url)
+        finally:
+            server.shutdown()
+        print(f"{mode:<8} {result['first']:>10.3f} {result['total']:>9.3f} {result['updates']:>7} "
+              f"{result['news_bytes']:>10}  {result['fallback']}")
+
+if __name__ == "__main__":
+    main()
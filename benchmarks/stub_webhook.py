@@ -0,0 +1,175 @@
+"""
+로컬 n8n webhook 대역 서버 (벤치마크/부하 테스트용)
+
+실행 예시)
+    python -m benchmarks.stub_webhook --port 5678 --latency 0.5 --error-rate 0.1
+    python -m benchmarks.stub_webhook --mode ndjson --chunk-delay 0.2
+
+응답 모드
+- json: [{"title": ..., "news_data": ...}] (n8n 기본 응답)
+- text: 첫 줄 제목 + 본문 텍스트
+- chunked: text와 같은 내용을 chunked 전송으로 조금씩 보냄
+- ndjson: n8n 스트리밍 형식 ({"type": "item", "content": ...} 한 줄씩)
+- sse: text/event-stream (data: {"type": "item", "content": ...})
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubConfig:
+    """stub 서버 동작 설정 (실행 중에도 값을 바꿀 수 있음)"""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, response_size: int = 2000,
+                 mode: str = "json", chunk_delay: float = 0.05, chunk_count: int = 10):
+        self.latency = latency              # 응답 지연(초)
+        self.error_rate = error_rate        # 500 응답 비율 (0~1)
+        self.response_size = response_size  # news_data 대략적인 글자 수
+        self.mode = mode                    # json | text | chunked | ndjson | sse
+        self.chunk_delay = chunk_delay      # 스트리밍 모드의 조각 간 지연(초)
+        self.chunk_count = chunk_count      # 스트리밍 모드의 조각 수
+        self.slow_rate = 0.0                # 가끔 느린 워커 흉내: 이 비율의 요청은 slow_latency만큼 지연
+        self.slow_latency = 0.0
+        self.fail_first = 0                 # 처음 N개 요청은 fail_status로 응답 (일시 장애 흉내)
+        self.fail_status = 503
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+def build_result(form_data: dict, response_size: int) -> dict:
+    """n8n 응답과 같은 형태의 결과 dict를 만듭니다."""
+    title = form_data.get("제목") or "제이씨현시스템㈜, 신제품 출시"
+    line = "기가바이트 M27QA ICE 게이밍 모니터는 QHD 해상도와 180Hz 주사율을 지원한다."
+    lines = []
+    size = 0
+    while size < response_size:
+        lines.append(line if len(lines) % 5 else "")
+        size += len(line) + 1
+    return {
+        "title": title,
+        "news_data": "\n".join(lines),
+        "check_data": "입력 데이터에 문제가 없습니다.",
+        "insta_data": "포스팅 1\n#게이밍모니터\n\n\n포스팅 2\n#기가바이트",
+        "facebook_data": "페이스북 포스팅",
+        "blog_data": "블로그 포스팅"
+    }
+
+def make_handler(config: StubConfig):
+    class StubWebhookHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 지원
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_stream(self, pieces: list, content_type: str):
+            """pieces를 chunked 전송으로 하나씩 보냅니다."""
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, piece in enumerate(pieces):
+                if i and config.chunk_delay:
+                    time.sleep(config.chunk_delay)
+                data = piece.encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", "0"))
+            raw = self.rfile.read(length) if length else b"{}"
+            with config.lock:
+                config.request_count += 1
+                fail = config.fail_first > 0
+                if fail:
+                    config.fail_first -= 1
+            try:
+                form_data = json.loads(raw or b"{}")
+            except ValueError:
+                form_data = {}
+
+            if config.latency:
+                time.sleep(config.latency)
+            if config.slow_rate and random.random() < config.slow_rate:
+                time.sleep(config.slow_latency)
+
+            if fail:
+                self._send(config.fail_status, b"stub transient error", "text/plain; charset=utf-8")
+                return
+
+            if config.error_rate and random.random() < config.error_rate:
+                self._send(500, b"stub error", "text/plain; charset=utf-8")
+                return
+
+            result = build_result(form_data, config.response_size)
+            if config.mode in ("chunked", "ndjson", "sse"):
+                text = f"{result['title']}\n{result['news_data']}"
+                step = max(1, -(-len(text) // config.chunk_count))
+                pieces = [text[i:i + step] for i in range(0, len(text), step)]
+                if config.mode == "chunked":
+                    self._send_stream(pieces, "text/plain; charset=utf-8")
+                elif config.mode == "ndjson":
+                    lines = [json.dumps({"type": "begin"})]
+                    lines += [json.dumps({"type": "item", "content": p}, ensure_ascii=False) for p in pieces]
+                    lines.append(json.dumps({"type": "end"}))
+                    self._send_stream([line + "\n" for line in lines], "application/x-ndjson")
+                else:
+                    events = [f"data: {json.dumps({'type': 'item', 'content': p}, ensure_ascii=False)}\n\n"
+                              for p in pieces]
+                    self._send_stream(events, "text/event-stream; charset=utf-8")
+                return
+            if config.mode == "text":
+                body = f"{result['title']}\n{result['news_data']}".encode("utf-8")
+                self._send(200, body, "text/plain; charset=utf-8")
+            else:
+                body = json.dumps([result], ensure_ascii=False).encode("utf-8")
+                self._send(200, body, "application/json; charset=utf-8")
+
+    return StubWebhookHandler
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **config_kwargs):
+    """
+    백그라운드 스레드에서 stub 서버를 시작합니다.
+    return: (server, url) - server.config 로 설정 변경, server.shutdown() 으로 종료
+    """
+    config = StubConfig(**config_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    server.config = config
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://{host}:{server.server_address[1]}/webhook/stub"
+    return server, url
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 n8n webhook stub 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5678)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--response-size", type=int, default=2000, help="news_data 글자 수")
+    parser.add_argument("--mode", default="json", choices=["json", "text", "chunked", "ndjson", "sse"])
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="스트리밍 조각 간 지연(초)")
+    parser.add_argument("--chunk-count", type=int, default=10, help="스트리밍 조각 수")
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency, args.error_rate, args.response_size, args.mode,
+                        args.chunk_delay, args.chunk_count)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    print(f"stub webhook: http://{args.host}:{args.port}/webhook/stub")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import os
+import random
+import threading
+import time
+
+from metrics import REGISTRY, url_label
+
+# 서킷 브레이커 설정 (환경변수로 조정 가능)
+# - FAILURE_THRESHOLD: 연속 실패 몇 번에 열리는지
+# - RESET_TIMEOUT: 열린 뒤 몇 초 후에 half-open으로 시험 요청을 보내는지
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("NEWS_AUTO_BREAKER_FAILURES", "3"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("NEWS_AUTO_BREAKER_RESET_TIMEOUT", "30"))
+
+# 재시도 예산: 정상 요청 대비 재시도 비율 상한 (장애 시 재시도가 부하를 키우지 않도록)
+RETRY_BUDGET_RATIO = float(os.environ.get("NEWS_AUTO_RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MIN_TOKENS = float(os.environ.get("NEWS_AUTO_RETRY_BUDGET_MIN", "3"))
+
+# 브레이커 상태
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+BREAKER_STATE = REGISTRY.gauge("news_auto_breaker_state", "서킷 브레이커 상태 (0=closed, 1=half_open, 2=open)")
+BREAKER_REJECTED = REGISTRY.counter("news_auto_breaker_rejected_total", "브레이커가 열려 바로 폴백한 요청 수")
+RETRIES = REGISTRY.counter("news_auto_webhook_retries_total", "webhook 재시도 수 (reason별)")
+
+class CircuitBreaker:
+    """
+    세션 전체가 공유하는 서킷 브레이커
+
+    closed: 정상 / open: 바로 실패 처리 / half_open: 시험 요청 하나만 통과시켜 복구 여부 확인
+    """
+
+    def __init__(self, name: str = "webhook", failure_threshold: int = None, reset_timeout: float = None):
+        self.name = name
+        # webhook URL로 만든 브레이커는 지표에 호스트만 표시
+        self.label = url_label(name)
+        self.failure_threshold = failure_threshold or BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout if reset_timeout is not None else BREAKER_RESET_TIMEOUT
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(0, breaker=self.label)
+
+    def _set_state(self, state: str):
+        self.state = state
+        BREAKER_STATE.set(_STATE_VALUES[state], breaker=self.label)
+
+    def allow_request(self) -> bool:
+        """요청을 보내도 되는지 확인합니다. (half_open에서는 시험 요청 하나만 허용)"""
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    BREAKER_REJECTED.inc(breaker=self.label)
+                    return False
+                self._set_state(STATE_HALF_OPEN)
+            if self._probe_in_flight:
+                BREAKER_REJECTED.inc(breaker=self.label)
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state != STATE_CLOSED:
+                self._set_state(STATE_CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(STATE_OPEN)
+
+    def retry_after(self) -> float:
+        """열린 상태에서 다음 시험 요청까지 남은 시간(초)"""
+        with self._lock:
+            if self.state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+class RetryBudget:
+    """
+    토큰 방식 재시도 예산
+    요청마다 ratio만큼 토큰이 쌓이고, 재시도 한 번에 토큰 1개를 씁니다.
+    """
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, min_tokens: float = RETRY_BUDGET_MIN_TOKENS,
+                 max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 2.0) -> float:
+    """지수 백오프 + full jitter (attempt는 1부터)"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_retry_budget = RetryBudget()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """이름(엔드포인트)별 프로세스 공유 서킷 브레이커를 반환합니다."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+def get_retry_budget() -> RetryBudget:
+    """프로세스 공유 재시도 예산을 반환합니다."""
+    return _retry_budget
+
+def reset_breakers():
+    """모든 브레이커와 재시도 예산을 초기 상태로 되돌립니다. (벤치마크/테스트용)"""
+    global _retry_budget
+    with _breakers_lock:
+        _breakers.clear()
+        _retry_budget = RetryBudget()
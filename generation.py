@@ -0,0 +1,605 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from circuit_breaker import RETRIES, backoff_delay, get_breaker, get_retry_budget
+from http_client import post_json
+from metrics import GENERATIONS, RESPONSE_BYTES, WEBHOOK_RESPONSES, log_event, stage_timer, url_label
+from press_release import (
+    PressRelease,
+    RequestCancelled,
+    ResponseTooLarge,
+    check_content_length,
+    json_loads,
+    limit_stream,
+    parse_json_result,
+    parse_text_result,
+    read_limited_body,
+    response_charset,
+)
+from response_cache import get_response_cache, make_form_key
+from single_flight import SingleFlightTimeout, get_generation_flight
+from webhook_endpoints import HEDGE_WINS, HEDGES, get_endpoint_health, get_webhook_urls
+
+# WEBHOOK URL 목록 (우선순위 순서, NEWS_AUTO_WEBHOOK_URLS로 설정 - webhook_endpoints 참고)
+WEBHOOK_URLS = get_webhook_urls()
+WEBHOOK_URL = WEBHOOK_URLS[0]
+# 연결/읽기 타임아웃을 따로 설정 (서버가 죽어 있으면 연결 단계에서 빨리 실패)
+WEBHOOK_CONNECT_TIMEOUT = float(os.environ.get("NEWS_AUTO_WEBHOOK_CONNECT_TIMEOUT", "3"))
+WEBHOOK_READ_TIMEOUT = float(os.environ.get("NEWS_AUTO_WEBHOOK_READ_TIMEOUT", "30"))
+WEBHOOK_TIMEOUT = (WEBHOOK_CONNECT_TIMEOUT, WEBHOOK_READ_TIMEOUT)
+
+# 일시적 오류 재시도 (연결 실패, 502/503/504)
+WEBHOOK_MAX_RETRIES = int(os.environ.get("NEWS_AUTO_WEBHOOK_MAX_RETRIES", "2"))
+RETRYABLE_STATUS = (502, 503, 504)
+
+# 보도자료 유형 (웹 화면의 선택지와 같은 값, 비어 있으면 제품 보도자료)
+PRODUCT_RELEASE_TYPE = "제품 출시/리뷰 보도자료"
+EVENT_RELEASE_TYPE = "이벤트/행사 보도자료"
+RELEASE_TYPES = (PRODUCT_RELEASE_TYPE, EVENT_RELEASE_TYPE)
+DEFAULT_RELEASE_TYPE = PRODUCT_RELEASE_TYPE
+
+# 보도자료 유형별 폼 키 (폴백 템플릿이 모든 키를 사용하므로 빠진 키는 빈 값으로 채움)
+PRODUCT_FIELDS = [
+    "제목", "도입부", "제품명", "출시일", "제품 카테고리", "주요 타깃", "주요 특징(세일즈 포인트)",
+    "주요 특징(디자인)", "세부 스펙 및 성능", "가격 및 판매 정보", "맺음말"
+]
+EVENT_FIELDS = ["제목", "도입부", "행사명", "행사기간", "행사내용", "대상 제품", "유의사항", "맺음말"]
+
+# 생성 결과 오류 종류
+ERROR_HTTP = "http"                      # 200이 아닌 응답
+ERROR_PARSE = "parse"                    # 응답 파싱 실패
+ERROR_REQUEST = "request"                # 연결 실패/타임아웃 등
+ERROR_MISSING_FIELDS = "missing_fields"  # title/news_data 누락
+ERROR_CIRCUIT_OPEN = "circuit_open"      # 서킷 브레이커가 열려 요청하지 않음
+ERROR_CANCELLED = "cancelled"            # 헤지 요청에서 진 쪽 (결과 사용 안 함)
+ERROR_COALESCE_TIMEOUT = "coalesce_timeout"  # 같은 입력으로 실행 중인 요청의 결과를 제한 시간 안에 못 받음
+ERROR_TOO_LARGE = "too_large"            # 응답 본문이 크기 상한(WEBHOOK_MAX_RESPONSE_BYTES)을 넘음
+
+def sanitize_form_data(form_data: dict) -> dict:
+    """입력 데이터에서 마크다운 볼드 표시와 헤더 표시를 제거합니다."""
+    for key in form_data:
+        if isinstance(form_data[key], str):
+            form_data[key] = form_data[key].replace('**', '').replace('#', '')
+    return form_data
+
+def parse_webhook_response(content_type: str, body_text) -> PressRelease:
+    """
+    webhook 응답 본문(str 또는 bytes)을 보도자료 결과로 변환합니다.
+    JSON 파싱 실패 시 ValueError를 발생시킵니다.
+    """
+    if 'application/json' in content_type:
+        # JSON 응답 처리 (배열로 온 경우 첫 번째 항목 사용)
+        return parse_json_result(body_text)
+    
+    # 일반 텍스트 응답 처리: 첫 줄을 제목으로 사용
+    if isinstance(body_text, bytes):
+        body_text = body_text.decode("utf-8", errors="replace")
+    return parse_text_result(body_text)
+
+# 스트리밍 응답 Content-Type
+STREAM_NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+STREAM_SSE_TYPE = "text/event-stream"
+STREAM_ACCEPT = "application/x-ndjson, text/event-stream, application/json, text/plain"
+# 진행 상황 전달 간격: 이 시간(초)이 지났거나 본문이 이 비율 이상 늘었을 때만 전달
+# (조각마다 본문 전체를 다시 만들면 긴 스트림에서 O(n²))
+PROGRESS_MIN_INTERVAL = 0.1
+PROGRESS_MIN_GROWTH = 0.25
+
+class _StreamText:
+    """스트리밍 본문 조각을 누적하고 on_progress 호출 횟수를 제한합니다."""
+
+    def __init__(self, on_progress):
+        self.on_progress = on_progress
+        self.chunks = []      # 누적된 조각 (전달할 때마다 하나로 합쳐 둠)
+        self._counted = 0     # 길이를 센 조각 수
+        self._pending = 0     # 마지막 전달 이후 늘어난 글자 수
+        self._sent = 0        # 마지막으로 전달한 본문 길이
+        self._sent_at = time.monotonic()
+
+    def text(self) -> str:
+        if len(self.chunks) > 1:
+            self.chunks[:] = [''.join(self.chunks)]
+            self._counted = 1
+        return self.chunks[0] if self.chunks else ''
+
+    def progress(self, force: bool = False):
+        for chunk in self.chunks[self._counted:]:
+            self._pending += len(chunk)
+        self._counted = len(self.chunks)
+        if not self._pending:
+            return
+        now = time.monotonic()
+        if not force and self._pending < self._sent * PROGRESS_MIN_GROWTH \
+                and now - self._sent_at < PROGRESS_MIN_INTERVAL:
+            return
+        text = self.text()
+        self._pending = 0
+        self._sent = len(text)
+        self._sent_at = now
+        self.on_progress(text)
+
+def _handle_stream_event(payload: str, chunks: list):
+    """
+    NDJSON 한 줄 / SSE data 하나를 처리합니다.
+    - {"type": "item", "content": "..."} (n8n 스트리밍 형식) 또는 일반 텍스트: 본문 조각으로 누적
+    - title/news_data를 가진 객체: 최종 결과로 보고 원문을 반환
+    """
+    try:
+        event = json_loads(payload)
+    except ValueError:
+        chunks.append(payload)
+        return None
+    if isinstance(event, list) and event:
+        event = event[0]
+    if isinstance(event, dict):
+        if "news_data" in event or "title" in event:
+            return payload
+        if event.get("type") == "item":
+            chunks.append(str(event.get("content", "")))
+    elif isinstance(event, str):
+        chunks.append(event)
+    return None
+
+def read_streaming_body(response, content_type: str, on_progress, cancel_event=None) -> tuple:
+    """
+    스트리밍 응답(chunked text, NDJSON, SSE)을 읽으며 누적된 본문을 on_progress(text)로 전달합니다.
+    (전달 횟수는 PROGRESS_MIN_INTERVAL/PROGRESS_MIN_GROWTH로 제한)
+    받은 크기가 WEBHOOK_MAX_RESPONSE_BYTES를 넘으면 ResponseTooLarge를 발생시킵니다.
+    return: (파싱에 사용할 Content-Type, 응답 본문)
+    """
+    check_content_length(response)
+    response.encoding = response_charset(response)
+    stream = _StreamText(on_progress)
+    chunks = stream.chunks
+    final_payload = None
+    
+    if any(t in content_type for t in STREAM_NDJSON_TYPES):
+        for line in limit_stream(response.iter_lines(decode_unicode=True)):
+            if not line.strip():
+                continue
+            final_payload = _handle_stream_event(line, chunks) or final_payload
+            stream.progress()
+    elif STREAM_SSE_TYPE in content_type:
+        data_lines = []
+        for line in limit_stream(response.iter_lines(decode_unicode=True)):
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            elif not line and data_lines:
+                # 빈 줄에서 이벤트 하나가 끝남
+                final_payload = _handle_stream_event('\n'.join(data_lines), chunks) or final_payload
+                data_lines = []
+                stream.progress()
+        if data_lines:
+            final_payload = _handle_stream_event('\n'.join(data_lines), chunks) or final_payload
+    elif 'application/json' in content_type:
+        # 일반 JSON 응답은 조각으로 보여줄 수 없으므로 한 번에 읽음
+        return content_type, read_limited_body(response, cancel_event=cancel_event)
+    else:
+        for chunk in limit_stream(response.iter_content(chunk_size=None, decode_unicode=True)):
+            chunks.append(chunk)
+            stream.progress()
+    # 마지막으로 받은 조각까지 전달
+    stream.progress(force=True)
+    
+    if final_payload is not None:
+        return "application/json", final_payload
+    text = stream.text()
+    # 조각을 합친 결과가 JSON이면 JSON으로 파싱
+    if text.lstrip()[:1] in ('{', '['):
+        return "application/json", text
+    return "text/plain", text
+
+def request_generation(form_data: dict, webhook_url: str = None, timeout=WEBHOOK_TIMEOUT,
+                       on_progress=None, cancel_event=None, max_retries: int = None) -> dict:
+    """
+    webhook을 호출하고 결과를 반환합니다. (Streamlit에 의존하지 않음)
+    on_progress가 주어지면 스트리밍 응답을 받아 누적된 본문 텍스트를 조각마다 전달합니다.
+    cancel_event가 설정되면 재시도와 본문 읽기를 중단합니다. (헤지 요청용)
+    max_retries: 일시적 오류 재시도 횟수 (None이면 WEBHOOK_MAX_RETRIES, 다음 엔드포인트로 넘어갈 때는 0)
+    return: {
+        "data": 보도자료 dict (실패 시 폴백 템플릿),
+        "fallback": 폴백 사용 여부,
+        "error": 오류 종류 (ERROR_*) 또는 None,
+        "error_message": 오류 메시지,
+        "status_code": HTTP 상태 코드 (요청 실패 시 None),
+        "content_type": 응답 Content-Type,
+        "response_text": 응답 본문
+    }
+    """
+    import requests  # 첫 호출 때 불러옴 (콜드 스타트 단축)
+    
+    outcome = {
+        "data": None,
+        "fallback": False,
+        "error": None,
+        "error_message": "",
+        "status_code": None,
+        "content_type": "",
+        "response_text": ""
+    }
+    parse_content_type = ""
+    url = webhook_url or WEBHOOK_URL
+    breaker = get_breaker(url)
+    retry_budget = get_retry_budget()
+    retry_budget.record_request()
+    if max_retries is None:
+        max_retries = WEBHOOK_MAX_RETRIES
+    
+    # 스트리밍 내용을 이미 화면에 보냈다면 재시도하지 않음
+    progress_started = []
+    if on_progress is not None:
+        user_on_progress = on_progress
+        
+        def on_progress(text):
+            if cancel_event is not None and cancel_event.is_set():
+                raise RequestCancelled()
+            progress_started.append(True)
+            user_on_progress(text)
+    
+    attempt = 0
+    while True:
+        attempt += 1
+        if cancel_event is not None and cancel_event.is_set():
+            outcome.update(error=ERROR_CANCELLED, error_message="다른 엔드포인트가 먼저 응답했습니다.")
+            return _with_fallback(outcome, form_data)
+        # 브레이커가 열려 있으면 기다리지 않고 바로 폴백
+        if not breaker.allow_request():
+            outcome.update(
+                error=ERROR_CIRCUIT_OPEN,
+                error_message=f"n8n 서버 장애로 요청을 보내지 않았습니다. ({breaker.retry_after():.0f}초 후 재시도)"
+            )
+            return _with_fallback(outcome, form_data)
+        
+        retry_reason = None
+        try:
+            with stage_timer("webhook_request", attempt=attempt):
+                # webhook으로 데이터 전송 (프로세스 공유 커넥션 풀 사용)
+                # 본문은 항상 조각으로 읽어 크기 상한을 넘으면 중단
+                if on_progress is None:
+                    response = post_json(url, form_data, timeout=timeout, stream=True)
+                else:
+                    response = post_json(url, form_data, timeout=timeout,
+                                         stream=True, headers={"Accept": STREAM_ACCEPT})
+                
+                outcome.update(error=None, error_message="")
+                outcome["status_code"] = response.status_code
+                outcome["content_type"] = parse_content_type = response.headers.get('Content-Type', '')
+                with response:
+                    if on_progress is not None and response.status_code == 200:
+                        parse_content_type, outcome["response_text"] = read_streaming_body(
+                            response, outcome["content_type"], on_progress, cancel_event
+                        )
+                    else:
+                        outcome["response_text"] = read_limited_body(response, cancel_event=cancel_event)
+        except ResponseTooLarge as e:
+            # 서버는 응답했으므로 엔드포인트 장애로 보지 않고, 재시도 없이 폴백
+            breaker.record_success()
+            WEBHOOK_RESPONSES.inc(status="too_large")
+            outcome.update(error=ERROR_TOO_LARGE, error_message=str(e), response_text="")
+            return _with_fallback(outcome, form_data)
+        except RequestCancelled:
+            # 응답은 정상적으로 오고 있었으므로 엔드포인트 장애로 보지 않음
+            breaker.record_success()
+            outcome.update(error=ERROR_CANCELLED, error_message="다른 엔드포인트가 먼저 응답했습니다.")
+            return _with_fallback(outcome, form_data)
+        except requests.exceptions.RequestException as e:
+            breaker.record_failure()
+            WEBHOOK_RESPONSES.inc(status="error")
+            outcome.update(error=ERROR_REQUEST, error_message=str(e), status_code=None)
+            # 연결 실패/연결 타임아웃만 재시도 (읽기 타임아웃은 이미 오래 기다렸으므로 재시도하지 않음)
+            if isinstance(e, requests.exceptions.ConnectionError):
+                retry_reason = "connect"
+        except Exception:
+            # 예상하지 못한 오류(on_progress 콜백, 본문 디코딩 등)에도 half_open 시험 요청 자리를 반드시 돌려줌
+            breaker.record_failure()
+            raise
+        else:
+            if outcome["status_code"] >= 500:
+                breaker.record_failure()
+                if outcome["status_code"] in RETRYABLE_STATUS:
+                    retry_reason = str(outcome["status_code"])
+            else:
+                breaker.record_success()
+        
+        if retry_reason is None or attempt > max_retries or progress_started \
+                or not retry_budget.try_spend():
+            break
+        RETRIES.inc(reason=retry_reason)
+        time.sleep(backoff_delay(attempt))
+    
+    if outcome["error"] == ERROR_REQUEST:
+        return _with_fallback(outcome, form_data)
+    
+    WEBHOOK_RESPONSES.inc(status=str(outcome["status_code"]))
+    RESPONSE_BYTES.observe(len(outcome["response_text"].encode("utf-8")))
+    
+    if outcome["status_code"] != 200:
+        outcome.update(error=ERROR_HTTP, error_message=f"서버 오류: {outcome['status_code']}")
+        return _with_fallback(outcome, form_data)
+    
+    try:
+        with stage_timer("parse"):
+            data = parse_webhook_response(parse_content_type, outcome["response_text"])
+    except (ValueError, AttributeError, IndexError) as e:
+        outcome.update(error=ERROR_PARSE, error_message=f"{type(e).__name__}: {e}")
+        return _with_fallback(outcome, form_data)
+    
+    # 필수 필드 검증
+    if not data["title"] or not data["news_data"]:
+        outcome.update(error=ERROR_MISSING_FIELDS, error_message="title 또는 news_data 누락")
+        return _with_fallback(outcome, form_data)
+    
+    outcome["data"] = data
+    return outcome
+
+# 헤지 요청용 스레드 풀 (프로세스 공유)
+_hedge_pool = ThreadPoolExecutor(max_workers=int(os.environ.get("NEWS_AUTO_HEDGE_POOL", "16")),
+                                 thread_name_prefix="webhook-hedge")
+
+def request_generation_hedged(form_data: dict, webhook_urls: list = None, on_progress=None) -> dict:
+    """
+    여러 webhook 엔드포인트에 헤지/장애 전환 요청을 보냅니다.
+    1순위가 최근 응답 시간의 HEDGE_PERCENTILE 백분위수 안에 답하지 않거나 바로 실패하면
+    다음 엔드포인트로 같은 요청을 보내고, 먼저 성공한 결과를 사용합니다.
+    """
+    health = get_endpoint_health()
+    urls = health.ordered(webhook_urls or WEBHOOK_URLS)
+    if len(urls) == 1:
+        start = time.perf_counter()
+        outcome = request_generation(form_data, webhook_url=urls[0], on_progress=on_progress)
+        health.record(urls[0], time.perf_counter() - start, ok=not outcome["fallback"])
+        return outcome
+    
+    cancel_event = threading.Event()
+    progress_lock = threading.Lock()
+    progress_owner = []
+    
+    def run(url: str) -> tuple:
+        # 먼저 내용을 보낸 요청의 스트리밍만 화면에 전달
+        def forward_progress(text):
+            with progress_lock:
+                if not progress_owner:
+                    progress_owner.append(url)
+                owner = progress_owner[0] == url
+            if owner:
+                on_progress(text)
+        
+        start = time.perf_counter()
+        # 실패하면 바로 다음 엔드포인트로 넘어가도록 재시도는 마지막 엔드포인트에서만
+        # (on_progress가 없으면 스트리밍으로 받지 않음)
+        outcome = request_generation(dict(form_data), webhook_url=url,
+                                     on_progress=forward_progress if on_progress is not None else None,
+                                     cancel_event=cancel_event, max_retries=None if url == urls[-1] else 0)
+        if outcome["error"] != ERROR_CANCELLED:
+            health.record(url, time.perf_counter() - start, ok=not outcome["fallback"])
+        return url, outcome
+    
+    pending = set()
+    last_outcome = None
+    next_index = 0
+    hedged = False
+    try:
+        while True:
+            if next_index < len(urls):
+                url = urls[next_index]
+                pending.add(_hedge_pool.submit(run, url))
+                delay = health.hedge_delay(url)
+                next_index += 1
+            else:
+                delay = None
+            if not pending:
+                return last_outcome
+            done, pending = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # 응답이 늦음 → 다음 엔드포인트로 헤지
+                if next_index < len(urls):
+                    HEDGES.inc(reason="slow")
+                    hedged = True
+                continue
+            for future in done:
+                url, outcome = future.result()
+                if not outcome["fallback"]:
+                    if hedged or next_index > 1:
+                        HEDGE_WINS.inc(endpoint=url_label(url))
+                    return outcome
+                last_outcome = outcome
+            # 실패 → 남은 엔드포인트로 바로 전환
+            if next_index < len(urls):
+                HEDGES.inc(reason="failover")
+    finally:
+        cancel_event.set()
+
+def _with_fallback(outcome: dict, form_data: dict) -> dict:
+    # 폴백: 기본 템플릿 사용
+    outcome["data"] = generate_fallback_template(form_data)
+    outcome["fallback"] = True
+    return outcome
+
+def _cached_outcome(data: dict) -> dict:
+    return {
+        "data": PressRelease.from_mapping(data),
+        "fallback": False,
+        "error": None,
+        "error_message": "",
+        "status_code": None,
+        "content_type": "",
+        "response_text": "",
+        "cached": True,
+        "coalesced": False
+    }
+
+def _request_and_cache(form_data: dict, cache_key: str, on_progress=None, recheck: bool = False,
+                       cache_result: bool = True) -> dict:
+    """webhook을 호출하고 정상 응답을 응답 캐시에 저장합니다. (cache_result=False면 저장하지 않음)"""
+    response_cache = get_response_cache()
+    if recheck:
+        # 직전에 끝난 같은 요청의 결과가 막 저장된 경우
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            GENERATIONS.inc(result="cached")
+            return _cached_outcome(cached)
+    outcome = request_generation_hedged(form_data, on_progress=on_progress)
+    outcome["cached"] = False
+    outcome["coalesced"] = False
+    GENERATIONS.inc(result="fallback" if outcome["fallback"] else "ok")
+    log_event("generation", fallback=outcome["fallback"], error=outcome["error"],
+              status_code=outcome["status_code"], response_bytes=len(outcome["response_text"]))
+    # 정상 응답만 캐시 (폴백 결과는 저장하지 않음)
+    if cache_result and not outcome["fallback"]:
+        response_cache.put(cache_key, outcome["data"])
+    return outcome
+
+def generate_press_release(form_data: dict, force_regenerate: bool = False, on_progress=None,
+                           cache_result: bool = True) -> dict:
+    """
+    입력 정리 → 응답 캐시 확인 → webhook 호출 → (실패 시) 폴백 순서로 보도자료를 생성합니다.
+    force_regenerate=True면 캐시를 건너뛰고, cache_result=False면 결과를 캐시에 저장하지 않습니다. (추가 후보용)
+    return: request_generation()과 같은 형태 + "cached", "coalesced"(실행 중인 요청의 결과를 받음) 여부
+    """
+    # 입력 데이터에서 마크다운 볼드 표시와 헤더 표시 제거
+    with stage_timer("sanitize"):
+        sanitize_form_data(form_data)
+    
+    # 응답 캐시 확인 (정리된 form_data 기준)
+    response_cache = get_response_cache()
+    with stage_timer("cache_lookup"):
+        cache_key = make_form_key(form_data)
+        cached = None if force_regenerate else response_cache.get(cache_key)
+    if force_regenerate:
+        response_cache.record_bypass()
+        # '새로 생성'은 다른 결과를 원하는 요청이므로 합치지 않음
+        return _request_and_cache(form_data, cache_key, on_progress=on_progress, cache_result=cache_result)
+    if cached is not None:
+        GENERATIONS.inc(result="cached")
+        return _cached_outcome(cached)
+    
+    try:
+        outcome, coalesced = get_generation_flight().do(
+            cache_key, lambda publish: _request_and_cache(form_data, cache_key, on_progress=publish, recheck=True),
+            on_progress=on_progress
+        )
+    except SingleFlightTimeout as e:
+        GENERATIONS.inc(result="fallback")
+        outcome = {
+            "data": None,
+            "fallback": False,
+            "error": ERROR_COALESCE_TIMEOUT,
+            "error_message": str(e),
+            "status_code": None,
+            "content_type": "",
+            "response_text": "",
+            "cached": False,
+            "coalesced": False
+        }
+        return _with_fallback(outcome, form_data)
+    if coalesced:
+        GENERATIONS.inc(result="coalesced")
+        # 호출한 쪽에서 결과 dict를 고쳐도 서로 영향이 없도록 복사
+        outcome = dict(outcome, data=outcome["data"].copy(), coalesced=True)
+    return outcome
+
+def cache_selected_result(form_data: dict, data) -> None:
+    """후보 중 사용자가 고른 결과를 같은 입력의 응답 캐시로 저장합니다."""
+    get_response_cache().put(make_form_key(sanitize_form_data(dict(form_data))), data)
+
+def generate_fallback_template(form_data: dict) -> dict:
+    """폴백: 기본 템플릿을 생성합니다."""
+    if form_data["보도자료_유형"] == PRODUCT_RELEASE_TYPE:
+        generated_text = f"""{form_data['도입부']}은(는) {form_data['출시일']}에 {form_data['제품명']}을(를) 출시한다고 발표했습니다.
+
+{form_data['제품명']}은(는) {form_data['제품 카테고리']} 제품으로, {form_data['주요 타깃']}을 위해 개발되었습니다.
+
+{form_data['주요 특징(세일즈 포인트)']}
+
+디자인 측면에서는 {form_data['주요 특징(디자인)']}
+
+제품의 주요 스펙으로는 {form_data['세부 스펙 및 성능']}
+
+{form_data['가격 및 판매 정보']}
+
+{form_data['맺음말']}"""
+    else:
+        generated_text = f"""{form_data['도입부']}은(는) {form_data['행사명']}을(를) 진행한다고 발표했습니다.
+
+행사 기간: {form_data['행사기간']}
+
+{form_data['행사내용']}
+
+{form_data['대상 제품']}
+
+유의사항:
+{form_data['유의사항']}
+
+{form_data['맺음말']}"""
+
+    generated_text += """
+
+이와 관련한 보도자료를 송부하며, 제품에 대한 추가 자료 요청이나 문의는
+아래 연락처로 부탁 드립니다.
+
+감사합니다."""
+    
+    return {
+        "title": form_data["제목"],
+        "news_data": generated_text,
+        "check_data": "",
+        "insta_data": "",
+        "facebook_data": "",
+        "blog_data": ""
+    }
+
+def get_required_fields(release_type: str) -> list:
+    """보도자료 유형별 필수 입력 필드를 반환합니다."""
+    if release_type == PRODUCT_RELEASE_TYPE:
+        return [
+            "제목",
+            "도입부",
+            "제품명",
+            "주요 특징(세일즈 포인트)",
+            "주요 특징(디자인)"
+        ]
+    else:  # 이벤트/행사 보도자료
+        return [
+            "제목",
+            "도입부",
+            "행사명",
+            "행사기간",
+            "행사내용",
+            "대상 제품"
+        ]
+
+class InvalidReleaseType(ValueError):
+    """보도자료 유형이 알려진 값(RELEASE_TYPES)이 아닐 때 발생합니다."""
+
+def normalize_release_type(form_data: dict) -> str:
+    """
+    보도자료 유형을 확인합니다. 비어 있으면 DEFAULT_RELEASE_TYPE으로 채웁니다.
+    알 수 없는 값이면 InvalidReleaseType을 발생시킵니다.
+    """
+    release_type = form_data.get("보도자료_유형")
+    release_type = str(release_type).strip() if release_type is not None else ""
+    if not release_type:
+        release_type = DEFAULT_RELEASE_TYPE
+    if release_type not in RELEASE_TYPES:
+        raise InvalidReleaseType(
+            f"알 수 없는 보도자료 유형입니다: {release_type} (가능한 값: {', '.join(RELEASE_TYPES)})"
+        )
+    form_data["보도자료_유형"] = release_type
+    return release_type
+
+def validate_record(form_data: dict) -> list:
+    """
+    폼 데이터를 정리하고 필수 항목을 검증합니다.
+    보도자료 유형이 알 수 없는 값이면 InvalidReleaseType을 발생시킵니다.
+    return: 비어 있는 필수 항목 목록 (문제 없으면 빈 리스트)
+    """
+    release_type = normalize_release_type(form_data)
+    fields = PRODUCT_FIELDS if release_type == PRODUCT_RELEASE_TYPE else EVENT_FIELDS
+    for key in fields:
+        if form_data.get(key) is None:
+            form_data[key] = ""
+        elif not isinstance(form_data[key], str):
+            form_data[key] = str(form_data[key])
+    return [k for k in get_required_fields(release_type) if not form_data[k].strip()]
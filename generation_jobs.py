@@ -0,0 +1,241 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from metrics import REGISTRY, STAGE_SECONDS
+
+# 작업 처리 설정 (환경변수로 조정 가능)
+# - MAX_WORKERS: n8n으로 동시에 보내는 요청 수 상한 (전역)
+# - PER_SESSION_RUNNING: 세션 하나가 동시에 실행할 수 있는 작업 수
+# - JOB_TTL: 끝난 작업을 보관하는 시간(초)
+JOB_MAX_WORKERS = int(os.environ.get("NEWS_AUTO_JOB_MAX_WORKERS", "4"))
+JOB_PER_SESSION_RUNNING = int(os.environ.get("NEWS_AUTO_JOB_PER_SESSION_RUNNING", "1"))
+JOB_MAX_QUEUED = int(os.environ.get("NEWS_AUTO_JOB_MAX_QUEUED", "200"))
+JOB_TTL = float(os.environ.get("NEWS_AUTO_JOB_TTL", "600"))
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# 워커 스레드별 현재 실행 중인 작업
+_current = threading.local()
+
+def report_progress(value):
+    """
+    실행 중인 작업의 중간 결과를 기록합니다. (작업 함수 안에서 호출)
+    작업 스레드가 아닌 곳에서 호출하면 아무것도 하지 않습니다.
+    """
+    job = getattr(_current, "job", None)
+    if job is not None:
+        job.progress = value
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없을 때 발생합니다."""
+
+class Job:
+    """백그라운드 생성 작업"""
+
+    def __init__(self, session_id: str, func, args: tuple, kwargs: dict, running_limit: int = None):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.running_limit = running_limit  # 세션별 동시 실행 상한을 이 작업에 한해 올림 (None이면 기본값)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.status = JOB_QUEUED
+        self.result = None
+        self.error = None
+        self.progress = None  # 실행 중 중간 결과 (예: 스트리밍으로 받은 본문)
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+class JobManager:
+    """
+    전역 동시 실행 상한과 세션별 공정성(round-robin)을 갖는 작업 관리자
+
+    세션마다 대기열을 따로 두고, 워커가 비면 실행 가능한 세션을 돌아가며 하나씩 꺼냅니다.
+    한 세션이 작업을 많이 넣어도 다른 세션의 작업이 뒤로 밀리지 않습니다.
+    """
+
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS, per_session_running: int = JOB_PER_SESSION_RUNNING,
+                 max_queued: int = JOB_MAX_QUEUED, job_ttl: float = JOB_TTL):
+        self.max_workers = max_workers
+        self.per_session_running = per_session_running
+        self.max_queued = max_queued
+        self.job_ttl = job_ttl
+        self._jobs = {}
+        self._queues = OrderedDict()  # session_id -> deque[Job] (순서가 곧 round-robin 순서)
+        self._running = {}            # session_id -> 실행 중 작업 수
+        self._queued_count = 0
+        self._cond = threading.Condition()
+        self._workers = []
+        self._stopped = False
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"generation-job-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, session_id: str, func, *args, running_limit: int = None, **kwargs) -> str:
+        """
+        작업을 대기열에 넣고 job id를 반환합니다.
+        running_limit: 이 작업을 꺼낼 때 적용할 세션별 동시 실행 상한 (한 번에 제출한 후보들을 함께 실행할 때만 올림)
+        """
+        job = Job(session_id, func, args, kwargs, running_limit)
+        with self._cond:
+            self._purge_finished()
+            if self._queued_count >= self.max_queued:
+                raise QueueFullError("대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            self._jobs[job.id] = job
+            self._queues.setdefault(session_id, deque()).append(job)
+            self._queued_count += 1
+            self._cond.notify()
+        return job.id
+
+    def get(self, job_id: str):
+        """작업을 반환합니다. 없거나 만료된 경우 None"""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중인 작업을 취소합니다. (실행 중인 작업은 취소할 수 없음)"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JOB_QUEUED:
+                return False
+            queue = self._queues.get(job.session_id)
+            if queue is not None:
+                queue.remove(job)
+                if not queue:
+                    del self._queues[job.session_id]
+            self._queued_count -= 1
+            job.status = JOB_CANCELLED
+            job.finished_at = time.time()
+            return True
+
+    def queue_position(self, job_id: str) -> int:
+        """
+        대기 순번을 반환합니다. (1 = 다음 실행 대상, 0 = 대기 중 아님)
+        세션별 round-robin 순서를 그대로 따라가며 계산합니다.
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != JOB_QUEUED:
+                return 0
+            depth = self._queues[job.session_id].index(job)
+            # 앞선 라운드에서 꺼내질 작업 수 + 같은 라운드에서 앞 순서 세션의 작업 수
+            position = 0
+            before = True
+            for session_id, queue in self._queues.items():
+                if session_id == job.session_id:
+                    position += depth + 1
+                    before = False
+                else:
+                    position += min(len(queue), depth + 1 if before else depth)
+            return position
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": self._queued_count,
+                "running": sum(self._running.values()),
+                "sessions_waiting": len(self._queues),
+                "max_workers": self.max_workers
+            }
+
+    def shutdown(self):
+        """워커를 종료합니다. (대기 중인 작업은 실행되지 않음)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=1)
+
+    def _next_job(self):
+        # round-robin: 실행 가능한 첫 세션에서 하나 꺼내고 그 세션을 맨 뒤로 보냄
+        for session_id, queue in self._queues.items():
+            limit = max(self.per_session_running, queue[0].running_limit or 0)
+            if self._running.get(session_id, 0) >= limit:
+                continue
+            job = queue.popleft()
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            self._queued_count -= 1
+            return job
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopped:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                STAGE_SECONDS.observe(job.started_at - job.created_at, stage="queue_wait")
+                self._running[job.session_id] = self._running.get(job.session_id, 0) + 1
+
+            _current.job = job
+            try:
+                result = job.func(*job.args, **job.kwargs)
+                error = None
+            except Exception as e:
+                result = None
+                error = e
+            finally:
+                _current.job = None
+
+            with self._cond:
+                job.result = result
+                job.error = error
+                job.status = JOB_FAILED if error is not None else JOB_DONE
+                job.finished_at = time.time()
+                self._running[job.session_id] -= 1
+                if not self._running[job.session_id]:
+                    del self._running[job.session_id]
+                # 세션별 실행 상한 때문에 기다리던 작업이 있을 수 있음
+                self._cond.notify_all()
+
+    def _purge_finished(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.job_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    """프로세스 공유 작업 관리자를 반환합니다."""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = JobManager()
+    return _job_manager
+
+def _collect_metrics():
+    if _job_manager is None:
+        return
+    gauge = REGISTRY.gauge("news_auto_jobs", "생성 작업 상태 (queued/running/sessions_waiting)")
+    for name, value in _job_manager.stats().items():
+        gauge.set(value, stat=name)
+
+REGISTRY.add_collector(_collect_metrics)
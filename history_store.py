@@ -0,0 +1,224 @@
+"""
+생성된 보도자료 기록 저장소 (SQLite + FTS5 전문 검색, id 기준 keyset 페이지네이션)
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from html_output import ENCODING_GZIP, compress
+from metrics import REGISTRY, log_event, stage_timer
+
+# 기록 DB 파일 (빈 값이면 기록 저장 안 함)
+HISTORY_DB_PATH = os.environ.get(
+    "NEWS_AUTO_HISTORY_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.db")
+)
+HISTORY_PAGE_SIZE = int(os.environ.get("NEWS_AUTO_HISTORY_PAGE_SIZE", "10"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    id INTEGER PRIMARY KEY,
+    content_key TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL,
+    release_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    fallback INTEGER NOT NULL DEFAULT 0,
+    form_json TEXT NOT NULL,
+    data_json TEXT NOT NULL,
+    html_gzip BLOB
+);
+CREATE INDEX IF NOT EXISTS releases_type_id ON releases (release_type, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS releases_fts USING fts5(
+    title, body, tokenize = 'unicode61', prefix = '2 3'
+);
+"""
+
+# 검색 결과 미리보기에 표시할 본문 단어 수
+SNIPPET_TOKENS = 12
+
+def make_content_key(form_data: dict, generated_data: dict) -> str:
+    """같은 결과를 여러 번 저장하지 않도록 (폼 + 생성 결과)의 해시를 키로 사용합니다."""
+    canonical = json.dumps([form_data, dict(generated_data)], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def build_match_query(text: str) -> str:
+    """
+    검색어를 FTS5 MATCH 식으로 바꿉니다.
+    단어마다 접두어 검색(조사가 붙은 한국어 단어도 찾도록)을 하고, 모든 단어를 포함한 기록만 찾습니다.
+    문장 부호만 있는 단어는 토큰이 없어 어떤 기록과도 맞지 않으므로 뺍니다.
+    """
+    terms = [term.replace('"', '""') for term in text.split() if re.search(r"\w", term)]
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+class HistoryStore:
+    """보도자료 기록 저장소 (프로세스 내 모든 세션과 작업 스레드가 연결 하나를 공유)"""
+
+    def __init__(self, path: str = HISTORY_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL: 쓰는 동안에도 다른 프로세스(여러 Streamlit 워커)가 읽을 수 있음
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def save(self, form_data: dict, generated_data: dict, html_bytes: bytes = None, fallback: bool = False) -> int:
+        """생성 결과를 저장하고 id를 반환합니다. (같은 내용이 이미 있으면 기존 id)"""
+        content_key = make_content_key(form_data, generated_data)
+        html_gzip = compress(html_bytes, ENCODING_GZIP) if html_bytes is not None else None
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM releases WHERE content_key = ?", (content_key,)).fetchone()
+            if row is not None:
+                return row["id"]
+            cursor = self._conn.execute(
+                "INSERT INTO releases (content_key, created_at, release_type, title, fallback, form_json, data_json, "
+                "html_gzip) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    content_key, time.time(), form_data.get("보도자료_유형", ""), generated_data.get("title", ""),
+                    int(fallback), json.dumps(form_data, ensure_ascii=False),
+                    json.dumps(dict(generated_data), ensure_ascii=False), html_gzip
+                )
+            )
+            release_id = cursor.lastrowid
+            self._conn.execute(
+                "INSERT INTO releases_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (release_id, generated_data.get("title", ""), generated_data.get("news_data", ""))
+            )
+        return release_id
+
+    def list_page(self, query: str = "", before_id: int = None, limit: int = HISTORY_PAGE_SIZE,
+                  release_type: str = None) -> dict:
+        """
+        최신순 목록/검색 결과 한 페이지를 반환합니다.
+        - query: 검색어 (빈 값이면 전체 목록)
+        - before_id: 이전 페이지의 next_before_id (첫 페이지는 None)
+        return: {"items": [{"id", "created_at", "release_type", "title", "fallback", "snippet"}], "next_before_id"}
+        """
+        match = build_match_query(query)
+        params = []
+        where = []
+        if match:
+            sql = (
+                "SELECT r.id, r.created_at, r.release_type, r.title, r.fallback, "
+                f"snippet(releases_fts, 1, '', '', '…', {SNIPPET_TOKENS}) AS snippet "
+                "FROM releases_fts JOIN releases r ON r.id = releases_fts.rowid"
+            )
+            where.append("releases_fts MATCH ?")
+            params.append(match)
+            id_column = "releases_fts.rowid"
+        else:
+            sql = "SELECT r.id, r.created_at, r.release_type, r.title, r.fallback, '' AS snippet FROM releases r"
+            id_column = "r.id"
+        if before_id is not None:
+            where.append(f"{id_column} < ?")
+            params.append(before_id)
+        if release_type:
+            where.append("r.release_type = ?")
+            params.append(release_type)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # 한 건 더 읽어서 다음 페이지가 있는지 확인 (COUNT(*) 없이)
+        sql += f" ORDER BY {id_column} DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with stage_timer("history_query", search=bool(match)), self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        next_before_id = items[-1]["id"] if len(rows) > limit else None
+        return {"items": items, "next_before_id": next_before_id}
+
+    def get(self, release_id: int):
+        """저장된 기록 하나를 반환합니다. return: {"id", "created_at", "form_data", "generated_data", "fallback"} 또는 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, created_at, fallback, form_json, data_json FROM releases WHERE id = ?", (release_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "fallback": bool(row["fallback"]),
+            "form_data": json.loads(row["form_json"]),
+            "generated_data": json.loads(row["data_json"])
+        }
+
+    def get_html_gzip(self, release_id: int):
+        """저장된 HTML(gzip)을 반환합니다. (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT html_gzip FROM releases WHERE id = ?", (release_id,)).fetchone()
+        return row["html_gzip"] if row is not None else None
+
+    def delete(self, release_id: int):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM releases WHERE id = ?", (release_id,))
+            self._conn.execute("DELETE FROM releases_fts WHERE rowid = ?", (release_id,))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM releases").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+_store_failed_at = None
+# 저장소를 열지 못했을 때 다시 시도하기까지 기다리는 시간(초)
+STORE_RETRY_INTERVAL = 60.0
+
+def history_enabled() -> bool:
+    """기록 저장 설정 여부 (NEWS_AUTO_HISTORY_DB가 빈 값이면 False)"""
+    return bool(HISTORY_DB_PATH)
+
+def get_history_store():
+    """
+    프로세스 공유 기록 저장소를 반환합니다.
+    NEWS_AUTO_HISTORY_DB가 빈 값이거나 저장소를 열지 못하면(폴더 생성/DB 열기 실패) None
+    """
+    global _store, _store_failed_at
+    if not HISTORY_DB_PATH:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if _store_failed_at is not None and time.monotonic() - _store_failed_at < STORE_RETRY_INTERVAL:
+                    return None
+                try:
+                    _store = HistoryStore()
+                except (sqlite3.Error, OSError) as e:
+                    _store_failed_at = time.monotonic()
+                    log_event("history_open_failed", path=HISTORY_DB_PATH, error=str(e))
+                    return None
+    return _store
+
+def save_generation(form_data: dict, outcome: dict, html_bytes: bytes = None):
+    """
+    생성 결과를 기록에 저장합니다. 저장에 실패해도 생성 결과는 그대로 사용할 수 있도록 예외를 삼킵니다.
+    return: 기록 id 또는 None
+    """
+    if not outcome.get("data"):
+        return None
+    store = get_history_store()
+    if store is None:
+        return None
+    try:
+        with stage_timer("history_save"):
+            return store.save(form_data, outcome["data"], html_bytes=html_bytes, fallback=outcome.get("fallback", False))
+    except (sqlite3.Error, OSError) as e:
+        log_event("history_save_failed", error=str(e))
+        return None
+
+def _collect_metrics():
+    if _store is not None:
+        REGISTRY.gauge("news_auto_history_releases", "저장된 보도자료 기록 수").set(_store.count())
+
+REGISTRY.add_collector(_collect_metrics)
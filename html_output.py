@@ -0,0 +1,185 @@
+"""
+보도자료 HTML 출력 단계: 공백 정리(minify)와 gzip/brotli 압축본 생성
+
+minify는 브라우저/메일 클라이언트에서 보이는 결과가 바뀌지 않는 범위에서만 줄입니다.
+"""
+import gzip
+import os
+import re
+from functools import lru_cache
+
+# 채널별 minify 여부 (preview: 미리보기 iframe, download: 다운로드 파일, api: HTTP API 응답)
+MINIFY_CHANNELS = {
+    "preview": os.environ.get("NEWS_AUTO_MINIFY_PREVIEW", "1") == "1",
+    "download": os.environ.get("NEWS_AUTO_MINIFY_DOWNLOAD", "0") == "1",
+    "api": os.environ.get("NEWS_AUTO_MINIFY_API", "1") == "1",
+}
+
+# 압축 수준 (gzip 1~9, brotli 0~11)
+GZIP_LEVEL = int(os.environ.get("NEWS_AUTO_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("NEWS_AUTO_BROTLI_QUALITY", "5"))
+
+ENCODING_IDENTITY = "identity"
+ENCODING_GZIP = "gzip"
+ENCODING_BROTLI = "br"
+
+# 앞뒤 공백이 표시 결과에 영향을 주지 않는 태그
+BLOCK_TAGS = (
+    "html", "head", "body", "meta", "title", "style", "link", "div", "table", "tbody", "thead", "tfoot",
+    "tr", "td", "th", "p", "hr", "br", "ul", "ol", "li", "h1", "h2", "h3", "h4", "h5", "h6", "!doctype"
+)
+
+# 내용을 건드리면 안 되는 요소
+_RAW_RE = re.compile(r"(<(pre|textarea|script)\b.*?</\2\s*>)", re.I | re.S)
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_STYLE_BLOCK_RE = re.compile(r"(<style(?:\s[^>]*)?>)(.*?)(</style\s*>)", re.I | re.S)
+_STYLE_ATTR_RE = re.compile(r'(style=")(?<=\sstyle=")([^"]*)(")')
+_SPACE_RE = re.compile(r"[ \t\r\n\f]+")
+_TAG_RE = re.compile(r"(<[^>]*>)")
+# 텍스트 조각에 줄일 공백이 있는지 (없으면 그대로 사용)
+_TEXT_SPACE_RE = re.compile(r"[\t\r\n\f]|  ")
+# CSS 문자열 (글꼴 이름, content 등 - 안쪽 공백/':'/';'는 표시 결과의 일부이므로 그대로 유지)
+_CSS_STRING_RE = re.compile(r"""('[^']*'|"[^"]*"|&quot;.*?&quot;)""")
+_BLOCK_TAG_SET = frozenset(BLOCK_TAGS)
+_HTML_SPACE = " \t\r\n\f"  # &nbsp;(\xa0)는 공백으로 취급하지 않음
+
+# 태그는 같은 문자열이 반복되므로 정리 결과를 재사용 (종류가 많아지면 비움)
+_tag_cache = {}
+_TAG_CACHE_MAX = 4096
+
+def _outside_css_strings(css: str, func) -> str:
+    """CSS 문자열(따옴표 안)은 그대로 두고 나머지 부분에만 func를 적용합니다."""
+    parts = _CSS_STRING_RE.split(css)
+    return "".join(part if i % 2 else func(part) for i, part in enumerate(parts))
+
+def _tighten_css(css: str) -> str:
+    css = _SPACE_RE.sub(" ", css)
+    # 선택자의 ' :' (자손 + 가상 클래스)는 의미가 다르므로 ':' 앞 공백은 유지
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return re.sub(r":\s+", ":", css)
+
+@lru_cache(maxsize=64)  # <style> 블록은 보통 몇 종류뿐
+def _minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return _outside_css_strings(css, _tighten_css).strip()
+
+def _tighten_style_attr(value: str) -> str:
+    value = re.sub(r";\s+", ";", _SPACE_RE.sub(" ", value))
+    return re.sub(r":\s+", ":", value)
+
+def _minify_style_attr(match) -> str:
+    return match.group(1) + _outside_css_strings(match.group(2).strip(), _tighten_style_attr) + match.group(3)
+
+def _minify_tag(tag: str) -> tuple:
+    """return: (정리된 태그, 블록 태그 여부)"""
+    cached = _tag_cache.get(tag)
+    if cached is None:
+        name = re.split(r"[\s/>]", tag[1:].lstrip("/"), maxsplit=1)[0].lower()
+        minified = _STYLE_ATTR_RE.sub(_minify_style_attr, tag)
+        if "\n" in minified:
+            minified = _SPACE_RE.sub(lambda m: "\n" if "\n" in m.group(0) else m.group(0), minified)
+        cached = (minified, name in _BLOCK_TAG_SET)
+        if len(_tag_cache) >= _TAG_CACHE_MAX:
+            _tag_cache.clear()
+        _tag_cache[tag] = cached
+    return cached
+
+def _collapse_text(text: str) -> str:
+    if not _TEXT_SPACE_RE.search(text):
+        return text
+    return _SPACE_RE.sub(lambda m: "\n" if "\n" in m.group(0) else " ", text)
+
+def _minify_markup(html: str) -> str:
+    html = _COMMENT_RE.sub("", html)
+    html = _STYLE_BLOCK_RE.sub(lambda m: m.group(1) + _minify_css(m.group(2)) + m.group(3), html)
+    # 태그/텍스트를 번갈아 처리: 텍스트는 공백을 합치고, 블록 태그와 맞닿은 쪽 공백은 제거
+    parts = _TAG_RE.split(html)
+    previous_block = True  # 문서 시작의 공백도 제거
+    for i in range(1, len(parts), 2):
+        parts[i], is_block = _minify_tag(parts[i])
+        text = parts[i - 1]
+        if text:
+            if previous_block:
+                text = text.lstrip(_HTML_SPACE)
+            if is_block:
+                text = text.rstrip(_HTML_SPACE)
+            parts[i - 1] = _collapse_text(text)
+        previous_block = is_block
+    parts[-1] = _collapse_text(parts[-1].lstrip(_HTML_SPACE) if previous_block else parts[-1])
+    return "".join(parts)
+
+def minify_html(html: str) -> str:
+    """표시 결과를 바꾸지 않는 범위에서 HTML 공백/주석을 줄입니다."""
+    # <pre> 등은 그대로 두고 나머지 부분만 처리
+    parts = _RAW_RE.split(html)
+    out = []
+    i = 0
+    while i < len(parts):
+        out.append(_minify_markup(parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+        i += 3
+    return "".join(out).strip()
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+def available_encodings() -> tuple:
+    """사용 가능한 압축 방식 (brotli는 패키지가 설치된 경우에만)"""
+    if _brotli() is not None:
+        return (ENCODING_BROTLI, ENCODING_GZIP, ENCODING_IDENTITY)
+    return (ENCODING_GZIP, ENCODING_IDENTITY)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """data를 지정한 방식으로 압축합니다. (identity면 그대로 반환)"""
+    if encoding == ENCODING_IDENTITY:
+        return data
+    if encoding == ENCODING_GZIP:
+        # mtime=0: 같은 입력이면 항상 같은 바이트 (ETag/캐시용)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == ENCODING_BROTLI:
+        brotli = _brotli()
+        if brotli is None:
+            raise ValueError("brotli 패키지가 설치되어 있지 않습니다. (pip install brotli)")
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    raise ValueError(f"지원하지 않는 압축 방식입니다: {encoding}")
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Accept-Encoding 헤더에서 사용할 압축 방식을 고릅니다. (br > gzip > identity)"""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    for encoding in available_encodings()[:-1]:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return ENCODING_IDENTITY
+
+def should_minify(channel: str) -> bool:
+    return MINIFY_CHANNELS.get(channel, False)
+
+def build_html_variants(html: str, minify: bool = True, encodings: tuple = None) -> dict:
+    """
+    HTML 한 건의 출력 변형을 만듭니다.
+    return: {encoding: bytes} (identity는 항상 포함, minify 적용 후 utf-8)
+    """
+    if minify:
+        html = minify_html(html)
+    data = html.encode("utf-8")
+    variants = {ENCODING_IDENTITY: data}
+    for encoding in encodings or available_encodings():
+        if encoding != ENCODING_IDENTITY:
+            variants[encoding] = compress(data, encoding)
+    return variants
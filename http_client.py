@@ -0,0 +1,101 @@
+import asyncio
+import os
+import threading
+from typing import TYPE_CHECKING
+
+# requests는 첫 요청 때 불러옴 (앱 첫 화면 표시에는 필요 없으므로 콜드 스타트에서 제외)
+if TYPE_CHECKING:
+    import requests
+
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+# - POOL_CONNECTIONS: 호스트별 풀 개수
+# - POOL_MAXSIZE: 풀당 유지할 keep-alive 커넥션 수 (동시 요청 수 이상으로 설정)
+HTTP_POOL_CONNECTIONS = int(os.environ.get("NEWS_AUTO_HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("NEWS_AUTO_HTTP_POOL_MAXSIZE", "32"))
+HTTP_POOL_BLOCK = os.environ.get("NEWS_AUTO_HTTP_POOL_BLOCK", "0") == "1"
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_http_session(pool_connections: int = HTTP_POOL_CONNECTIONS,
+                        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                        pool_block: bool = HTTP_POOL_BLOCK) -> "requests.Session":
+    """커넥션 풀과 keep-alive가 설정된 requests.Session을 만듭니다."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=0
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+def get_http_session() -> "requests.Session":
+    """프로세스 내 모든 Streamlit 세션이 공유하는 HTTP 세션을 반환합니다."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+    return _session
+
+def close_http_session():
+    """공유 HTTP 세션을 닫습니다. (테스트/종료 시 사용)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def post_json(url: str, payload: dict, timeout=30, **kwargs) -> "requests.Response":
+    """공유 커넥션 풀을 통해 JSON을 POST 합니다."""
+    return get_http_session().post(url, json=payload, timeout=timeout, **kwargs)
+
+# 비동기 클라이언트 (httpx가 설치된 경우 사용, 이벤트 루프별로 하나씩 유지)
+_async_clients = {}
+_async_lock = threading.Lock()
+
+def _get_async_client():
+    try:
+        import httpx
+    except ImportError:
+        return None
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_MAXSIZE,
+                    max_keepalive_connections=HTTP_POOL_MAXSIZE
+                )
+            )
+            _async_clients[loop] = client
+    return client
+
+async def async_post_json(url: str, payload: dict, timeout=30):
+    """
+    비동기로 JSON을 POST 합니다.
+    httpx가 있으면 공유 AsyncClient를, 없으면 스레드에서 공유 세션을 사용합니다.
+    return: status_code, headers, text, json()을 제공하는 응답 객체
+    """
+    client = _get_async_client()
+    if client is None:
+        return await asyncio.to_thread(post_json, url, payload, timeout)
+    if isinstance(timeout, tuple):
+        import httpx
+        timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+    return await client.post(url, json=payload, timeout=timeout)
+
+async def close_async_client():
+    """현재 이벤트 루프의 AsyncClient를 닫습니다."""
+    with _async_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
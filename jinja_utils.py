@@ -1,81 +1,251 @@
-from jinja2 import Environment, FileSystemLoader, Template
 import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from html_output import minify_html
+from metrics import REGISTRY, RENDERED_BYTES, stage_timer
+
+# jinja2는 첫 렌더링 때 불러옴 (앱 첫 화면 표시에는 필요 없으므로 콜드 스타트에서 제외)
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+# 템플릿 폴더 (현재 파일 기준 templates 폴더)
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# 바이트코드 캐시 폴더 (환경변수로 지정 시 워커 재시작 후에도 컴파일 결과 재사용)
+BYTECODE_CACHE_DIR = os.environ.get("NEWS_AUTO_JINJA_CACHE_DIR", "")
+
+_env = None
+_env_lock = threading.Lock()
+
+def get_template_env() -> "Environment":
+    """프로세스 전체에서 공유하는 Jinja2 Environment를 반환합니다.
+
+    템플릿은 프로세스당 한 번만 컴파일되며, 파일 mtime이 바뀐 경우에만 다시 읽습니다.
+    """
+    global _env
+    if _env is None:
+        with _env_lock:
+            if _env is None:
+                from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+                bytecode_cache = None
+                if BYTECODE_CACHE_DIR:
+                    os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+                    bytecode_cache = FileSystemBytecodeCache(BYTECODE_CACHE_DIR)
+                _env = Environment(
+                    loader=FileSystemLoader(TEMPLATES_DIR),
+                    auto_reload=True,  # mtime 변경 시에만 재컴파일
+                    cache_size=50,
+                    bytecode_cache=bytecode_cache
+                )
+    return _env
+
+def get_template(name: str = 'press_release_template.html') -> "Template":
+    """컴파일된 템플릿을 캐시에서 가져옵니다."""
+    return get_template_env().get_template(name)
+
+# 본문/제목 공통 CSS 속성
+BASE_CSS = 'font-size: 10pt; font-family: 맑은 고딕; font-style: normal; font-variant-ligatures: normal; ' \
+           'font-variant-caps: normal; font-weight: 400; letter-spacing: normal; orphans: 2; text-align: left; ' \
+           'text-indent: 0px; text-transform: none; widows: 2; word-spacing: 0px; -webkit-text-stroke-width: 0px; ' \
+           'white-space: normal; text-decoration-thickness: initial; text-decoration-style: initial; ' \
+           'text-decoration-color: initial; color: rgb(51, 51, 51)'
+
+TITLE_CSS = 'font-size: 12px; font-family: 맑은 고딕; font-style: normal; font-variant-ligatures: normal; ' \
+            'font-variant-caps: normal; font-weight: bold; letter-spacing: normal; orphans: 2; text-align: center; ' \
+            'text-indent: 0px; text-transform: none; widows: 2; word-spacing: 0px; -webkit-text-stroke-width: 0px; ' \
+            'white-space: normal; text-decoration-thickness: initial; text-decoration-style: initial; ' \
+            'text-decoration-color: initial; color: #0033CC'
+
+# 출력 모드
+# - inline: 줄마다 style 속성 (<style>을 제거하는 메일 클라이언트용, 기본값)
+# - class: <style> 블록 한 번 + 짧은 class 속성 (미리보기/웹용)
+STYLE_MODE_INLINE = "inline"
+STYLE_MODE_CLASS = "class"
+
+# 모드별 span 속성
+SPAN_ATTRS = {
+    STYLE_MODE_INLINE: (f'style="{TITLE_CSS}"', f'style="{BASE_CSS}"'),
+    STYLE_MODE_CLASS: ('class="pr-title"', 'class="pr-body"'),
+}
+
+# class 모드에서 템플릿 <head>에 들어가는 스타일시트
+PRESS_RELEASE_STYLESHEET = f"span.pr-title {{ {TITLE_CSS} }}\nspan.pr-body {{ {BASE_CSS} }}"
+
+# 들여쓰기용 &nbsp; 묶음 (길이별로 미리 계산)
+_NBSP_RUNS = ['&nbsp;' * n for n in range(65)]
+
+def _nbsp_run(n: int) -> str:
+    return _NBSP_RUNS[n] if n < len(_NBSP_RUNS) else '&nbsp;' * n
+
+def _escape_html(line: str) -> str:
+    """<, >, & 를 이스케이프합니다. (특수문자가 없으면 그대로 반환)"""
+    if '&' in line:
+        line = line.replace('&', '&amp;')
+    if '<' in line:
+        line = line.replace('<', '&lt;')
+    if '>' in line:
+        line = line.replace('>', '&gt;')
+    return line
+
+def iter_text_to_html(text: str, title: str = "", style_mode: str = STYLE_MODE_INLINE, escape: bool = True):
+    """일반 텍스트를 HTML 조각 단위로 변환해 순서대로 yield 합니다. (빈 줄로 문단 구분)"""
+    if style_mode not in SPAN_ATTRS:
+        raise ValueError(f"지원하지 않는 style_mode입니다: {style_mode}")
+    # 제목/본문 스타일 (inline: style 속성, class: class 속성)
+    title_style, base_style = SPAN_ATTRS[style_mode]
+    line_prefix = f'<span lang="EN-US" {base_style}>'
+    line_suffix = '</span><br>\n'
+
+    # 출력한 내용이 있는지, 직전 출력 이후 문단 경계('\n\n')가 있었는지
+    started = False
+    paragraph_break = True
 
-def convert_text_to_html(text: str, title: str = "") -> str:
-    """일반 텍스트를 HTML 형식으로 변환합니다."""
-    # 기본 스타일 정의
-    base_style = 'style="font-size: 10pt; font-family: 맑은 고딕; font-style: normal; font-variant-ligatures: normal; ' \
-                'font-variant-caps: normal; font-weight: 400; letter-spacing: normal; orphans: 2; text-align: left; ' \
-                'text-indent: 0px; text-transform: none; widows: 2; word-spacing: 0px; -webkit-text-stroke-width: 0px; ' \
-                'white-space: normal; text-decoration-thickness: initial; text-decoration-style: initial; ' \
-                'text-decoration-color: initial; color: rgb(51, 51, 51)"'
-    
-    # 제목 스타일 정의
-    title_style = 'style="font-size: 12px; font-family: 맑은 고딕; font-style: normal; font-variant-ligatures: normal; ' \
-                 'font-variant-caps: normal; font-weight: bold; letter-spacing: normal; orphans: 2; text-align: center; ' \
-                 'text-indent: 0px; text-transform: none; widows: 2; word-spacing: 0px; -webkit-text-stroke-width: 0px; ' \
-                 'white-space: normal; text-decoration-thickness: initial; text-decoration-style: initial; ' \
-                 'text-decoration-color: initial; color: #0033CC"'
-    
     # 제목 처리
-    result = []
     if title:
-        result.append(f'<span {title_style}>{title}</span><br>\n<br>\n')
-    
-    # 줄바꿈을 <br>과 들여쓰기로 변환
-    paragraphs = text.split('\n\n')  # 빈 줄로 문단 구분
-    
-    formatted_paragraphs = []
-    for p in paragraphs:
-        # 각 줄을 <br>로 연결
-        lines = p.split('\n')
-        formatted_lines = []
-        for line in lines:
-            if line.strip():  # 빈 줄이 아닌 경우
-                # 들여쓰기가 필요한 경우 &nbsp; 추가
-                if line.startswith(' '):
-                    line = '&nbsp;' * (len(line) - len(line.lstrip())) + line.lstrip()
-                
-                # 모든 텍스트에 기본 스타일 적용
-                formatted_lines.append(f'<span lang="EN-US" {base_style}>{line}</span><br>\n')
-        
-        # 문단을 합치기
-        if formatted_lines:
-            paragraph = ''.join(formatted_lines)
-            formatted_paragraphs.append(paragraph)
-            # 문단 사이에 빈 줄 추가
-            formatted_paragraphs.append('<br>\n')
-    
-    # 모든 문단을 합치고 마지막 빈 줄 제거
-    result.extend(formatted_paragraphs)
-    final_result = ''.join(result)
-    if final_result.endswith('<br>\n'):
-        final_result = final_result[:-5]
-    
-    return final_result
-
-def generate_press_release_html(title: str, body_text: str) -> str:
-    """
-    - title: 문서의 <title> 태그 및 제목 표시용
-    - body_text: 보도자료 본문(HTML 태그 포함 가능)
-    return: 최종적으로 합쳐진 HTML 문자열
-    """
-    # 템플릿 로더 설정 (현재 디렉토리 기준 templates 폴더)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    templates_dir = os.path.join(current_dir, 'templates')
+        yield f'<span {title_style}>{_escape_html(title) if escape else title}</span><br>\n'
+        started = True
+
+    pos = 0
+    length = len(text)
+    while pos <= length:
+        end = text.find('\n', pos)
+        if end == -1:
+            end = length
+        line = text[pos:end]
+        pos = end + 1
+
+        if not line.strip():
+            # 줄 사이의 완전히 빈 줄은 '\n\n' 이므로 문단 경계
+            if not line:
+                paragraph_break = True
+            continue
+
+        # 문단 사이에 빈 줄 추가 (마지막 문단 뒤에는 붙이지 않음)
+        if started and paragraph_break:
+            yield '<br>\n'
+        started = True
+        paragraph_break = False
+
+        # 들여쓰기가 필요한 경우 &nbsp; 추가
+        indent = ''
+        if line.startswith(' '):
+            content = line.lstrip()
+            indent = _nbsp_run(len(line) - len(content))
+            line = content
+        if escape:
+            line = _escape_html(line)
+
+        # 모든 텍스트에 기본 스타일 적용
+        yield line_prefix + indent + line + line_suffix
+
+def convert_text_to_html(text: str, title: str = "", style_mode: str = STYLE_MODE_INLINE, escape: bool = True) -> str:
+    """일반 텍스트를 HTML 형식으로 변환합니다."""
+    return ''.join(iter_text_to_html(text, title, style_mode, escape))
+
+# 문단별 변환 결과 캐시 크기 (증분 렌더링용)
+PARAGRAPH_CACHE_MAX_ENTRIES = int(os.environ.get("NEWS_AUTO_PARAGRAPH_CACHE_ENTRIES", "4096"))
+PARAGRAPH_CACHE_MAX_BYTES = int(os.environ.get("NEWS_AUTO_PARAGRAPH_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+PARAGRAPH_CACHE = REGISTRY.counter("news_auto_paragraph_cache_total", "증분 렌더링 문단 캐시 조회 (result=hit|miss)")
 
-    env = Environment(loader=FileSystemLoader(templates_dir))
+_paragraph_cache = OrderedDict()  # (style_mode, escape, 문단 텍스트) -> 변환된 HTML
+_paragraph_cache_bytes = 0
+_paragraph_lock = threading.Lock()
 
-    # press_release_template.html 읽기
-    template = env.get_template('press_release_template.html')
+def _cache_paragraph(key: tuple, html: str):
+    global _paragraph_cache_bytes
+    if key in _paragraph_cache:
+        return
+    _paragraph_cache[key] = html
+    _paragraph_cache_bytes += len(key[2]) + len(html)
+    # 오래된 문단부터 제거
+    while _paragraph_cache and (len(_paragraph_cache) > PARAGRAPH_CACHE_MAX_ENTRIES
+                                or _paragraph_cache_bytes > PARAGRAPH_CACHE_MAX_BYTES):
+        old_key, old_html = _paragraph_cache.popitem(last=False)
+        _paragraph_cache_bytes -= len(old_key[2]) + len(old_html)
 
-    # 일반 텍스트를 HTML로 변환 (title 포함)
-    body_html = convert_text_to_html(body_text, title)
-    
-    # 템플릿 렌더링
-    rendered_html = template.render(
+def iter_text_to_html_incremental(text: str, title: str = "", style_mode: str = STYLE_MODE_INLINE, escape: bool = True):
+    """iter_text_to_html과 같은 결과를 문단 단위 캐시로 만듭니다. (바뀐 문단만 다시 변환)"""
+    if style_mode not in SPAN_ATTRS:
+        raise ValueError(f"지원하지 않는 style_mode입니다: {style_mode}")
+    # iter_text_to_html과 같은 경계('\n\n')로 나눠 각각 변환하면 이어 붙인 결과가 전체 변환과 같음
+    paragraphs = text.split('\n\n')
+    keys = [(style_mode, escape, paragraph) for paragraph in paragraphs]
+    with _paragraph_lock:
+        cached = []
+        for key in keys:
+            html = _paragraph_cache.get(key)
+            if html is not None:
+                _paragraph_cache.move_to_end(key)
+            cached.append(html)
+    misses = cached.count(None)
+    if misses:
+        # 캐시에 없는 문단만 변환 (잠금 밖에서)
+        for i, key in enumerate(keys):
+            if cached[i] is None:
+                cached[i] = ''.join(iter_text_to_html(key[2], "", style_mode, escape))
+        with _paragraph_lock:
+            for i, key in enumerate(keys):
+                _cache_paragraph(key, cached[i])
+        PARAGRAPH_CACHE.inc(misses, result="miss")
+    if len(keys) > misses:
+        PARAGRAPH_CACHE.inc(len(keys) - misses, result="hit")
+
+    started = False
+    if title:
+        yield f'<span {SPAN_ATTRS[style_mode][0]}>{_escape_html(title) if escape else title}</span><br>\n'
+        started = True
+    for html in cached:
+        if not html:
+            continue
+        if started:
+            yield '<br>\n'
+        started = True
+        yield html
+
+def convert_text_to_html_incremental(text: str, title: str = "", style_mode: str = STYLE_MODE_INLINE,
+                                     escape: bool = True) -> str:
+    """convert_text_to_html과 같은 결과를 문단 단위 캐시로 만듭니다. (편집-미리보기 반복용)"""
+    return ''.join(iter_text_to_html_incremental(text, title, style_mode, escape))
+
+def iter_press_release_html(title: str, body_text: str, style_mode: str = STYLE_MODE_INLINE, escape: bool = True,
+                            incremental: bool = False):
+    """보도자료 HTML을 Template.generate()로 조각 단위로 yield 합니다. (큰 본문용)"""
+    # press_release_template.html 읽기 (프로세스 공유 캐시 사용)
+    template = get_template('press_release_template.html')
+
+    # 본문 변환 결과를 문자열로 합치지 않고 그대로 템플릿에 흘려보냄
+    convert = iter_text_to_html_incremental if incremental else iter_text_to_html
+    return template.generate(
         title=title,
-        body_content=body_html
+        body_chunks=convert(body_text, title, style_mode, escape),
+        stylesheet=PRESS_RELEASE_STYLESHEET if style_mode == STYLE_MODE_CLASS else ""
     )
 
-    return rendered_html 
\ No newline at end of file
+def generate_press_release_html(title: str, body_text: str, style_mode: str = STYLE_MODE_INLINE, escape: bool = True,
+                                minify: bool = False, incremental: bool = False) -> str:
+    """
+    - title: 문서의 <title> 태그 및 제목 표시용
+    - body_text: 보도자료 본문(일반 텍스트, escape=False면 HTML 태그 포함 가능)
+    - style_mode: "inline"(줄마다 style 속성) 또는 "class"(<style> 블록 + class 속성)
+    - escape: 본문과 제목의 <, >, & 이스케이프 여부
+    - minify: 들여쓰기/주석 등 표시에 영향 없는 공백 제거 (html_output.minify_html)
+    - incremental: 바뀐 문단만 다시 변환 (결과는 같음, 같은 본문을 조금씩 고쳐 다시 렌더링할 때 사용)
+    return: 최종적으로 합쳐진 HTML 문자열
+    """
+    with stage_timer("render", style_mode=style_mode):
+        rendered_html = ''.join(iter_press_release_html(title, body_text, style_mode, escape, incremental))
+    if minify:
+        with stage_timer("minify", style_mode=style_mode):
+            rendered_html = minify_html(rendered_html)
+    RENDERED_BYTES.observe(len(rendered_html), style_mode=style_mode)
+    return rendered_html
+
+def get_template_version(name: str = 'press_release_template.html') -> str:
+    """템플릿 파일의 버전(mtime)을 반환합니다. 렌더링 캐시 키에 사용됩니다."""
+    try:
+        return str(os.stat(os.path.join(TEMPLATES_DIR, name)).st_mtime_ns)
+    except OSError:
+        return ""
@@ -0,0 +1,255 @@
+"""
+단계별 지연시간/카운터 수집 및 내보내기
+
+- Prometheus 텍스트 형식: NEWS_AUTO_METRICS_PORT 지정 시 http://<host>:<port>/metrics
+- 구조화 JSON 로그: NEWS_AUTO_JSON_LOG 지정 시 ("-" = stderr, 그 외 = 파일 경로)
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+METRICS_PORT = os.environ.get("NEWS_AUTO_METRICS_PORT", "")
+METRICS_HOST = os.environ.get("NEWS_AUTO_METRICS_HOST", "127.0.0.1")
+JSON_LOG = os.environ.get("NEWS_AUTO_JSON_LOG", "")
+
+# 히스토그램 구간
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def _escape_label_value(value) -> str:
+    # Prometheus 텍스트 형식: 역슬래시, 큰따옴표, 줄바꿈은 이스케이프
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    items = key + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in items) + "}"
+
+def url_label(url: str) -> str:
+    """URL을 지표 라벨 값으로 쓸 때 호스트(:포트)만 남깁니다. (경로의 webhook id가 노출되지 않도록)"""
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return url
+    return f"{parts.hostname}:{parts.port}" if parts.port else parts.hostname
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def expose(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class Gauge(Counter):
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def expose(self) -> list:
+        lines = super().expose()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    """누적 구간 히스토그램 (p50/p95/p99는 Prometheus의 histogram_quantile로 계산)"""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._values = {}  # key -> [구간별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(_label_key(labels))
+            return entry[-1] if entry else 0
+
+    def expose(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, entry):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {entry[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {entry[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {entry[-1]}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, *args)
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets)
+
+    def add_collector(self, collector):
+        """내보내기 직전에 호출되는 함수 (캐시 통계 등 gauge 갱신용)"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def expose(self) -> str:
+        """Prometheus 텍스트 형식으로 내보냅니다."""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception:
+                logger.exception("metrics collector 오류")
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+logger = logging.getLogger("news_auto")
+
+# 공통 지표
+STAGE_SECONDS = REGISTRY.histogram("news_auto_stage_seconds", "단계별 소요 시간(초)")
+GENERATIONS = REGISTRY.counter("news_auto_generations_total", "보도자료 생성 결과 (ok/fallback/cached/coalesced)")
+WEBHOOK_RESPONSES = REGISTRY.counter("news_auto_webhook_responses_total", "webhook HTTP 상태 코드별 응답 수")
+RESPONSE_BYTES = REGISTRY.histogram("news_auto_webhook_response_bytes", "webhook 응답 본문 크기", SIZE_BUCKETS)
+RENDERED_BYTES = REGISTRY.histogram("news_auto_rendered_html_bytes", "렌더링된 HTML 크기(문자 수)", SIZE_BUCKETS)
+IFRAME_BYTES = REGISTRY.histogram("news_auto_iframe_payload_bytes", "미리보기 iframe으로 보내는 HTML 크기", SIZE_BUCKETS)
+
+def process_rss_bytes() -> int:
+    """현재 프로세스 RSS (Linux 외에는 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def _collect_process_metrics():
+    REGISTRY.gauge("news_auto_process_rss_bytes", "프로세스 RSS(바이트)").set(process_rss_bytes())
+
+REGISTRY.add_collector(_collect_process_metrics)
+
+def _setup_json_log():
+    if not JSON_LOG or logger.handlers:
+        return
+    handler = logging.StreamHandler() if JSON_LOG == "-" else logging.FileHandler(JSON_LOG, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_setup_json_log()
+
+def log_event(event: str, **fields):
+    """구조화 JSON 로그를 남깁니다. (NEWS_AUTO_JSON_LOG 미설정 시 기록하지 않음)"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    record = {"ts": round(time.time(), 3), "event": event}
+    record.update(fields)
+    logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+@contextmanager
+def stage_timer(stage: str, **fields):
+    """with 블록의 소요 시간을 단계별 히스토그램과 JSON 로그에 기록합니다."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        log_event("stage", stage=stage, seconds=round(elapsed, 6), **fields)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port: int = None, host: str = METRICS_HOST):
+    """
+    /metrics 엔드포인트를 백그라운드 스레드로 시작합니다. (프로세스당 한 번)
+    port를 지정하지 않으면 NEWS_AUTO_METRICS_PORT를 사용하며, 둘 다 없으면 시작하지 않습니다.
+    """
+    global _server
+    if port is None:
+        if not METRICS_PORT:
+            return None
+        port = int(METRICS_PORT)
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                # 같은 포트를 다른 워커 프로세스가 이미 사용 중인 경우
+                logger.warning("metrics 서버 시작 실패: %s", e)
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
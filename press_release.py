@@ -0,0 +1,199 @@
+"""
+webhook 응답 파싱과 보도자료 결과 타입 (PressRelease)
+"""
+import codecs
+import json
+import os
+from collections.abc import Mapping
+from html import escape
+
+# webhook 응답 본문 크기 상한 (바이트)
+WEBHOOK_MAX_RESPONSE_BYTES = int(os.environ.get("NEWS_AUTO_WEBHOOK_MAX_RESPONSE_BYTES", str(4 * 1024 * 1024)))
+READ_CHUNK_BYTES = 64 * 1024
+
+RESULT_FIELDS = ("title", "news_data", "check_data", "insta_data", "facebook_data", "blog_data")
+
+# 인스타/틱톡 글은 빈 줄 두 개로 포스팅을 구분
+SOCIAL_POST_SEPARATOR = "\n\n\n"
+# 미리보기에 표시할 포스팅 수
+PREVIEW_POST_COUNT = 2
+
+class ResponseTooLarge(ValueError):
+    """응답 본문이 크기 상한을 넘음"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"응답 본문이 너무 큽니다. (상한 {max_bytes:,}바이트)")
+        self.max_bytes = max_bytes
+
+class RequestCancelled(Exception):
+    """헤지 요청에서 다른 엔드포인트가 먼저 응답해 읽기를 중단할 때 사용합니다."""
+
+def _orjson():
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+_fast_json = _orjson()
+
+def json_loads(data):
+    """
+    str 또는 bytes JSON을 파싱합니다. (오류는 모두 ValueError)
+    bytes는 orjson이 있으면 디코딩 없이 바로 파싱하고, 이미 디코딩된 str은 표준 json으로 파싱합니다.
+    (한글이 많은 str은 orjson이 utf-8로 다시 인코딩해야 해서 표준 json보다 느림 - bench_render 참고)
+    """
+    if _fast_json is not None and isinstance(data, (bytes, bytearray, memoryview)):
+        return _fast_json.loads(data)
+    return json.loads(data)
+
+def check_content_length(response, max_bytes: int = WEBHOOK_MAX_RESPONSE_BYTES):
+    """Content-Length가 상한을 넘으면 본문을 읽기 전에 ResponseTooLarge를 발생시킵니다."""
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise ResponseTooLarge(max_bytes)
+
+def response_charset(response) -> str:
+    """
+    Content-Type에 명시된 charset을 반환합니다. 없거나 알 수 없는 값이면 utf-8
+    (requests는 charset 없는 text/*를 ISO-8859-1로 보므로 response.encoding은 쓰지 않음)
+    """
+    for param in response.headers.get("Content-Type", "").split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            charset = value.strip().strip("'\"")
+            try:
+                codecs.lookup(charset)
+            except LookupError:
+                break
+            return charset
+    return "utf-8"
+
+def read_limited_body(response, max_bytes: int = WEBHOOK_MAX_RESPONSE_BYTES, cancel_event=None) -> str:
+    """
+    stream=True로 받은 응답 본문을 상한까지만 읽어 문자열로 반환합니다.
+    Content-Type에 charset이 없으면 utf-8로 읽습니다. (requests의 인코딩 추측은 큰 본문에서 느림)
+    cancel_event가 설정되면 남은 본문을 읽지 않고 RequestCancelled를 발생시킵니다.
+    """
+    check_content_length(response, max_bytes)
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=READ_CHUNK_BYTES):
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled()
+        size += len(chunk)
+        if size > max_bytes:
+            raise ResponseTooLarge(max_bytes)
+        chunks.append(chunk)
+    return b"".join(chunks).decode(response_charset(response), errors="replace")
+
+def limit_stream(items, max_bytes: int = WEBHOOK_MAX_RESPONSE_BYTES):
+    """스트리밍 응답 조각(str/bytes)을 전달하면서 누적 크기가 상한을 넘으면 ResponseTooLarge를 발생시킵니다."""
+    size = 0
+    for item in items:
+        size += len(item.encode("utf-8")) if isinstance(item, str) else len(item)
+        if size > max_bytes:
+            raise ResponseTooLarge(max_bytes)
+        yield item
+
+class PressRelease(Mapping):
+    """
+    보도자료 생성 결과 (title, news_data, check_data, insta_data, facebook_data, blog_data)
+    기존 dict 결과와 같은 방식(data["title"], data.get(...), dict(data))으로 사용할 수 있습니다.
+    """
+    __slots__ = RESULT_FIELDS + ("_insta_posts", "_html")
+
+    def __init__(self, title: str = "", news_data: str = "", check_data: str = "", insta_data: str = "",
+                 facebook_data: str = "", blog_data: str = ""):
+        self.title = title
+        self.news_data = news_data
+        self.check_data = check_data
+        self.insta_data = insta_data
+        self.facebook_data = facebook_data
+        self.blog_data = blog_data
+        self._insta_posts = None
+        self._html = None
+
+    @classmethod
+    def from_mapping(cls, data: Mapping) -> "PressRelease":
+        """dict(기록, 폴백 템플릿, 캐시 결과 등)를 PressRelease로 바꿉니다. (이미 PressRelease면 그대로)"""
+        if isinstance(data, cls):
+            return data
+        return cls(*(str(data.get(field) or "") for field in RESULT_FIELDS))
+
+    def __getitem__(self, key: str) -> str:
+        if key not in RESULT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(RESULT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RESULT_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"PressRelease(title={self.title!r}, news_data={len(self.news_data)}자)"
+
+    def __reduce__(self):
+        # 캐시 필드 없이 필드 값만 전달 (프로세스 풀, pickle)
+        return self.__class__, tuple(getattr(self, field) for field in RESULT_FIELDS)
+
+    def copy(self) -> "PressRelease":
+        """같은 내용의 새 결과 (분리/이스케이프 결과는 공유)"""
+        other = self.__class__(*(getattr(self, field) for field in RESULT_FIELDS))
+        other._insta_posts = self._insta_posts
+        other._html = self._html
+        return other
+
+    def replace(self, **changes) -> "PressRelease":
+        """일부 필드만 바꾼 새 결과 (제목/본문 직접 수정용)"""
+        return self.__class__(*(str(changes.get(field, getattr(self, field))) for field in RESULT_FIELDS))
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in RESULT_FIELDS}
+
+    @property
+    def insta_posts(self) -> tuple:
+        """인스타/틱톡 글을 포스팅별로 나눈 결과"""
+        if self._insta_posts is None:
+            self._insta_posts = tuple(self.insta_data.strip().split(SOCIAL_POST_SEPARATOR)) if self.insta_data else ()
+        return self._insta_posts
+
+    @property
+    def html(self) -> dict:
+        """
+        화면 표시(unsafe_allow_html)에 넣을 HTML 이스케이프 결과
+        return: {"title", "news_data"(줄바꿈 → <br>), "insta_posts"(미리보기 수만큼), "facebook_data", "blog_data"}
+        """
+        if self._html is None:
+            self._html = {
+                "title": escape(self.title),
+                "news_data": escape(self.news_data).replace("\n", "<br>"),
+                "insta_posts": tuple(escape(post.strip()) for post in self.insta_posts[:PREVIEW_POST_COUNT]),
+                "facebook_data": escape(self.facebook_data.strip()),
+                "blog_data": escape(self.blog_data.strip()),
+            }
+        return self._html
+
+def parse_json_result(body) -> PressRelease:
+    """n8n JSON 응답({...} 또는 [{...}])을 PressRelease로 변환합니다."""
+    result = json_loads(body)
+    # 배열로 온 경우 첫 번째 항목 사용
+    if isinstance(result, list):
+        result = result[0]
+    if not isinstance(result, dict):
+        raise ValueError("JSON 응답이 객체가 아닙니다.")
+    return PressRelease(*(_field_text(result.get(field)) for field in RESULT_FIELDS))
+
+def parse_text_result(text: str) -> PressRelease:
+    """일반 텍스트 응답: 첫 줄을 제목, 나머지를 본문으로 사용합니다."""
+    title, _, body = text.strip().partition("\n")
+    return PressRelease(title.strip(), body.strip())
+
+def _field_text(value) -> str:
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        value = str(value)
+    return value.strip()
@@ -0,0 +1,195 @@
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+
+from html_output import should_minify
+from jinja_utils import generate_press_release_html, get_template_version, STYLE_MODE_CLASS, STYLE_MODE_INLINE
+from metrics import REGISTRY
+
+# 캐시 크기 제한 (항목 수 / 전체 바이트)
+RENDER_CACHE_MAX_ENTRIES = int(os.environ.get("NEWS_AUTO_RENDER_CACHE_ENTRIES", "256"))
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("NEWS_AUTO_RENDER_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# 다운로드 파일 캐시 크기 제한 (다운로드 요청 시에만 만들어 저장)
+DOWNLOAD_CACHE_MAX_ENTRIES = int(os.environ.get("NEWS_AUTO_DOWNLOAD_CACHE_ENTRIES", "128"))
+DOWNLOAD_CACHE_MAX_BYTES = int(os.environ.get("NEWS_AUTO_DOWNLOAD_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# 전체 다운로드(zip)에 넣는 항목: (파일 이름, generated_data 키)
+BUNDLE_TEXT_FILES = (
+    ("instagram.txt", "insta_data"),
+    ("facebook.txt", "facebook_data"),
+    ("check_data.md", "check_data"),
+)
+
+DOWNLOADS = REGISTRY.counter("news_auto_downloads_total", "다운로드 파일 생성 수 (kind별, 캐시 적중 제외)")
+
+def make_render_key(title: str, news_data: str, template_version: str = None) -> str:
+    """(제목, 본문, 템플릿 버전)의 해시로 렌더링 캐시 키를 만듭니다."""
+    if template_version is None:
+        template_version = get_template_version()
+    h = hashlib.sha256()
+    for part in (title, news_data, template_version):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+class RenderCache:
+    """크기 제한이 있는 LRU 렌더링 결과 캐시 (프로세스 내 모든 세션이 공유)."""
+
+    def __init__(self, max_entries: int = RENDER_CACHE_MAX_ENTRIES, max_bytes: int = RENDER_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: dict, size: int):
+        with self._lock:
+            if key in self._items:
+                self._total_bytes -= self._sizes[key]
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._sizes[key] = size
+            self._total_bytes += size
+            # 오래된 항목부터 제거
+            while self._items and (len(self._items) > self.max_entries or self._total_bytes > self.max_bytes):
+                old_key, _ = self._items.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+_render_cache = RenderCache()
+_download_cache = RenderCache(DOWNLOAD_CACHE_MAX_ENTRIES, DOWNLOAD_CACHE_MAX_BYTES)
+
+def get_render_cache() -> RenderCache:
+    """프로세스 공유 렌더링 캐시를 반환합니다."""
+    return _render_cache
+
+def _collect_metrics():
+    gauge = REGISTRY.gauge("news_auto_render_cache", "렌더링 캐시 통계 (entries/bytes/hits/misses)")
+    for name, value in _render_cache.stats().items():
+        gauge.set(value, stat=name)
+    gauge = REGISTRY.gauge("news_auto_download_cache", "다운로드 파일 캐시 통계 (entries/bytes/hits/misses)")
+    for name, value in _download_cache.stats().items():
+        gauge.set(value, stat=name)
+
+REGISTRY.add_collector(_collect_metrics)
+
+def _wrap_preview_html(rendered_html: str) -> str:
+    """미리보기 iframe용 HTML (좌측 정렬, 너비 확장)"""
+    return f"""
+                <div style="width: 100%; margin: 0; text-align: left;">
+                    <div style="margin: 0; min-width: 550px;">
+                        {rendered_html}
+                    </div>
+                </div>
+                """
+
+def get_render_artifacts(title: str, news_data: str) -> dict:
+    """
+    미리보기 HTML을 한 번만 만들어 캐시에서 재사용합니다.
+    다운로드 파일은 get_download_html/get_download_txt/get_download_bundle로 요청 시에만 만듭니다.
+    return: {"key", "preview_html"}
+    """
+    key = make_render_key(title, news_data)
+    artifacts = _render_cache.get(key)
+    if artifacts is not None:
+        return artifacts
+
+    # 미리보기 iframe은 <style> 블록을 쓰는 class 모드로 렌더링
+    # 제목/문단 일부만 고친 경우 바뀐 문단만 다시 변환
+    preview_html = generate_press_release_html(title=title, body_text=news_data, style_mode=STYLE_MODE_CLASS,
+                                               minify=should_minify("preview"), incremental=True)
+    artifacts = {
+        "key": key,
+        "preview_html": _wrap_preview_html(preview_html)
+    }
+    _render_cache.put(key, artifacts, len(artifacts["preview_html"]))
+    return artifacts
+
+def _cached_download(kind: str, key: str, build) -> bytes:
+    cache_key = f"{kind}:{key}"
+    data = _download_cache.get(cache_key)
+    if data is None:
+        data = build()
+        _download_cache.put(cache_key, data, len(data))
+        DOWNLOADS.inc(kind=kind)
+    return data
+
+def _render_download_html(title: str, news_data: str) -> bytes:
+    # 다운로드 파일은 메일 클라이언트 호환을 위해 inline 모드로 렌더링
+    return generate_press_release_html(title=title, body_text=news_data, style_mode=STYLE_MODE_INLINE,
+                                       minify=should_minify("download"), incremental=True).encode("utf-8")
+
+def _render_download_txt(title: str, news_data: str) -> bytes:
+    # 텍스트 파일에는 제목과 본문을 함께 포함
+    return f"{title}\n\n{news_data}".encode("utf-8")
+
+def get_download_html(title: str, news_data: str) -> bytes:
+    """다운로드용 HTML (inline 스타일)을 요청 시 만들어 캐시합니다."""
+    return _cached_download("html", make_render_key(title, news_data),
+                            lambda: _render_download_html(title, news_data))
+
+def get_download_txt(title: str, news_data: str) -> bytes:
+    """다운로드용 텍스트 (제목 + 본문)를 요청 시 만들어 캐시합니다."""
+    return _cached_download("txt", make_render_key(title, news_data),
+                            lambda: _render_download_txt(title, news_data))
+
+def get_download_text(text: str) -> bytes:
+    """SNS/블로그 글 등 단순 텍스트 다운로드 파일을 요청 시 만들어 캐시합니다."""
+    return _cached_download("text", hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                            lambda: text.strip().encode("utf-8"))
+
+def make_bundle_key(generated_data: dict) -> str:
+    """전체 다운로드에 들어가는 모든 내용과 템플릿 버전의 해시"""
+    h = hashlib.sha256()
+    for field in ("title", "news_data", "blog_data") + tuple(field for _, field in BUNDLE_TEXT_FILES):
+        h.update((generated_data.get(field) or "").encode("utf-8"))
+        h.update(b"\0")
+    h.update(get_template_version().encode("utf-8"))
+    return h.hexdigest()
+
+def _build_bundle(generated_data: dict) -> bytes:
+    title = generated_data["title"]
+    news_data = generated_data["news_data"]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("press_release.html", _render_download_html(title, news_data))
+        bundle.writestr("press_release.txt", _render_download_txt(title, news_data))
+        for file_name, field in BUNDLE_TEXT_FILES:
+            if generated_data.get(field):
+                bundle.writestr(file_name, generated_data[field].strip())
+        if generated_data.get("blog_data"):
+            # 블로그 글은 미리보기와 같이 제목을 맨 위에 포함
+            bundle.writestr("blog.txt", f"{title}\n\n{generated_data['blog_data'].strip()}")
+    return buffer.getvalue()
+
+def get_download_bundle(generated_data: dict) -> bytes:
+    """
+    HTML, TXT, 인스타/페이스북/블로그 글, 검증 결과를 zip 하나로 묶어 반환합니다.
+    한 번에 만들고 내용 해시로 캐시하므로 같은 결과를 여러 번 받아도 다시 만들지 않습니다.
+    """
+    return _cached_download("bundle", make_bundle_key(generated_data), lambda: _build_bundle(generated_data))
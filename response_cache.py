@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import REGISTRY
+
+# 응답 캐시 설정 (환경변수로 조정 가능)
+RESPONSE_CACHE_TTL = float(os.environ.get("NEWS_AUTO_RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("NEWS_AUTO_RESPONSE_CACHE_ENTRIES", "512"))
+# 디스크 캐시 폴더 (지정 시 재시작 후에도 유지)
+RESPONSE_CACHE_DIR = os.environ.get("NEWS_AUTO_RESPONSE_CACHE_DIR", "")
+# 디스크 캐시 최대 파일 수 (넘으면 오래된 파일부터 삭제)
+RESPONSE_CACHE_DISK_MAX_ENTRIES = int(os.environ.get("NEWS_AUTO_RESPONSE_CACHE_DISK_ENTRIES", "4096"))
+# 디스크 캐시 정리 주기(초) - 저장할 때 함께 확인
+DISK_SWEEP_INTERVAL = 60.0
+
+def make_form_key(form_data: dict) -> str:
+    """정리된 form_data의 정규화된(JSON, 키 정렬) 해시를 캐시 키로 사용합니다."""
+    canonical = json.dumps(form_data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    AI 생성 결과 캐시 (TTL + LRU)
+    - 메모리 계층: 프로세스 내 모든 세션이 공유
+    - 디스크 계층(선택): 키별 JSON 파일, 재시작 후에도 유지
+      (주기적으로 만료된 파일을 지우고, disk_max_entries를 넘으면 오래된 파일부터 삭제)
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 cache_dir: str = RESPONSE_CACHE_DIR, disk_max_entries: int = RESPONSE_CACHE_DISK_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.disk_max_entries = disk_max_entries
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._items = OrderedDict()  # key -> (저장 시각, 결과)
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.disk_evicted = 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str):
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+            return None
+        return entry.get("stored_at"), entry.get("result")
+
+    def _write_disk(self, key: str, stored_at: float, result: dict):
+        # 임시 파일에 쓴 뒤 교체 (다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": stored_at, "result": result}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def purge_disk(self) -> int:
+        """
+        디스크 캐시에서 만료된 파일을 지우고, 파일 수가 disk_max_entries를 넘으면 오래된 파일부터 지웁니다.
+        return: 지운 파일 수
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+        cutoff = time.time() - self.ttl
+        files = []
+        removed = 0
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+                # 만료된 캐시 파일과 쓰다 남은 임시 파일 삭제
+                if (name.endswith(".json") or name.endswith(".tmp")) and mtime < cutoff:
+                    os.remove(path)
+                    removed += 1
+                elif name.endswith(".json"):
+                    files.append((mtime, path))
+            except OSError:
+                pass
+        if len(files) > self.disk_max_entries:
+            files.sort()
+            for _, path in files[:len(files) - self.disk_max_entries]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        with self._lock:
+            self.disk_evicted += removed
+        return removed
+
+    def get(self, key: str):
+        """캐시된 결과를 반환합니다. 없거나 만료된 경우 None"""
+        now = time.time()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._items.move_to_end(key)
+                    self.memory_hits += 1
+                    return dict(entry[1])
+                del self._items[key]
+
+        if self.cache_dir:
+            entry = self._read_disk(key)
+            if entry is not None and entry[1]:
+                with self._lock:
+                    self._put_memory(key, entry[0], entry[1])
+                    self.disk_hits += 1
+                return dict(entry[1])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put_memory(self, key: str, stored_at: float, result: dict):
+        self._items[key] = (stored_at, dict(result))
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def put(self, key: str, result: dict):
+        result = dict(result)  # PressRelease 등 Mapping도 JSON으로 저장할 수 있도록
+        stored_at = time.time()
+        with self._lock:
+            self._put_memory(key, stored_at, result)
+        if self.cache_dir:
+            self._write_disk(key, stored_at, result)
+            with self._lock:
+                sweep = stored_at - self._last_sweep >= DISK_SWEEP_INTERVAL
+                if sweep:
+                    self._last_sweep = stored_at
+            if sweep:
+                self.purge_disk()
+
+    def record_bypass(self):
+        """'새로 생성'으로 캐시를 건너뛴 횟수를 기록합니다."""
+        with self._lock:
+            self.bypasses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "entries": len(self._items),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "disk_evicted": self.disk_evicted,
+                "hit_rate": hits / total if total else 0.0
+            }
+
+_response_cache = ResponseCache()
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 공유 응답 캐시를 반환합니다."""
+    return _response_cache
+
+def _collect_metrics():
+    gauge = REGISTRY.gauge("news_auto_response_cache", "응답 캐시 통계 (entries/hits/misses/bypasses)")
+    for name, value in _response_cache.stats().items():
+        gauge.set(value, stat=name)
+
+REGISTRY.add_collector(_collect_metrics)
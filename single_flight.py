@@ -0,0 +1,121 @@
+"""
+같은 키의 동시 요청 합치기 (single-flight)
+
+같은 입력으로 동시에 들어온 생성 요청 중 첫 요청(leader)만 실제로 실행하고,
+실행 중에 들어온 요청(follower)은 그 결과(또는 예외)를 함께 받습니다.
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from metrics import REGISTRY
+
+# 동시 요청 합치기 사용 여부
+COALESCE_ENABLED = os.environ.get("NEWS_AUTO_COALESCE", "1") == "1"
+# follower가 leader 결과를 기다리는 최대 시간(초)
+# 기본값은 webhook 읽기 타임아웃(30초) x 재시도 포함 3회 + 여유
+COALESCE_WAIT_TIMEOUT = float(os.environ.get("NEWS_AUTO_COALESCE_WAIT_TIMEOUT", "100"))
+# follower가 leader의 스트리밍 진행 상황을 확인하는 간격(초)
+COALESCE_PROGRESS_INTERVAL = 0.1
+
+COALESCED = REGISTRY.counter("news_auto_coalesced_total", "동시 요청 합치기 결과 (role=leader|follower|timeout)")
+
+class SingleFlightTimeout(Exception):
+    """follower가 제한 시간 안에 leader 결과를 받지 못함"""
+
+class _Flight:
+    def __init__(self):
+        self.future = Future()
+        self.followers = 0
+        self.progress = None  # leader가 마지막으로 전달한 진행 상황
+
+class SingleFlight:
+    """키별 실행 중 요청 목록 (프로세스 내 모든 세션과 작업 스레드가 공유)"""
+
+    def __init__(self, name: str = "generation", wait_timeout: float = None, enabled: bool = COALESCE_ENABLED):
+        self.name = name
+        self.enabled = enabled
+        self.wait_timeout = wait_timeout if wait_timeout is not None else COALESCE_WAIT_TIMEOUT
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func, on_progress=None, wait_timeout: float = None) -> tuple:
+        """
+        key로 실행 중인 요청이 있으면 그 결과를 기다리고, 없으면 func(진행 상황 전달 함수)를 실행합니다.
+        follower에게도 leader의 진행 상황을 follower 자신의 스레드에서 on_progress로 전달합니다.
+        (작업 스레드별 상태를 쓰는 콜백도 그대로 동작)
+        return: (결과, 다른 요청의 결과를 받았는지 여부)
+        """
+        if not self.enabled:
+            return func(on_progress), False
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.followers += 1
+
+        if not leader:
+            COALESCED.inc(flight=self.name, role="follower")
+            return self._wait(flight, on_progress, wait_timeout), True
+
+        COALESCED.inc(flight=self.name, role="leader")
+
+        def publish(value):
+            flight.progress = value
+            if on_progress is not None:
+                on_progress(value)
+
+        try:
+            result = func(publish)
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def _wait(self, flight: _Flight, on_progress, wait_timeout: float = None):
+        if wait_timeout is None:
+            wait_timeout = self.wait_timeout
+        deadline = time.monotonic() + wait_timeout
+        interval = COALESCE_PROGRESS_INTERVAL if on_progress is not None else None
+        sent = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                COALESCED.inc(flight=self.name, role="timeout")
+                raise SingleFlightTimeout(f"동일한 요청의 결과를 {wait_timeout:.0f}초 안에 받지 못했습니다.")
+            try:
+                return flight.future.result(timeout=min(interval, remaining) if interval else remaining)
+            except FutureTimeoutError:
+                progress = flight.progress
+                if on_progress is not None and progress is not None and progress is not sent:
+                    sent = progress
+                    on_progress(progress)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def waiting(self) -> int:
+        with self._lock:
+            return sum(flight.followers for flight in self._flights.values())
+
+_generation_flight = SingleFlight()
+
+def get_generation_flight() -> SingleFlight:
+    """프로세스 공유 생성 요청 single-flight를 반환합니다."""
+    return _generation_flight
+
+def _collect_metrics():
+    REGISTRY.gauge("news_auto_in_flight_generations", "실행 중인 webhook 생성 요청 수 (합쳐진 요청 제외)").set(
+        _generation_flight.in_flight())
+
+REGISTRY.add_collector(_collect_metrics)
@@ -0,0 +1,223 @@
+"""
+추측 생성 (speculative pre-generation)
+
+필수 항목이 채워지고 입력이 debounce 시간 동안 바뀌지 않으면 제출 전에 백그라운드에서 생성을 시작합니다.
+같은 입력으로 제출하면 응답 캐시와 동시 요청 합치기(NEWS_AUTO_COALESCE)를 통해 그 결과를 이어받습니다.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from generation import generate_press_release, sanitize_form_data
+from metrics import REGISTRY, STAGE_SECONDS
+from response_cache import make_form_key
+
+# 추측 생성 사용 여부 (기본 끔 - 켜면 입력 폼이 st.form 밖에 표시되어 입력할 때마다 rerun됨)
+SPECULATIVE_ENABLED = os.environ.get("NEWS_AUTO_SPECULATIVE", "0") == "1"
+# 입력이 이 시간(초) 동안 바뀌지 않으면 추측 생성 시작
+SPECULATIVE_DEBOUNCE = float(os.environ.get("NEWS_AUTO_SPECULATIVE_DEBOUNCE", "3"))
+# 세션별로 제출로 이어지지 않아도 되는 추측 생성 수 (SPECULATIVE_BUDGET_WINDOW초 기준)
+SPECULATIVE_BUDGET = int(os.environ.get("NEWS_AUTO_SPECULATIVE_BUDGET", "3"))
+SPECULATIVE_BUDGET_WINDOW = float(os.environ.get("NEWS_AUTO_SPECULATIVE_BUDGET_WINDOW", "3600"))
+# 추측 생성 동시 실행 수 (전역)
+SPECULATIVE_WORKERS = int(os.environ.get("NEWS_AUTO_SPECULATIVE_WORKERS", "2"))
+
+SPECULATIONS = REGISTRY.counter(
+    "news_auto_speculative_total",
+    "추측 생성 (result=started|skipped_budget|hit_inflight|hit_done|miss|wasted|cancelled)"
+)
+
+class _Speculation:
+    def __init__(self, key: str, form_data: dict):
+        self.key = key
+        self.form_data = form_data
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.adopted = False
+        self.future = None
+
+class _SessionState:
+    def __init__(self):
+        self.observed_key = None   # 마지막으로 본 입력
+        self.due_at = None         # 추측 생성 예정 시각 (debounce)
+        self.form_data = None
+        self.current = None        # 마지막으로 시작한 추측 생성
+        self.wasted = deque()      # 제출로 이어지지 않은 추측 생성 시각 (예산 계산용)
+        self.last_seen = time.monotonic()
+
+class SpeculativeGenerator:
+    """세션별 입력을 지켜보다가 debounce 뒤 추측 생성을 시작하고, 제출 시 결과를 이어받습니다."""
+
+    def __init__(self, enabled: bool = SPECULATIVE_ENABLED, debounce: float = SPECULATIVE_DEBOUNCE,
+                 budget: int = SPECULATIVE_BUDGET, budget_window: float = SPECULATIVE_BUDGET_WINDOW,
+                 max_workers: int = SPECULATIVE_WORKERS):
+        self.enabled = enabled
+        self.debounce = debounce
+        self.budget = budget
+        self.budget_window = budget_window
+        self.max_workers = max_workers
+        self._sessions = {}
+        self._cond = threading.Condition()
+        self._executor = None
+        self._scheduler = None
+        self.running = 0
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+
+    def observe(self, session_id: str, form_data: dict = None):
+        """
+        rerun마다 현재 입력을 알려줍니다. (필수 항목이 비어 있거나 '새로 생성'이면 None)
+        입력이 바뀌면 debounce를 다시 시작합니다.
+        """
+        if not self.enabled:
+            return
+        key = make_form_key(sanitize_form_data(dict(form_data))) if form_data else None
+        with self._cond:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = _SessionState()
+            state.last_seen = time.monotonic()
+            if key == state.observed_key:
+                return
+            state.observed_key = key
+            state.form_data = dict(form_data) if form_data else None
+            state.due_at = time.monotonic() + self.debounce if key else None
+            if key:
+                self._ensure_scheduler()
+                self._cond.notify()
+
+    def claim(self, session_id: str, form_data: dict) -> bool:
+        """
+        제출 시 호출합니다. 같은 입력의 추측 생성이 있으면 True (이후 generate_press_release가 그 결과를 이어받음)
+        추측 생성과 다른 입력으로 제출하면 그 추측 생성은 낭비로 계산합니다.
+        """
+        if not self.enabled:
+            return False
+        key = make_form_key(sanitize_form_data(dict(form_data)))
+        with self._cond:
+            state = self._sessions.get(session_id)
+            speculation = state.current if state is not None else None
+            if state is not None:
+                # 제출했으므로 아직 시작하지 않은 추측 생성은 취소
+                state.due_at = None
+                state.observed_key = key
+            if speculation is None or speculation.adopted:
+                self.misses += 1
+                SPECULATIONS.inc(result="miss")
+                return False
+            if speculation.key != key:
+                self._waste(state)
+                self.misses += 1
+                SPECULATIONS.inc(result="miss")
+                return False
+            speculation.adopted = True
+            self.hits += 1
+            done = speculation.finished_at is not None
+            # 추측 생성 덕분에 앞당긴 시간 (끝났으면 생성에 걸린 시간 전체)
+            head_start = (speculation.finished_at if done else time.monotonic()) - speculation.started_at
+        SPECULATIONS.inc(result="hit_done" if done else "hit_inflight")
+        STAGE_SECONDS.observe(head_start, stage="speculative_head_start")
+        return True
+
+    def _waste(self, state: _SessionState):
+        # 잠금을 잡은 상태에서 호출 - 아직 시작하지 않았으면 취소 (n8n 호출 없음, 예산에서도 빼지 않음)
+        speculation = state.current
+        state.current = None
+        if speculation is None or speculation.adopted:
+            return
+        if speculation.future is not None and speculation.future.cancel():
+            self.running -= 1
+            SPECULATIONS.inc(result="cancelled")
+            return
+        state.wasted.append(time.monotonic())
+        self.wasted += 1
+        SPECULATIONS.inc(result="wasted")
+
+    def _ensure_scheduler(self):
+        # 잠금을 잡은 상태에서 호출
+        if self._scheduler is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="speculative")
+            self._scheduler = threading.Thread(target=self._schedule_loop, name="speculative-scheduler", daemon=True)
+            self._scheduler.start()
+
+    def _schedule_loop(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for state in list(self._sessions.values()):
+                    if state.due_at is not None and state.due_at <= now and self.running < self.max_workers:
+                        state.due_at = None
+                        self._start(state)
+                self._purge(now)
+                # 기한이 지났지만 워커가 모두 바쁜 세션은 추측 생성이 끝날 때(notify)까지 대기
+                waits = [state.due_at - now for state in self._sessions.values()
+                         if state.due_at is not None and state.due_at > now]
+                self._cond.wait(timeout=min(waits) if waits else None)
+
+    def _start(self, state: _SessionState):
+        # 잠금을 잡은 상태에서 호출
+        key = state.observed_key
+        if state.current is not None and state.current.key == key:
+            return
+        now = time.monotonic()
+        while state.wasted and now - state.wasted[0] > self.budget_window:
+            state.wasted.popleft()
+        # 이전 추측 생성은 입력이 바뀌어 쓰이지 않음
+        if state.current is not None and not state.current.adopted:
+            self._waste(state)
+        if len(state.wasted) >= self.budget:
+            SPECULATIONS.inc(result="skipped_budget")
+            return
+        speculation = state.current = _Speculation(key, state.form_data)
+        self.started += 1
+        self.running += 1
+        SPECULATIONS.inc(result="started")
+        speculation.future = self._executor.submit(self._run, speculation)
+
+    def _run(self, speculation: _Speculation):
+        try:
+            generate_press_release(dict(speculation.form_data))
+        finally:
+            with self._cond:
+                speculation.finished_at = time.monotonic()
+                self.running -= 1
+                # 워커가 비었으므로 기다리던 세션의 추측 생성을 시작할 수 있음
+                self._cond.notify()
+
+    def _purge(self, now: float):
+        # 잠금을 잡은 상태에서 호출 - 예산 기간 동안 rerun이 없는 세션 정리
+        for session_id in [session_id for session_id, state in self._sessions.items()
+                           if now - state.last_seen > self.budget_window and state.due_at is None]:
+            self._waste(self._sessions.pop(session_id))
+
+    def stats(self) -> dict:
+        with self._cond:
+            claimed = self.hits + self.misses
+            return {
+                "sessions": len(self._sessions),
+                "pending": sum(1 for state in self._sessions.values() if state.due_at is not None),
+                "running": self.running,
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "wasted": self.wasted,
+                "hit_rate": self.hits / claimed if claimed else 0.0,
+                "waste_rate": self.wasted / self.started if self.started else 0.0
+            }
+
+_speculator = SpeculativeGenerator()
+
+def get_speculator() -> SpeculativeGenerator:
+    """프로세스 공유 추측 생성기를 반환합니다."""
+    return _speculator
+
+def _collect_metrics():
+    gauge = REGISTRY.gauge("news_auto_speculative", "추측 생성 통계 (pending/running/hit_rate/waste_rate 등)")
+    for name, value in _speculator.stats().items():
+        gauge.set(value, stat=name)
+
+REGISTRY.add_collector(_collect_metrics)
@@ -1,166 +1,239 @@
 import streamlit as st
-from jinja_utils import generate_press_release_html
-import requests
-import json
-
-# WEBHOOK URL
-## WEBHOOK_URL = "http://203.239.132.7:5678/webhook/3ccfd480-71e7-4d1e-b264-69a651180350"
-## WEBHOOK_URL2 = "https://geniefy.app.n8n.cloud/webhook/3ccfd480-71e7-4d1e-b264-69a651180350"
+import os
+import re
+import threading
+import time
+import uuid
+from http_client import get_http_session
+from jinja_utils import generate_press_release_html, get_template, STYLE_MODE_CLASS
+from render_cache import (
+    get_download_bundle,
+    get_download_html,
+    get_download_text,
+    get_download_txt,
+    get_render_artifacts,
+)
+from metrics import IFRAME_BYTES, start_metrics_server, stage_timer
+from generation import (
+    WEBHOOK_URL,
+    ERROR_HTTP,
+    ERROR_PARSE,
+    ERROR_REQUEST,
+    ERROR_CIRCUIT_OPEN,
+    ERROR_COALESCE_TIMEOUT,
+    ERROR_TOO_LARGE,
+    cache_selected_result,
+    generate_press_release,
+    generate_fallback_template,
+    get_required_fields,
+    sanitize_form_data,
+)
+from generation_jobs import (
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_FAILED,
+    QueueFullError,
+    get_job_manager,
+    report_progress,
+)
+from history_store import get_history_store, history_enabled, save_generation
+from artifact_store import KIND_FORM, KIND_RESULT, get_artifact_store
+from speculative import get_speculator
 
 # 디버깅 모드 플래그
 DEBUG_MODE = False  # 임시로 True로 설정
 
-def get_ai_generated_text(form_data: dict) -> dict:
-    """n8n webhook을 통해 AI 생성된 보도자료 텍스트를 받아옵니다."""
-    # 입력 데이터에서 마크다운 볼드 표시와 헤더 표시 제거
-    for key in form_data:
-        if isinstance(form_data[key], str):
-            form_data[key] = form_data[key].replace('**', '').replace('#', '')
-    
-    webhook_url = "http://203.239.132.7:5678/webhook/3ccfd480-71e7-4d1e-b264-69a651180350"
-    
-    try:
-        # webhook으로 데이터 전송
-        with st.spinner("AI가 보도자료를 생성하고 있습니다..."):
-            response = requests.post(webhook_url, json=form_data, timeout=30)
-        
-        if response.status_code == 200:
-            if DEBUG_MODE:
-                st.write("### 디버깅: 서버 응답 정보")
-                st.write(f"Status Code: {response.status_code}")
-                st.write(f"Content-Type: {response.headers.get('Content-Type', 'Not specified')}")
-                st.write("Response Text:")
-                st.code(response.text)
-            
-            # Content-Type 확인
-            content_type = response.headers.get('Content-Type', '')
-            
-            try:
-                if 'application/json' in content_type:
-                    # JSON 응답 처리
-                    result = response.json()
-                    if DEBUG_MODE:
-                        st.write("### 디버깅: 파싱된 JSON 데이터")
-                        st.json(result)
-                    
-                    # 배열로 온 경우 첫 번째 항목 사용
-                    if isinstance(result, list):
-                        result = result[0]
-                    
-                    title = result.get("title", "").strip()
-                    news_data = result.get("news_data", "").strip()
-                    check_data = result.get("check_data", "").strip()
-                    insta_data = result.get("insta_data", "").strip()
-                    facebook_data = result.get("facebook_data", "").strip()
-                    blog_data = result.get("blog_data", "").strip()  # 블로그 데이터 추가
-                else:
-                    # 일반 텍스트 응답 처리
-                    response_text = response.text.strip()
-                    
-                    # 응답 텍스트에서 첫 줄을 제목으로 사용
-                    lines = response_text.split('\n')
-                    title = lines[0].strip()
-                    news_data = '\n'.join(lines[1:]).strip() if len(lines) > 1 else ""
-                    check_data = ""
-                    insta_data = ""
-                    facebook_data = ""
-                    blog_data = ""  # 블로그 데이터 빈 값으로 초기화
-                
-                st.success("보도자료가 성공적으로 생성되었습니다!")
-                
-                # 필수 필드 검증
-                if not title or not news_data:
-                    if DEBUG_MODE:
-                        st.error("### 디버깅: 필수 필드 누락")
-                        st.write(f"title 존재: {bool(title)}")
-                        st.write(f"news_data 존재: {bool(news_data)}")
-                    
-                    # 폴백: 기본 템플릿 사용
-                    return generate_fallback_template(form_data)
-                
-                return {
-                    "title": title,
-                    "news_data": news_data,
-                    "check_data": check_data,
-                    "insta_data": insta_data,
-                    "facebook_data": facebook_data,
-                    "blog_data": blog_data  # 블로그 데이터 추가
-                }
-                
-            except (json.JSONDecodeError, ValueError) as e:
-                if DEBUG_MODE:
-                    st.error(f"### 디버깅: 응답 처리 오류")
-                    st.write(f"Error type: {type(e).__name__}")
-                    st.write(f"Error message: {str(e)}")
-                    st.write("Raw response:")
-                    st.code(response.text)
-                st.error("서버 응답을 처리하는 중 오류가 발생했습니다.")
-                # 폴백: 기본 템플릿 사용
-                return generate_fallback_template(form_data)
-        else:
-            if DEBUG_MODE:
-                st.error(f"### 디버깅: HTTP 오류")
-                st.write(f"Status code: {response.status_code}")
-                st.write(f"Response text: {response.text}")
-            st.error(f"서버 오류: {response.status_code}")
-            # 폴백: 기본 템플릿 사용
-            return generate_fallback_template(form_data)
-            
-    except requests.exceptions.RequestException as e:
-        if DEBUG_MODE:
-            st.error("### 디버깅: 요청 오류")
-            st.write(f"Error type: {type(e).__name__}")
-            st.write(f"Error message: {str(e)}")
-        st.error(f"Webhook 호출 중 오류가 발생했습니다: {str(e)}")
-        st.error("n8n 서버 연결을 확인해주세요 (http://203.239.132.7:5678)")
-        # 폴백: 기본 템플릿 사용
-        return generate_fallback_template(form_data)
+# 한 번에 생성할 수 있는 후보 수 상한 (후보들은 작업 관리자의 전체 동시 실행 상한 안에서 함께 실행)
+MAX_CANDIDATES = 4
 
-def generate_fallback_template(form_data: dict) -> dict:
-    """폴백: 기본 템플릿을 생성합니다."""
-    if form_data["보도자료_유형"] == "제품 출시/리뷰 보도자료":
-        generated_text = f"""{form_data['도입부']}은(는) {form_data['출시일']}에 {form_data['제품명']}을(를) 출시한다고 발표했습니다.
+# 작업 상태 확인 주기(초) - 스트리밍 미리보기 갱신 주기이기도 함
+JOB_POLL_INTERVAL = 0.5
 
-{form_data['제품명']}은(는) {form_data['제품 카테고리']} 제품으로, {form_data['주요 타깃']}을 위해 개발되었습니다.
+# 첫 화면 표시 후 백그라운드에서 requests/jinja2를 미리 불러올지 여부 ("0"이면 첫 사용 시 불러옴)
+PREWARM_RESOURCES = os.environ.get("NEWS_AUTO_PREWARM", "1") != "0"
 
-{form_data['주요 특징(세일즈 포인트)']}
+# 전체 페이지 스타일
+PAGE_CSS = """
+/* 상단 여백 줄이기 */
+.block-container {
+    padding-top: 1rem;
+    padding-bottom: 0rem;
+}
+/* 제목 여백 조정 */
+.stTitle {
+    margin-top: -2rem;
+}
+/* 기존 스타일 유지 */
+.main > div {
+    padding-left: 8rem;
+    padding-right: 8rem;
+    margin: 0 auto;
+}
+/* Streamlit 기본 요소 숨기기 */
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+header {visibility: hidden;}
+"""
 
-디자인 측면에서는 {form_data['주요 특징(디자인)']}
+# 결과 영역(탭/미리보기/인스타그램 포스팅) 스타일
+RESULT_CSS = """
+.stTabs [data-baseweb="tab-panel"] {
+    padding: 0.5rem;
+}
+.stMarkdown {
+    padding: 0;
+}
+/* HTML 미리보기 컨테이너가 부모 너비에 맞게 조정되도록 */
+iframe {
+    width: 100% !important;
+}
+/* td 요소의 너비를 늘림 */
+td[width="550"] {
+    width: 800px !important;
+}
+/* 테이블 자체의 너비도 조정 */
+table {
+    width: 100% !important;
+}
+/* 인스타그램 포스팅 스타일 */
+.instagram-post {
+    background: white;
+    border: 1px solid #dbdbdb;
+    border-radius: 8px;
+    padding: 20px;
+    margin: 10px 0;
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+}
+.instagram-post pre {
+    white-space: pre-wrap;
+    font-family: inherit;
+    margin: 0;
+    padding: 10px;
+}
+/* 서브헤더 여백 조정 */
+.stTabs + div > .stMarkdown > h3 {
+    margin-top: 0.5rem;
+    margin-bottom: 0.5rem;
+}
+"""
 
-제품의 주요 스펙으로는 {form_data['세부 스펙 및 성능']}
+def _style_block(css: str) -> str:
+    """주석과 공백을 정리해 <style> 블록으로 만듭니다."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
 
-{form_data['가격 및 판매 정보']}
+@st.cache_resource(show_spinner=False)
+def get_page_styles() -> dict:
+    """페이지/결과 영역 <style> 블록 (프로세스당 한 번 생성, 모든 세션과 rerun에서 재사용)"""
+    return {"page": _style_block(PAGE_CSS), "result": _style_block(RESULT_CSS)}
 
-{form_data['맺음말']}"""
-    else:
-        generated_text = f"""{form_data['도입부']}은(는) {form_data['행사명']}을(를) 진행한다고 발표했습니다.
+def _prewarm():
+    get_http_session()
+    get_template()  # 템플릿 컴파일까지 미리 수행
 
-행사 기간: {form_data['행사기간']}
+@st.cache_resource(show_spinner=False)
+def start_prewarm():
+    """첫 화면을 그린 뒤 무거운 모듈/템플릿을 백그라운드에서 한 번 준비합니다. (프로세스당 한 번)"""
+    thread = threading.Thread(target=_prewarm, name="news-auto-prewarm", daemon=True)
+    thread.start()
+    return thread
 
-{form_data['행사내용']}
+def show_generation_messages(outcome: dict):
+    """생성 결과에 맞는 안내/오류 메시지를 표시합니다."""
+    if DEBUG_MODE:
+        st.write("### 디버깅: 서버 응답 정보")
+        st.write(f"Status Code: {outcome['status_code']}")
+        st.write(f"Content-Type: {outcome['content_type'] or 'Not specified'}")
+        st.write(f"Error: {outcome['error']} {outcome['error_message']}")
+        st.write("Response Text:")
+        st.code(outcome.get("response_text", ""))
+    
+    if outcome.get("cached"):
+        st.success("동일한 입력으로 생성된 보도자료를 불러왔습니다.")
+    elif outcome["error"] == ERROR_REQUEST:
+        st.error(f"Webhook 호출 중 오류가 발생했습니다: {outcome['error_message']}")
+        st.error(f"n8n 서버 연결을 확인해주세요 ({WEBHOOK_URL.split('/webhook')[0]})")
+    elif outcome["error"] in (ERROR_CIRCUIT_OPEN, ERROR_COALESCE_TIMEOUT):
+        st.warning(f"{outcome['error_message']} 기본 템플릿으로 보도자료를 만들었습니다.")
+    elif outcome["error"] in (ERROR_HTTP, ERROR_TOO_LARGE):
+        st.error(outcome["error_message"])
+    elif outcome["error"] == ERROR_PARSE:
+        st.error("서버 응답을 처리하는 중 오류가 발생했습니다.")
+    elif outcome.get("coalesced"):
+        st.success("같은 입력으로 진행 중이던 생성 결과를 함께 받았습니다.")
+    else:
+        st.success("보도자료가 성공적으로 생성되었습니다!")
 
-{form_data['대상 제품']}
+def get_ai_generated_text(form_data: dict, force_regenerate: bool = False) -> dict:
+    """
+    n8n webhook을 통해 AI 생성된 보도자료 텍스트를 받아옵니다. (스크립트 스레드에서 바로 실행)
+    같은 입력의 결과는 응답 캐시에서 재사용하며, force_regenerate=True면 캐시를 건너뜁니다.
+    """
+    with st.spinner("AI가 보도자료를 생성하고 있습니다..."):
+        outcome = generate_press_release(form_data, force_regenerate)
+    show_generation_messages(outcome)
+    return outcome["data"]
 
-유의사항:
-{form_data['유의사항']}
+def get_session_id() -> str:
+    """작업 대기열에서 세션을 구분하는 id를 반환합니다."""
+    if "session_id" not in st.session_state:
+        st.session_state["session_id"] = uuid.uuid4().hex
+    return st.session_state["session_id"]
 
-{form_data['맺음말']}"""
+def _session_outcome(outcome: dict) -> dict:
+    """세션에 보관할 생성 결과 정보 (결과 내용과 응답 원문은 빼고 안내 메시지용 정보만)"""
+    return {key: value for key, value in outcome.items() if key not in ("data", "response_text")}
 
-    generated_text += """
+def set_current_result(generated_data, form_data: dict, history_id: int = None, fallback: bool = False):
+    """
+    현재 결과를 공유 저장소에 넣고 세션에는 ref만 보관합니다.
+    history_id: 저장소에서 내려간 결과를 다시 불러올 기록 id
+    fallback: 기본 템플릿 결과 여부 (직접 고친 결과를 기록에 저장할 때 사용)
+    """
+    store = get_artifact_store()
+    st.session_state["result_ref"] = store.put(generated_data, KIND_RESULT)
+    st.session_state["form_ref"] = store.put(form_data, KIND_FORM)
+    st.session_state["history_id"] = history_id
+    st.session_state["result_fallback"] = fallback
 
-이와 관련한 보도자료를 송부하며, 제품에 대한 추가 자료 요청이나 문의는
-아래 연락처로 부탁 드립니다.
+def clear_current_result():
+    for key in ("result_ref", "form_ref", "history_id", "result_fallback"):
+        st.session_state.pop(key, None)
 
-감사합니다."""
+def get_current_result() -> tuple:
+    """
+    세션의 ref로 현재 결과를 가져옵니다. return: (generated_data 또는 None, form_data)
+    rerun마다 세션이 보고 있는 ref를 저장소에 알려 idle 세션 정리 기준으로 사용하고,
+    저장소에서 내려간 결과는 기록에서 다시 불러옵니다. (기록도 없으면 결과를 비움)
+    """
+    store = get_artifact_store()
+    refs = [st.session_state.get("result_ref"), st.session_state.get("form_ref")]
+    for candidate in st.session_state.get("candidates") or []:
+        refs += [candidate["result_ref"], candidate["form_ref"]]
+    missing = store.touch_session(get_session_id(), refs)
+    if missing and st.session_state.get("candidates"):
+        st.session_state["candidates"] = [candidate for candidate in st.session_state["candidates"]
+                                          if candidate["result_ref"] not in missing]
     
-    return {
-        "title": form_data["제목"],
-        "news_data": generated_text,
-        "check_data": "",
-        "insta_data": "",
-        "facebook_data": "",
-        "blog_data": ""
-    }
+    result_ref = st.session_state.get("result_ref")
+    if not result_ref:
+        return None, {}
+    if result_ref in missing:
+        history_store = get_history_store()
+        history_id = st.session_state.get("history_id")
+        record = history_store.get(history_id) if history_store is not None and history_id else None
+        if record is None:
+            clear_current_result()
+            if history_store is None:
+                st.info("오래 사용하지 않아 이전 결과를 비웠습니다.")
+            else:
+                st.info("오래 사용하지 않아 이전 결과를 비웠습니다. 이전에 생성한 보도자료 목록에서 다시 열 수 있습니다.")
+            return None, {}
+        set_current_result(record["generated_data"], record["form_data"], history_id, record["fallback"])
+        result_ref = st.session_state["result_ref"]
+    return store.get(result_ref), store.get(st.session_state.get("form_ref")) or {}
 
 def show_product_release_form():
     """제품 출시/리뷰 보도자료 폼을 표시합니다."""
@@ -316,136 +389,110 @@ def show_event_release_form():
         "맺음말": press_quote
     }
 
-def get_required_fields(release_type: str) -> list:
-    """보도자료 유형별 필수 입력 필드를 반환합니다."""
-    if release_type == "제품 출시/리뷰 보도자료":
-        return [
-            "제목",
-            "도입부",
-            "제품명",
-            "주요 특징(세일즈 포인트)",
-            "주요 특징(디자인)"
-        ]
-    else:  # 이벤트/행사 보도자료
-        return [
-            "제목",
-            "도입부",
-            "행사명",
-            "행사기간",
-            "행사내용",
-            "대상 제품"
-        ]
+def show_text_download_button(label: str, text: str, file_name: str):
+    """SNS/블로그 글 다운로드 버튼 (파일은 버튼을 눌렀을 때 만듦)"""
+    st.download_button(
+        label=f"⬇️ {label} 다운로드(.txt)",
+        data=lambda: get_download_text(text),
+        file_name=file_name,
+        mime="text/plain",
+        key=f"download_{file_name}",
+        on_click="ignore"
+    )
 
 def show_result(generated_data, form_data, container):
     """생성된 보도자료 결과를 표시합니다."""
     with container:
-        # 스타일 정의
-        st.markdown("""
-            <style>
-                .stTabs [data-baseweb="tab-panel"] {
-                    padding: 0.5rem;
-                }
-                .stMarkdown {
-                    padding: 0;
-                }
-                /* HTML 미리보기 컨테이너가 부모 너비에 맞게 조정되도록 */
-                iframe {
-                    width: 100% !important;
-                }
-                /* td 요소의 너비를 늘림 */
-                td[width="550"] {
-                    width: 800px !important;
-                }
-                /* 테이블 자체의 너비도 조정 */
-                table {
-                    width: 100% !important;
-                }
-                /* 인스타그램 포스팅 스타일 */
-                .instagram-post {
-                    background: white;
-                    border: 1px solid #dbdbdb;
-                    border-radius: 8px;
-                    padding: 20px;
-                    margin: 10px 0;
-                    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-                }
-                .instagram-post pre {
-                    white-space: pre-wrap;
-                    font-family: inherit;
-                    margin: 0;
-                    padding: 10px;
-                }
-                /* 서브헤더 여백 조정 */
-                .stTabs + div > .stMarkdown > h3 {
-                    margin-top: 0.5rem;
-                    margin-bottom: 0.5rem;
-                }
-            </style>
-        """, unsafe_allow_html=True)
+        # 스타일 정의 (프로세스당 한 번 만든 블록 재사용)
+        st.markdown(get_page_styles()["result"], unsafe_allow_html=True)
         
         # 탭 생성
         tab1, tab2 = st.tabs(["🌐 HTML 미리보기", "📝 텍스트 미리보기"])
         
         with tab1:
             st.markdown("<h3 style='margin: 0.5rem 0;'>HTML 미리보기</h3>", unsafe_allow_html=True)
-            rendered_html = generate_press_release_html(
+            # 같은 내용은 한 번만 렌더링하고 이후 rerun/세션에서는 캐시를 재사용
+            artifacts = get_render_artifacts(
                 title=generated_data["title"],
-                body_text=generated_data["news_data"]
+                news_data=generated_data["news_data"]
             )
+            IFRAME_BYTES.observe(len(artifacts["preview_html"]))
             # HTML 컨텐츠를 좌측 정렬하고 너비를 늘림
             st.components.v1.html(
-                f"""
-                <div style="width: 100%; margin: 0; text-align: left;">
-                    <div style="margin: 0; min-width: 550px;">
-                        {rendered_html}
-                    </div>
-                </div>
-                """,
+                artifacts["preview_html"],
                 height=800,
                 scrolling=True
             )
             
-            # 다운로드 버튼 섹션
+            # 제목/본문을 직접 고쳐 미리보기에 반영 (바뀐 문단만 다시 렌더링됨)
+            with st.expander("✏️ 제목/본문 직접 수정", expanded=False):
+                with st.form("edit_release_form", border=False):
+                    edited_title = st.text_input("제목", value=generated_data["title"])
+                    edited_body = st.text_area("본문", value=generated_data["news_data"], height=400)
+                    if st.form_submit_button("미리보기에 반영"):
+                        # 고친 결과도 기록에 저장해 저장소에서 내려가도 다시 불러올 수 있게 함
+                        # (저장하지 못하면 원래 기록 id를 유지 - 최소한 고치기 전 결과는 복구)
+                        edited_data = generated_data.replace(title=edited_title, news_data=edited_body)
+                        fallback = st.session_state.get("result_fallback", False)
+                        history_id = save_generation(
+                            form_data, {"data": edited_data, "fallback": fallback},
+                            html_bytes=get_download_html(edited_title, edited_body)
+                        )
+                        set_current_result(edited_data, form_data, history_id or st.session_state.get("history_id"),
+                                           fallback)
+                        st.rerun()
+            
+            # 다운로드 버튼 섹션 (파일 내용은 버튼을 눌렀을 때만 만들고, 다운로드 후 rerun 하지 않음)
+            title = generated_data["title"]
+            news_data = generated_data["news_data"]
             st.subheader("파일 다운로드")
             col1, col2 = st.columns(2)
             
             with col1:
                 # 텍스트 파일에는 제목과 본문을 함께 포함
-                full_text = f"{generated_data['title']}\n\n{generated_data['news_data']}"
                 st.download_button(
                     label="📄 보도자료 텍스트(.txt)",
-                    data=full_text.encode("utf-8"),
+                    data=lambda: get_download_txt(title, news_data),
                     file_name="press_release.txt",
                     mime="text/plain",
-                    key="download_txt"
+                    key="download_txt",
+                    on_click="ignore"
                 )
 
             with col2:
                 st.download_button(
                     label="🌐 보도자료 HTML(.html)",
-                    data=generate_press_release_html(
-                        title=generated_data["title"],
-                        body_text=generated_data["news_data"]
-                    ).encode("utf-8"),
+                    data=lambda: get_download_html(title, news_data),
                     file_name="press_release.html",
                     mime="text/html",
-                    key="download_html"
+                    key="download_html",
+                    on_click="ignore"
                 )
             
+            st.download_button(
+                label="📦 전체 다운로드(.zip) - HTML, 텍스트, SNS/블로그 글, 검증 결과",
+                data=lambda: get_download_bundle(generated_data),
+                file_name="press_release_all.zip",
+                mime="application/zip",
+                key="download_bundle",
+                on_click="ignore",
+                use_container_width=True
+            )
+            
             # 인스타그램 포스팅 미리보기
             if generated_data.get("insta_data"):
                 st.subheader("❤️ 인스타 및 틱톡 미리보기")
                 with st.expander("인스타 및 틱톡 보기", expanded=False):
-                    posts = generated_data["insta_data"].strip().split("\n\n\n")
-                    # 처음 2개의 포스팅만 표시
-                    for i, post in enumerate(posts[:2], 1):
-                        if post.strip():
+                    # 처음 2개의 포스팅만 표시 (분리/이스케이프는 결과마다 한 번만)
+                    for i, post in enumerate(generated_data.html["insta_posts"], 1):
+                        if post:
                             st.markdown(f"""
                                 <div class="instagram-post">
                                     <h4>포스팅 {i}</h4>
-                                    <pre>{post.strip()}</pre>
+                                    <pre>{post}</pre>
                                 </div>
                             """, unsafe_allow_html=True)
+                    show_text_download_button("인스타/틱톡 글", generated_data["insta_data"], "instagram.txt")
             
             # Facebook 포스팅 미리보기
             if generated_data.get("facebook_data"):
@@ -453,9 +500,10 @@ def show_result(generated_data, form_data, container):
                 with st.expander("페이스북 포스팅 보기", expanded=False):
                     st.markdown(f"""
                         <div class="instagram-post">
-                            <pre>{generated_data["facebook_data"].strip()}</pre>
+                            <pre>{generated_data.html["facebook_data"]}</pre>
                         </div>
                     """, unsafe_allow_html=True)
+                    show_text_download_button("페이스북 글", generated_data["facebook_data"], "facebook.txt")
             
             # 네이버 블로그 미리보기
             if generated_data.get("blog_data"):
@@ -463,12 +511,15 @@ def show_result(generated_data, form_data, container):
                 with st.expander("블로그 포스팅 보기", expanded=False):
                     st.markdown(f"""
                         <div class="instagram-post">
-                            <pre><strong>{generated_data["title"]}</strong>
+                            <pre><strong>{generated_data.html["title"]}</strong>
                             <br>
                             <br>
-{generated_data["blog_data"].strip()}</pre>
+{generated_data.html["blog_data"]}</pre>
                         </div>
                     """, unsafe_allow_html=True)
+                    show_text_download_button(
+                        "블로그 글", f"{generated_data['title']}\n\n{generated_data['blog_data'].strip()}", "blog.txt"
+                    )
             
             # 검증 데이터가 있는 경우 표시
             if generated_data["check_data"]:
@@ -483,7 +534,7 @@ def show_result(generated_data, form_data, container):
             # 본문 표시
             st.markdown(
                 f"""<div style="padding: 4rem;">
-                    {generated_data['news_data'].replace(chr(10), "<br>")}
+                    {generated_data.html["news_data"]}
                 </div>""",
                 unsafe_allow_html=True
             )
@@ -492,9 +543,8 @@ def show_result(generated_data, form_data, container):
             if generated_data.get("insta_data"):
                 st.subheader("인스타그램 포스팅")
                 with st.expander("인스타그램 포스팅 보기", expanded=False):
-                    posts = generated_data["insta_data"].strip().split("\n\n\n")
                     # 처음 2개의 포스팅만 표시
-                    st.markdown("\n\n".join(posts[:2]))
+                    st.markdown("\n\n".join(generated_data.insta_posts[:2]))
             
             # 검증 데이터가 있는 경우 표시
             if generated_data["check_data"]:
@@ -502,7 +552,196 @@ def show_result(generated_data, form_data, container):
                 with st.expander("검증 결과 보기", expanded=False):
                     st.markdown(generated_data["check_data"])
 
+def show_partial_preview(partial_text: str):
+    """스트리밍 중인 본문을 미리보기로 표시합니다. (첫 줄을 제목으로 사용)"""
+    lines = partial_text.strip().split('\n', 1)
+    partial_html = generate_press_release_html(
+        title=lines[0].strip(),
+        body_text=lines[1] if len(lines) > 1 else "",
+        style_mode=STYLE_MODE_CLASS,
+        incremental=True  # 스트리밍 중에는 앞 문단이 그대로이므로 새로 받은 문단만 변환
+    )
+    st.components.v1.html(partial_html, height=600, scrolling=True)
+
+def _job_status_text(job, label: str = "") -> str:
+    if job.status == JOB_QUEUED:
+        position = get_job_manager().queue_position(job.id)
+        return f"{label}생성 대기 중입니다... (대기 순번: {position})"
+    return f"{label}AI가 보도자료를 생성하고 있습니다... ({time.time() - job.started_at:.0f}초)"
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def show_job_status():
+    """생성 작업의 대기 순번/진행 상태를 주기적으로 확인하고, 끝나면 결과를 반영합니다."""
+    job_ids = st.session_state.get("job_ids") or []
+    multiple = st.session_state.get("candidate_count", 1) > 1
+    job_manager = get_job_manager()
+    
+    pending_ids = []
+    finished_jobs = []
+    for job_id in job_ids:
+        job = job_manager.get(job_id)
+        if job is None:
+            continue
+        if job.finished:
+            finished_jobs.append(job)
+            continue
+        pending_ids.append(job_id)
+        if not multiple:
+            st.info(_job_status_text(job))
+            # 스트리밍으로 받은 부분까지 미리보기 (완료되면 전체 결과로 교체됨)
+            if job.status == JOB_RUNNING and job.progress:
+                show_partial_preview(job.progress)
+        else:
+            st.info(_job_status_text(job, f"후보 {job.kwargs['candidate_no']}: "))
+    
+    if len(pending_ids) == len(job_ids):
+        return
+    
+    # 작업 종료: 결과와 폼 데이터는 공유 저장소에, 세션에는 ref만 저장하고 전체 화면 갱신
+    st.session_state["job_ids"] = pending_ids
+    store = get_artifact_store()
+    for job in finished_jobs:
+        if job.status == JOB_FAILED:
+            st.session_state["generation_error"] = f"보도자료 생성 중 오류가 발생했습니다: {job.error}"
+        elif job.result:
+            if multiple:
+                # 후보 모드: 사용자가 고를 수 있도록 완료 순서대로 모아둠
+                st.session_state["candidates"].append({
+                    "candidate_no": job.kwargs["candidate_no"],
+                    "outcome": _session_outcome(job.result),
+                    "result_ref": store.put(job.result["data"], KIND_RESULT),
+                    "form_ref": store.put(job.args[0], KIND_FORM)
+                })
+            else:
+                set_current_result(job.result["data"], job.args[0], job.result.get("history_id"),
+                                   job.result["fallback"])
+                st.session_state["generation_outcome"] = _session_outcome(job.result)
+    st.rerun(scope="app")
+
+def show_candidates():
+    """완료된 후보 보도자료를 보여주고, 선택한 후보를 결과로 사용합니다."""
+    candidates = st.session_state.get("candidates") or []
+    if not candidates:
+        return
+    st.subheader(f"생성된 후보 ({len(candidates)}/{st.session_state.get('candidate_count', len(candidates))})")
+    store = get_artifact_store()
+    for candidate in candidates:
+        data = store.get(candidate["result_ref"])
+        if data is None:
+            continue
+        label = f"후보 {candidate['candidate_no']}: {data['title']}"
+        if candidate["outcome"]["fallback"]:
+            label += " (기본 템플릿)"
+        with st.expander(label, expanded=False):
+            st.markdown(
+                f"""<div style="padding: 1rem;">{data['news_data'][:1000].replace(chr(10), "<br>")}</div>""",
+                unsafe_allow_html=True
+            )
+            if st.button("이 후보 선택", key=f"pick_candidate_{candidate['candidate_no']}"):
+                # 같은 입력으로 다시 생성하면 고른 후보를 받도록 응답 캐시에 저장
+                picked_form = get_artifact_store().get(candidate["form_ref"])
+                if picked_form is not None:
+                    if not candidate["outcome"].get("fallback"):
+                        cache_selected_result(picked_form, data)
+                    # 기록은 고른 후보만 저장 (같은 후보를 다시 골라도 한 번만)
+                    if candidate["outcome"].get("history_id") is None:
+                        candidate["outcome"]["history_id"] = _save_history(
+                            picked_form, {"data": data, "fallback": candidate["outcome"].get("fallback", False)}
+                        )
+                st.session_state["result_ref"] = candidate["result_ref"]
+                st.session_state["form_ref"] = candidate["form_ref"]
+                st.session_state["history_id"] = candidate["outcome"].get("history_id")
+                st.session_state["result_fallback"] = candidate["outcome"].get("fallback", False)
+                st.session_state["generation_outcome"] = candidate["outcome"]
+                st.rerun()
+
+def _generate_candidate(form_data: dict, force_regenerate: bool, candidate_no: int = 1, on_progress=None,
+                        speculative: bool = False, save_history: bool = True) -> dict:
+    # 두 번째 후보부터는 응답 캐시에 저장하지 않음 (같은 입력의 캐시는 첫 후보 또는 사용자가 고른 후보)
+    outcome = generate_press_release(form_data, force_regenerate, on_progress=on_progress,
+                                     cache_result=candidate_no == 1)
+    if speculative and (outcome.get("cached") or outcome.get("coalesced")):
+        # 제출 전에 시작한 추측 생성의 결과를 이어받음 (사용자에게는 새로 생성한 결과와 같음)
+        outcome = dict(outcome, cached=False, coalesced=False, speculative=True)
+    # 새로고침 후에도 다시 열 수 있도록 기록에 저장 (후보 여러 개일 때는 고른 후보만 저장)
+    if save_history:
+        outcome["history_id"] = _save_history(form_data, outcome)
+    return outcome
+
+def _save_history(form_data: dict, outcome: dict):
+    """생성 결과를 다운로드용 HTML과 함께 기록에 저장합니다. return: 기록 id 또는 None"""
+    data = outcome["data"]
+    return save_generation(form_data, outcome, html_bytes=get_download_html(data["title"], data["news_data"]))
+
+def _format_history_time(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+def _open_history(release_id: int):
+    """저장된 기록을 현재 결과로 불러옵니다. (webhook 호출 없음)"""
+    store = get_history_store()
+    if store is None:
+        st.session_state["history_message"] = "기록 저장소를 사용할 수 없어 불러오지 못했습니다."
+        return
+    record = store.get(release_id)
+    if record is None:
+        st.session_state["history_message"] = "기록을 찾을 수 없습니다."
+        return
+    set_current_result(record["generated_data"], record["form_data"], record["id"], record["fallback"])
+    st.session_state["candidates"] = []
+    st.session_state["history_message"] = (
+        f"{_format_history_time(record['created_at'])}에 생성한 보도자료를 불러왔습니다."
+    )
+
+@st.fragment
+def show_history():
+    """이전에 생성한 보도자료 검색/목록 (검색과 페이지 이동은 이 영역만 다시 그림)"""
+    store = get_history_store()
+    if store is None:
+        # 기록 저장을 켰는데 저장소를 열지 못한 경우 (생성은 그대로 사용 가능)
+        if history_enabled():
+            st.caption("📚 기록 저장소를 열 수 없어 이전에 생성한 보도자료 목록을 표시하지 않습니다.")
+        return
+    with st.expander("📚 이전에 생성한 보도자료 (검색 / 다시 열기)", expanded=False):
+        query = st.text_input("검색어 (제목/본문)", key="history_query", placeholder="예: 모니터 출시")
+        # 검색어가 바뀌면 첫 페이지부터
+        if st.session_state.get("history_last_query") != query:
+            st.session_state["history_last_query"] = query
+            st.session_state["history_cursors"] = []
+        cursors = st.session_state.setdefault("history_cursors", [])
+        page = store.list_page(query, before_id=cursors[-1] if cursors else None)
+        
+        if not page["items"]:
+            st.caption("검색 결과가 없습니다." if query.strip() else "아직 저장된 보도자료가 없습니다.")
+        for item in page["items"]:
+            col_text, col_button = st.columns([5, 1])
+            with col_text:
+                label = f"**{item['title']}**"
+                if item["fallback"]:
+                    label += " (기본 템플릿)"
+                st.markdown(label)
+                st.caption(f"{_format_history_time(item['created_at'])} · {item['release_type']}"
+                           + (f" · {' '.join(item['snippet'].split())}" if item["snippet"] else ""))
+            with col_button:
+                if st.button("열기", key=f"history_open_{item['id']}"):
+                    _open_history(item["id"])
+                    st.rerun(scope="app")
+        
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if cursors and st.button("◀ 이전", key="history_prev"):
+                cursors.pop()
+                st.rerun(scope="fragment")
+        with col_page:
+            st.caption(f"{len(cursors) + 1} 페이지")
+        with col_next:
+            if page["next_before_id"] is not None and st.button("다음 ▶", key="history_next"):
+                cursors.append(page["next_before_id"])
+                st.rerun(scope="fragment")
+
 def main():
+    # 지표 엔드포인트 시작 (NEWS_AUTO_METRICS_PORT 지정 시, 프로세스당 한 번)
+    start_metrics_server()
+    
     # 페이지 레이아웃을 centered 모드로 변경 (wide -> centered)
     st.set_page_config(
         page_title="보도자료 기사 AI 자동 생성",
@@ -511,38 +750,10 @@ def main():
     )
     
     # CSS로 전체 페이지 스타일 정의
-    st.markdown("""
-        <style>
-            /* 상단 여백 줄이기 */
-            .block-container {
-                padding-top: 1rem;
-                padding-bottom: 0rem;
-            }
-            /* 제목 여백 조정 */
-            .stTitle {
-                margin-top: -2rem;
-            }
-            /* 기존 스타일 유지 */
-            .main > div {
-                padding-left: 8rem;
-                padding-right: 8rem;
-                margin: 0 auto;
-            }
-            /* Streamlit 기본 요소 숨기기 */
-            #MainMenu {visibility: hidden;}
-            footer {visibility: hidden;}
-            header {visibility: hidden;}
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(get_page_styles()["page"], unsafe_allow_html=True)
     
     st.title("보도자료 기사 AI 자동 생성")
     
-    # 세션 상태 초기화
-    if "generated_data" not in st.session_state:
-        st.session_state["generated_data"] = None
-    if "form_data" not in st.session_state:
-        st.session_state["form_data"] = {}
-    
     # 보도자료 유형 선택을 container로 감싸서 여백 추가
     with st.container():        
         st.markdown("""
@@ -566,45 +777,112 @@ def main():
             <br>
         """, unsafe_allow_html=True)
     
+    # 이전 기록 검색/다시 열기 (새로고침해도 유지)
+    show_history()
+    
     # 폼을 container로 감싸서 여백 추가
+    # 추측 생성을 켜면 입력이 바뀔 때마다 rerun되어야 하므로 st.form 대신 일반 container에 표시
+    speculator = get_speculator()
     form_container = st.container()
     with form_container:
-        with st.form("press_release_form", clear_on_submit=False):
+        form_block = st.container() if speculator.enabled else st.form("press_release_form", clear_on_submit=False)
+        with form_block:
             if release_type == "제품 출시/리뷰 보도자료":
                 form_data = show_product_release_form()
             else:
                 form_data = show_event_release_form()
 
-            submitted = st.form_submit_button("AI 보도자료 생성", use_container_width=True)
+            candidate_count = st.number_input(
+                "생성할 후보 수",
+                min_value=1,
+                max_value=MAX_CANDIDATES,
+                value=1,
+                help=f"여러 후보를 동시에 생성한 뒤 마음에 드는 것을 고를 수 있습니다. (최대 {MAX_CANDIDATES}개)"
+            )
+            force_regenerate = st.checkbox(
+                "새로 생성 (이전 결과 재사용 안 함)",
+                value=False,
+                help="같은 입력으로 생성한 결과가 있으면 기본적으로 재사용합니다."
+            )
+            submit_button = st.button if speculator.enabled else st.form_submit_button
+            submitted = submit_button("AI 보도자료 생성", use_container_width=True)
     # 여백 추가
     st.markdown("<div style='margin-bottom: 2rem;'></div>", unsafe_allow_html=True)
     
+    # 추측 생성: 필수 항목이 모두 채워진 입력을 알려 debounce 뒤 미리 생성 ('새로 생성'은 제외)
+    if speculator.enabled and not submitted:
+        required_complete = all(form_data[k].strip() for k in get_required_fields(release_type))
+        speculator.observe(get_session_id(), form_data if required_complete and not force_regenerate else None)
+    
     # 폼 제출 처리
     if submitted:
         # 필수 입력값 검증
-        required_fields = get_required_fields(release_type)
-        empty_required_fields = [k for k in required_fields if not form_data[k].strip()]
+        with stage_timer("validate"):
+            required_fields = get_required_fields(release_type)
+            empty_required_fields = [k for k in required_fields if not form_data[k].strip()]
         
         if empty_required_fields:
             st.error(f"다음 필수 항목을 입력해주세요: {', '.join(empty_required_fields)}")
             return
         
-        # AI 생성 요청
-        generated_data = get_ai_generated_text(form_data)
-        
-        # 세션 상태에 텍스트와 폼 데이터를 저장
-        if generated_data:
-            st.session_state["generated_data"] = generated_data
-            st.session_state["form_data"] = form_data
+        # AI 생성 요청 (백그라운드 작업으로 제출하고 상태는 아래에서 확인)
+        get_http_session()  # 작업 스레드가 쓰는 공유 HTTP 세션을 미리 준비
+        job_manager = get_job_manager()
+        for previous_job_id in st.session_state.get("job_ids") or []:
+            job_manager.cancel(previous_job_id)
+        st.session_state["job_ids"] = []
+        st.session_state["candidates"] = []
+        st.session_state["candidate_count"] = candidate_count
+        # 같은 입력으로 미리 시작한 추측 생성이 있으면 첫 번째 후보가 그 결과를 이어받음
+        speculative = not force_regenerate and speculator.claim(get_session_id(), form_data)
+        try:
+            for candidate_no in range(1, candidate_count + 1):
+                # 후보끼리 서로 다른 결과가 나오도록 두 번째 후보부터는 캐시를 건너뜀
+                st.session_state["job_ids"].append(job_manager.submit(
+                    get_session_id(), _generate_candidate, dict(form_data),
+                    force_regenerate or candidate_no > 1,
+                    candidate_no=candidate_no,
+                    on_progress=report_progress,
+                    speculative=speculative and candidate_no == 1,
+                    save_history=candidate_count == 1,
+                    # 한 번에 제출한 후보들은 함께 실행 (따로 제출한 작업에는 세션별 상한 그대로 적용)
+                    running_limit=candidate_count if candidate_count > 1 else None
+                ))
+        except QueueFullError as e:
+            st.error(str(e))
     
-    # 세션 상태에 저장된 텍스트가 있을 경우 결과 표시
-    if st.session_state["generated_data"]:
+    # 진행 중인 생성 작업 상태 표시
+    if st.session_state.get("job_ids"):
+        show_job_status()
+    
+    # 여러 후보를 생성한 경우 선택 화면 표시
+    show_candidates()
+    
+    # 직전에 끝난 작업의 안내 메시지 표시 (한 번만)
+    outcome = st.session_state.pop("generation_outcome", None)
+    if outcome:
+        show_generation_messages(outcome)
+    generation_error = st.session_state.pop("generation_error", None)
+    if generation_error:
+        st.error(generation_error)
+    history_message = st.session_state.pop("history_message", None)
+    if history_message:
+        st.success(history_message)
+    
+    # 세션에 결과 ref가 있을 경우 결과 표시 (저장소의 PressRelease를 세션끼리 공유)
+    generated_data, generated_form_data = get_current_result()
+    if generated_data:
         result_container = st.container()
-        show_result(
-            st.session_state["generated_data"], 
-            st.session_state["form_data"],
-            result_container
-        )
+        with stage_timer("show_result"):
+            show_result(
+                generated_data, 
+                generated_form_data,
+                result_container
+            )
+    
+    # 첫 화면을 다 그린 뒤 다음 요청에 필요한 모듈/템플릿을 미리 준비 (프로세스당 한 번)
+    if PREWARM_RESOURCES:
+        start_prewarm()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import threading
+from collections import deque
+
+from circuit_breaker import STATE_OPEN, get_breaker
+from metrics import REGISTRY, url_label
+
+# 기본 webhook (self-hosted n8n)
+PRIMARY_WEBHOOK_URL = "http://203.239.132.7:5678/webhook/3ccfd480-71e7-4d1e-b264-69a651180350"
+# 클라우드 n8n (필요 시 NEWS_AUTO_WEBHOOK_URLS에 추가)
+CLOUD_WEBHOOK_URL = "https://geniefy.app.n8n.cloud/webhook/3ccfd480-71e7-4d1e-b264-69a651180350"
+
+# 헤지 요청 설정 (환경변수로 조정 가능)
+# - PERCENTILE: 1순위 엔드포인트가 최근 응답 시간의 이 백분위수 안에 답하지 않으면 다음 엔드포인트로 헤지
+# - DEFAULT_DELAY: 응답 시간 표본이 부족할 때 사용하는 헤지 대기 시간(초)
+HEDGE_PERCENTILE = float(os.environ.get("NEWS_AUTO_HEDGE_PERCENTILE", "95"))
+HEDGE_DEFAULT_DELAY = float(os.environ.get("NEWS_AUTO_HEDGE_DEFAULT_DELAY", "20"))
+HEDGE_MIN_DELAY = float(os.environ.get("NEWS_AUTO_HEDGE_MIN_DELAY", "1"))
+HEDGE_MIN_SAMPLES = 10
+LATENCY_WINDOW = 200
+
+ENDPOINT_LATENCY = REGISTRY.histogram("news_auto_endpoint_latency_seconds", "엔드포인트(호스트)별 webhook 응답 시간(초)")
+HEDGES = REGISTRY.counter("news_auto_hedges_total", "헤지/장애 전환 요청 수 (reason=slow|failover)")
+HEDGE_WINS = REGISTRY.counter("news_auto_hedge_wins_total", "헤지 상황에서 먼저 성공한 엔드포인트(호스트)")
+
+def get_webhook_urls() -> list:
+    """
+    webhook 엔드포인트 목록을 우선순위 순서로 반환합니다.
+    NEWS_AUTO_WEBHOOK_URLS(쉼표 구분) > NEWS_AUTO_WEBHOOK_URL > 기본 self-hosted 주소
+    """
+    urls = os.environ.get("NEWS_AUTO_WEBHOOK_URLS", "")
+    if urls:
+        return [url.strip() for url in urls.split(",") if url.strip()]
+    return [os.environ.get("NEWS_AUTO_WEBHOOK_URL", PRIMARY_WEBHOOK_URL)]
+
+class EndpointHealth:
+    """엔드포인트별 최근 응답 시간과 성공/실패를 기록합니다. (프로세스 공유)"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, url: str, latency: float, ok: bool):
+        if not ok:
+            return
+        ENDPOINT_LATENCY.observe(latency, endpoint=url_label(url))
+        with self._lock:
+            self._latencies.setdefault(url, deque(maxlen=self.window)).append(latency)
+
+    def hedge_delay(self, url: str) -> float:
+        """이 엔드포인트 응답을 기다릴 시간 (최근 응답 시간의 HEDGE_PERCENTILE 백분위수)"""
+        with self._lock:
+            samples = sorted(self._latencies.get(url, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        index = min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE / 100))
+        return max(HEDGE_MIN_DELAY, samples[index])
+
+    def ordered(self, urls: list) -> list:
+        """브레이커가 열린 엔드포인트를 뒤로 보낸 목록 (설정 순서 유지)"""
+        healthy = [url for url in urls if get_breaker(url).state != STATE_OPEN]
+        return healthy + [url for url in urls if url not in healthy]
+
+_endpoint_health = EndpointHealth()
+
+def get_endpoint_health() -> EndpointHealth:
+    """프로세스 공유 엔드포인트 상태를 반환합니다."""
+    return _endpoint_health